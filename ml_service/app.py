@@ -1,9 +1,22 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import os
+import threading
 from dotenv import load_dotenv
 from models.predictor import TopicPredictor
+from utils.adaptive_testing import (DEFAULT_MAX_ITEMS, DEFAULT_MIN_ITEMS, DEFAULT_SE_TARGET, AdaptiveTestEngine,
+                                    AdaptiveTestError)
+from utils.alias_sampler import PracticeSampler, predictor_weights
 from utils.analyzer import GATEAnalyzer
+from utils.bitmap_index import BitmapIndex, FilterError, parse_count
+from utils.grading import AnswerKey, GradingError
+from utils.paper_assembler import Blueprint, BlueprintError
+from utils.paper_pool import PaperPool
+from utils.question_journal import JournalTail, QuestionJournal, load_bank
+from utils.search_index import FILTER_FIELDS, QuestionSearchIndex, SearchError
+from utils.seen_sets import NoRepeatSelector, SeenStore
+from utils.sharded_bank import ShardedBank
+from utils.syllabus import SYLLABUS_WEIGHTAGE, question_subject
 
 load_dotenv()
 
@@ -12,6 +25,26 @@ CORS(app)
 
 predictor = TopicPredictor()
 analyzer = GATEAnalyzer()
+# Opened before the bank is read, so no write lands between the two (replayed ops are idempotent)
+journal_tail = JournalTail(QuestionJournal())
+question_bank = load_bank()
+search_index = QuestionSearchIndex(question_bank)
+search_lock = threading.Lock()
+bitmap_index = BitmapIndex(question_bank)
+practice_sampler = PracticeSampler(question_bank, {
+    'syllabus': SYLLABUS_WEIGHTAGE,
+    'predictor': predictor_weights(predictor.predict_important_topics()),
+})
+# Single-subject practice sets open only that subject's shards (written by build_bank.py)
+try:
+    subject_shards = ShardedBank()
+except FileNotFoundError:
+    subject_shards = None
+seen_store = SeenStore()
+no_repeat_selector = NoRepeatSelector(question_bank, seen_store, bitmap_index)
+paper_pool = PaperPool(question_bank).start()
+adaptive_engine = AdaptiveTestEngine(question_bank)
+bank_answer_key = AnswerKey(question_bank, strict=False)
 
 @app.route('/predict', methods=['GET'])
 def predict_topics():
@@ -34,10 +67,190 @@ def analyze_papers():
 def retrain_model():
     try:
         predictor.retrain()
+        practice_sampler.set_weights('predictor', predictor_weights(predictor.predict_important_topics()))
         return jsonify({'message': 'Model retrained successfully'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def sync_search_index():
+    """Apply store writes journaled since the last search; reindex after a compaction"""
+    global search_index
+    ops = journal_tail.poll()
+    if ops is None:
+        search_index = QuestionSearchIndex(load_bank())
+    elif ops:
+        search_index.apply_ops(ops)
+
+@app.route('/questions/search', methods=['GET'])
+def search_questions():
+    try:
+        query = request.args.get('q', '')
+        limit = request.args.get('limit', 10, type=int)
+        filters = {
+            field: request.args.getlist(field)
+            for field in FILTER_FIELDS
+            if field in request.args
+        }
+        with search_lock:
+            sync_search_index()
+            results = search_index.search(query, filters=filters, limit=limit)
+        return jsonify({
+            'query': query,
+            'filters': filters,
+            'results': [dict(question, score=score) for question, score in results]
+        })
+    except SearchError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/questions/sample', methods=['POST'])
+def sample_questions():
+    try:
+        data = request.json or {}
+        draws = bitmap_index.draw(data.get('draws', []), exclude=data.get('exclude'))
+        return jsonify({
+            'draws': [
+                {'filter': clause.get('filter', {}), 'requested': clause.get('count', 1), 'questions': questions}
+                for clause, questions in zip(data.get('draws', []), draws)
+            ]
+        })
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/questions/select', methods=['POST'])
+def select_unseen_questions():
+    try:
+        data = request.json or {}
+        user_id = data.get('userId')
+        if not user_id:
+            return jsonify({'error': 'userId is required'}), 400
+        count = parse_count(data.get('count', 10))
+        questions, repeated = no_repeat_selector.select(str(user_id), count, data.get('filter'))
+        return jsonify({
+            'userId': user_id,
+            'questions': questions,
+            'repeated': repeated
+        })
+    except FilterError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def subject_practice_set(subject, count):
+    """`count` questions from one subject, spread evenly over its topics and difficulties"""
+    if subject_shards is not None:
+        questions = list(subject_shards.questions(subject=subject))
+    else:
+        questions = [q for q in question_bank if question_subject(q) == subject]
+    if not questions:
+        return None
+    return PracticeSampler(questions, {subject: {subject: 1}}).sample(count, subject)
+
+@app.route('/practice-set', methods=['GET'])
+def practice_set():
+    try:
+        count = request.args.get('count', 10, type=int)
+        source = request.args.get('weights', 'predictor')
+        subject = request.args.get('subject')
+        if count < 0:
+            return jsonify({'error': f"count must be a non-negative integer, got {count}"}), 400
+        if subject:
+            questions = subject_practice_set(subject, count)
+            if questions is None:
+                return jsonify({'error': f"Unknown subject: {subject}"}), 400
+            return jsonify({'subject': subject, 'questions': questions})
+        if source not in practice_sampler.tables:
+            return jsonify({'error': f"Unknown weights: {source} (use {' or '.join(practice_sampler.tables)})"}), 400
+        return jsonify({
+            'weights': source,
+            'subjectShares': practice_sampler.shares(source),
+            'questions': practice_sampler.sample(count, source)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/mock-paper', methods=['GET', 'POST'])
+def mock_paper():
+    try:
+        data = request.get_json(silent=True) or {}
+        if data.get('blueprint'):
+            blueprint = Blueprint.from_dict(data['blueprint'])
+            profile = paper_pool.profile_for(blueprint)
+            if profile is None:
+                return jsonify(dict(paper_pool.assemble(blueprint), profile=None))
+        else:
+            profile = data.get('difficulty') or request.args.get('difficulty', 'balanced')
+            if profile not in paper_pool.assemblers:
+                return jsonify({'error': f"Unknown difficulty profile: {profile}"}), 400
+        return jsonify(dict(paper_pool.get(profile), profile=profile))
+    except BlueprintError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/mock-paper/pool', methods=['GET'])
+def mock_paper_pool():
+    return jsonify(paper_pool.metrics())
+
+@app.route('/adaptive/start', methods=['POST'])
+def start_adaptive_test():
+    try:
+        data = request.get_json(silent=True) or {}
+        limits = {
+            'max_items': data.get('maxItems', DEFAULT_MAX_ITEMS),
+            'min_items': data.get('minItems', DEFAULT_MIN_ITEMS),
+            'se_target': data.get('seTarget', DEFAULT_SE_TARGET),
+        }
+        session_id, question = adaptive_engine.begin(**limits)
+        return jsonify({'sessionId': session_id, 'question': question})
+    except AdaptiveTestError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/adaptive/answer', methods=['POST'])
+def answer_adaptive_test():
+    try:
+        data = request.json or {}
+        session_id = data.get('sessionId')
+        if session_id not in adaptive_engine.sessions:
+            return jsonify({'error': f"Unknown or expired adaptive session: {session_id}"}), 404
+        return jsonify(dict(adaptive_engine.respond(session_id, data.get('answer')), sessionId=session_id))
+    except KeyError as e:
+        return jsonify({'error': e.args[0]}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/grade', methods=['POST'])
+def grade_submissions():
+    try:
+        data = request.json or {}
+        if data.get('questions'):
+            answer_key = AnswerKey(data['questions'])
+        elif data.get('questionIds'):
+            answer_key = bank_answer_key.take(data['questionIds'])
+        else:
+            return jsonify({'error': 'questions or questionIds is required'}), 400
+        submissions = data.get('submissions', [])
+        if not isinstance(submissions, list) or not all(isinstance(s, dict) for s in submissions):
+            return jsonify({'error': 'submissions must be a list of objects'}), 400
+        results = answer_key.grade_answers([s.get('answers') or {} for s in submissions])
+        return jsonify({
+            'questions': len(answer_key),
+            'maxScore': answer_key.max_score,
+            'results': [
+                dict(result, id=submission.get('id'))
+                for submission, result in zip(submissions, results.to_dicts(details=bool(data.get('details'))))
+            ]
+        })
+    except GradingError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy'})
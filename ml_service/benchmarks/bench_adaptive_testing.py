@@ -0,0 +1,67 @@
+"""
+Adaptive testing: table build time, next-item latency and ability recovery.
+
+For synthetic banks of each size, builds the per-grid-point information
+rankings, then runs simulated examinees with known abilities through full
+adaptive tests. Reports next-item selection latency percentiles, the
+average test length and how far the final estimates are from the true
+abilities (RMSE). The baseline is a full argmax of item information over
+the subject's items at the current estimate, which is what selection would
+cost without the precomputed tables.
+
+    python -m benchmarks.bench_adaptive_testing --sizes 10000 100000 --examinees 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import iter_synthetic
+from utils.adaptive_testing import AdaptiveTestEngine, information, probability
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark adaptive test item selection')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--examinees', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'items':>8} {'build s':>8} {'select p50 µs':>14} {'p99 µs':>8} {'argmax µs':>10} "
+          f"{'avg items':>10} {'RMSE':>6}")
+    for n in args.sizes:
+        questions = list(iter_synthetic(n))
+        started = time.perf_counter()
+        engine = AdaptiveTestEngine(questions)
+        build = time.perf_counter() - started
+
+        rng = np.random.default_rng(0)
+        latencies, baseline, lengths, errors = [], [], [], []
+        for true_ability in rng.normal(0, 1, args.examinees):
+            session = engine.new_session()
+            while not session.finished:
+                started = time.perf_counter()
+                position = engine.next_item(session, rng)
+                latencies.append(time.perf_counter() - started)
+                if position is None:
+                    break
+
+                members = engine.members[engine.subject_index[position]]
+                started = time.perf_counter()
+                info = information(session.ability, engine.a[members], engine.b[members], engine.c[members])
+                info[np.isin(members, session.administered)] = -np.inf
+                int(np.argmax(info))
+                baseline.append(time.perf_counter() - started)
+
+                p = probability(true_ability, engine.a[position], engine.b[position], engine.c[position])
+                engine.record(session, position, rng.random() < p)
+            lengths.append(len(session.responses))
+            errors.append(session.ability - true_ability)
+
+        p50, p99 = np.percentile(np.array(latencies) * 1e6, [50, 99])
+        print(f"{n:>8} {build:>8.2f} {p50:>14.1f} {p99:>8.1f} {np.median(baseline) * 1e6:>10.1f} "
+              f"{np.mean(lengths):>10.1f} {np.sqrt(np.mean(np.square(errors))):>6.3f}")
+
+
+if __name__ == '__main__':
+    main()
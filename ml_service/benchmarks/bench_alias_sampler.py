@@ -0,0 +1,69 @@
+"""
+Weighted practice-set sampling: alias tables against `random.choices`.
+
+For synthetic banks of each size, reports the time to group the bank into
+strata, to re-weight (rebuild one alias table, as `/retrain` does), the
+latency of a 20-question practice set, and raw draws per second. The
+baseline is `random.choices` over per-question weights, which walks the
+whole bank to build cumulative weights on every call.
+
+    python -m benchmarks.bench_alias_sampler --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import iter_synthetic
+from utils.alias_sampler import PracticeSampler
+from utils.syllabus import SYLLABUS_WEIGHTAGE, question_subject
+
+SETS = 200
+SET_SIZE = 20
+DRAWS = 1_000_000
+
+
+def timed(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark alias-table practice-set sampling')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'strata':>7} {'build ms':>9} {'reweight ms':>12} {'set µs':>8} "
+          f"{'draws/s':>12} {'choices set µs':>15}")
+    for n in args.sizes:
+        questions = list(iter_synthetic(n))
+        started = time.perf_counter()
+        sampler = PracticeSampler(questions, {'syllabus': SYLLABUS_WEIGHTAGE})
+        build = time.perf_counter() - started
+        reweight = timed(lambda: sampler.set_weights('syllabus', SYLLABUS_WEIGHTAGE))
+
+        rng = np.random.default_rng(0)
+        per_set = timed(lambda: [sampler.sample_positions(SET_SIZE, 'syllabus', rng) for _ in range(SETS)]) / SETS
+        table = sampler.tables['syllabus']
+        draws = timed(lambda: table.sample(DRAWS, rng))
+
+        # Baseline: the same per-question probabilities through random.choices
+        stratum_weights = sampler.stratum_weights(SYLLABUS_WEIGHTAGE)
+        stratum_of = {key: i for i, key in enumerate(sampler.strata)}
+        strata = [stratum_of[(question_subject(q), q.get('topic'), q.get('difficulty'))] for q in questions]
+        weights = [stratum_weights[s] / sampler.sizes[s] for s in strata]
+        baseline_rng = random.Random(0)
+        choices = timed(lambda: baseline_rng.choices(range(n), weights, k=SET_SIZE), repeat=5)
+
+        print(f"{n:>10} {len(sampler.strata):>7} {build * 1000:>9.1f} {reweight * 1000:>12.2f} "
+              f"{per_set * 1e6:>8.1f} {DRAWS / draws:>12,.0f} {choices * 1e6:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Binary bank benchmark: per-worker load time and memory, JSON vs mmap.
+
+Each of N spawned workers loads the bank, fetches random questions, then
+reports RSS and PSS (proportional set size, which splits shared pages between
+the processes mapping them) while all workers are still alive. Times are
+per-process CPU time, so they do not depend on how many cores the workers share.
+
+    python -m benchmarks.bench_binary_bank --size 100000 --workers 8
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import iter_synthetic
+from utils.binary_bank import BinaryQuestionBank, write_binary_bank
+
+
+def memory_kib():
+    """(RSS, PSS) of this process in KiB, from /proc"""
+    values = {}
+    with open('/proc/self/smaps_rollup', 'r') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0])
+    return values.get('Rss', 0), values.get('Pss', 0)
+
+
+def worker(kind, path, fetches, results, done):
+    started = time.process_time()
+    if kind == 'json':
+        with open(path, 'r', encoding='utf-8') as f:
+            bank = json.load(f)
+    else:
+        bank = BinaryQuestionBank(path)
+    load_time = time.process_time() - started
+
+    rng = random.Random(os.getpid())
+    started = time.process_time()
+    for _ in range(fetches):
+        bank[rng.randrange(len(bank))]
+    fetch_time = time.process_time() - started
+
+    rss, pss = memory_kib()
+    results.put((load_time, fetch_time, rss, pss))
+    done.wait()
+
+
+def run(kind, path, workers, fetches):
+    context = multiprocessing.get_context('spawn')
+    results, done = context.Queue(), context.Event()
+    processes = [
+        context.Process(target=worker, args=(kind, path, fetches, results, done))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    stats = [results.get() for _ in processes]
+    done.set()
+    for process in processes:
+        process.join()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON vs mmap binary bank loading')
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--fetches', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'bank.json')
+        binary_path = os.path.join(directory, 'bank.gqb')
+        questions = list(iter_synthetic(args.size))
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(questions, f, indent=2, ensure_ascii=False)
+        write_binary_bank(questions, binary_path)
+        del questions
+        print(f"{args.size} questions: JSON {os.path.getsize(json_path) / 2**20:.1f} MiB, "
+              f"binary {os.path.getsize(binary_path) / 2**20:.1f} MiB")
+
+        for kind, path in (('json', json_path), ('binary', binary_path)):
+            stats = run(kind, path, args.workers, args.fetches)
+            load = max(s[0] for s in stats)
+            fetch_us = max(s[1] for s in stats) / args.fetches * 1e6
+            rss = sum(s[2] for s in stats) / 1024
+            pss = sum(s[3] for s in stats) / 1024
+            print(f"{kind:>7}: load {load * 1000:8.1f} ms/worker, fetch {fetch_us:6.1f} us/question, "
+                  f"{args.workers} workers RSS {rss:7.1f} MiB, PSS {pss:7.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
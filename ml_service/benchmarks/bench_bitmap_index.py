@@ -0,0 +1,64 @@
+"""
+Bitmap index benchmark: build time, filter resolution and sampling latency.
+
+    python -m benchmarks.bench_bitmap_index --size 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.synthetic import synthetic_bank
+from utils.bitmap_index import BitmapIndex
+
+FILTERS = [
+    {'difficulty': 'hard'},
+    {'subject': 'Algorithms', 'difficulty': 'hard'},
+    {'subject': 'Operating Systems', 'difficulty': 'medium', 'not': {'year': 2019}},
+    {'or': [{'subject': 'DBMS'}, {'subject': 'Computer Networks'}], 'marks': 2},
+]
+
+
+def timed(fn, repeats):
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - started) * 1e6)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the bitmap sampling index')
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--repeats', type=int, default=1000)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    bank = synthetic_bank(args.size)
+    started = time.perf_counter()
+    index = BitmapIndex(bank)
+    print(f"Built bitmaps over {len(index)} questions in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(1)
+    for expression in FILTERS:
+        cold = timed(lambda: index.resolve(expression), args.repeats // 10 or 1)
+        index.sample(expression, args.k, rng)
+        warm = timed(lambda: index.sample(expression, args.k, rng), args.repeats)
+        print(f"{index.count(expression):>8} matches  {expression}")
+        print(f"          resolve median {cold[0]:.0f} us, p95 {cold[1]:.0f} us; "
+              f"sample {args.k} (cached) median {warm[0]:.0f} us, p95 {warm[1]:.0f} us")
+
+    clauses = [
+        {'filter': {'subject': 'Algorithms', 'difficulty': 'hard'}, 'count': 2},
+        {'filter': {'subject': 'Operating Systems', 'difficulty': 'medium'}, 'count': 3},
+    ]
+    index.draw(clauses, exclude={'year': 2019}, rng=rng)
+    median, p95 = timed(lambda: index.draw(clauses, exclude={'year': 2019}, rng=rng), args.repeats)
+    print(f"Test draw (2 hard Algorithms, 3 medium OS, no 2019): median {median:.0f} us, p95 {p95:.0f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Memory benchmark: bytes per question for a list of dicts vs CompactQuestionBank.
+
+Questions are round-tripped through JSON one at a time so no strings are
+shared with the synthetic generator, as with a bank read from disk.
+
+    python -m benchmarks.bench_compact_bank --sizes 10000 100000 1000000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from benchmarks.synthetic import iter_synthetic
+from utils.compact_bank import CompactQuestionBank
+
+
+def from_disk(n):
+    for question in iter_synthetic(n):
+        yield json.loads(json.dumps(question))
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark in-memory question representations')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'dicts B/q':>10} {'compact B/q':>12} {'ratio':>6} {'dicts s':>8} {'compact s':>10}")
+    for n in args.sizes:
+        dict_bytes, dict_time = measure(lambda: list(from_disk(n)))
+        compact_bytes, compact_time = measure(lambda: CompactQuestionBank.from_questions(from_disk(n)))
+        print(f"{n:>10} {dict_bytes / n:>10.0f} {compact_bytes / n:>12.0f} "
+              f"{dict_bytes / compact_bytes:>5.1f}x {dict_time:>8.2f} {compact_time:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
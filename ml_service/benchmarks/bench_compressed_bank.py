@@ -0,0 +1,117 @@
+"""
+Compressed bank benchmark against the pretty-printed (indent=2) JSON banks.
+
+For the real banks and synthetic banks of each size, reports size on disk,
+full-load time, cold lookup (open the file and fetch one question) and the
+mean latency of random lookups on an open bank (default 8-block cache, so
+on large banks nearly every lookup decompresses a block). JSON has to be
+parsed whole before any lookup, so its cold lookup is a full load and its
+random access is a list index.
+
+    python -m benchmarks.bench_compressed_bank --sizes 10000 100000 --block-sizes 32 128 512
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import DATA_DIR, SOURCE_BANKS, iter_synthetic
+from utils.bank_stream import iter_bank
+from utils.compressed_bank import CODECS, CompressedQuestionBank, default_codec, write_compressed_bank, zstandard
+
+LOOKUPS = 2000
+
+
+def timed(func, repeat=3):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def json_load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bench_json(path, positions):
+    load, data = timed(lambda: json_load(path))
+    questions = data['questions'] if isinstance(data, dict) else data
+    started = time.perf_counter()
+    for p in positions:
+        questions[p]
+    warm = (time.perf_counter() - started) / len(positions)
+    return os.path.getsize(path), load, load, warm
+
+
+def bench_compressed(path, positions):
+    def load():
+        with CompressedQuestionBank(path) as bank:
+            return bank.questions()
+
+    def cold():
+        with CompressedQuestionBank(path) as bank:
+            return bank[positions[0]]
+
+    load_time, _ = timed(load)
+    cold_time, _ = timed(cold, repeat=20)
+    with CompressedQuestionBank(path) as bank:
+        started = time.perf_counter()
+        for p in positions:
+            bank[p]
+        warm = (time.perf_counter() - started) / len(positions)
+    return os.path.getsize(path), load_time, cold_time, warm
+
+
+def report(label, size, load, cold, warm, baseline_size):
+    print(f"{label:<24} {size / 1024:>10.1f} {baseline_size / size:>6.1f}x {load * 1000:>9.1f} "
+          f"{cold * 1000:>9.2f} {warm * 1e6:>10.1f}")
+
+
+def compare(name, questions, metadata, directory, block_sizes, codecs):
+    pretty = os.path.join(directory, f'{name}.json')
+    with open(pretty, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': metadata, 'questions': questions} if metadata else questions,
+                  f, indent=2, ensure_ascii=False)
+    rng = random.Random(0)
+    positions = [rng.randrange(len(questions)) for _ in range(LOOKUPS)]
+
+    print(f"\n{name}: {len(questions)} questions")
+    print(f"{'format':<24} {'KiB':>10} {'ratio':>7} {'load ms':>9} {'cold ms':>9} {'random µs':>10}")
+    size, load, cold, warm = bench_json(pretty, positions)
+    report('json indent=2', size, load, cold, warm, size)
+    baseline = size
+    for codec in codecs:
+        for block_size in block_sizes:
+            path = os.path.join(directory, f'{name}-{codec}-{block_size}.gqz')
+            write_compressed_bank(questions, path, metadata, block_size=block_size, codec=codec)
+            report(f'{codec} block={block_size}', *bench_compressed(path, positions), baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark compressed block storage against pretty JSON')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--block-sizes', type=int, nargs='+', default=[32, 128, 512])
+    parser.add_argument('--codecs', nargs='+', choices=sorted(CODECS), default=None,
+                        help='default: zlib, plus zstd if installed')
+    args = parser.parse_args()
+    codecs = args.codecs or (['zlib', 'zstd'] if zstandard is not None else ['zlib'])
+    print(f"Default codec: {default_codec()}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in SOURCE_BANKS:
+            metadata = {}
+            questions = list(iter_bank(os.path.join(DATA_DIR, name), metadata))
+            compare(os.path.splitext(name)[0], questions, metadata or None,
+                    directory, args.block_sizes, codecs)
+        for n in args.sizes:
+            compare(f'synthetic-{n}', list(iter_synthetic(n)), None, directory, args.block_sizes, codecs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Bulk grading throughput against a per-question loop.
+
+Builds a 65-question GATE-style test (MCQ, MSQ and NAT with 1- and 2-mark
+questions) and random submissions, then reports submissions per second for
+encoding the answers, for grading the encoded matrices, and end to end. The
+baseline is the loop `server/routes/tests.js` runs, one answer at a time,
+with the same GATE marking rules added.
+
+    python -m benchmarks.bench_grading --submissions 1000 10000 100000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from utils.grading import AnswerKey, answer_correct
+
+OPTIONS = ['A', 'B', 'C', 'D']
+
+
+def build_test(rng):
+    questions = []
+    for i in range(65):
+        question_type = rng.choices(['MCQ', 'MSQ', 'NAT'], [70, 15, 15])[0]
+        question = {'id': f'Q{i:02d}', 'questionType': question_type, 'marks': 1 if i < 30 else 2,
+                    'section': 'General Aptitude' if i < 10 else 'Core Computer Science'}
+        if question_type == 'NAT':
+            low = round(rng.uniform(0, 100), 1)
+            question['correctAnswer'] = f"{low} to {low + 0.2:.1f}"
+        else:
+            question['options'] = OPTIONS
+            question['correctAnswer'] = (rng.choice(OPTIONS) if question_type == 'MCQ'
+                                         else sorted(rng.sample(OPTIONS, rng.randint(1, 3))))
+        questions.append(question)
+    return questions
+
+
+def random_answers(questions, rng):
+    answers = {}
+    for question in questions:
+        if rng.random() < 0.15:
+            continue
+        if question['questionType'] == 'NAT':
+            answers[question['id']] = str(round(rng.uniform(0, 100), 1))
+        elif question['questionType'] == 'MSQ':
+            answers[question['id']] = rng.sample(OPTIONS, rng.randint(1, 3))
+        else:
+            answers[question['id']] = rng.choice(OPTIONS)
+    return answers
+
+
+def loop_grade(questions, submissions):
+    scores = []
+    for answers in submissions:
+        score = 0.0
+        for question in questions:
+            answer = answers.get(question['id'])
+            if answer is None:
+                continue
+            if answer_correct(question, answer):
+                score += question['marks']
+            elif question['questionType'] == 'MCQ':
+                score -= question['marks'] / 3
+        scores.append(score)
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk grading')
+    parser.add_argument('--submissions', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    questions = build_test(rng)
+    key = AnswerKey(questions)
+    print(f"{'submissions':>11} {'encode/s':>12} {'grade/s':>12} {'total/s':>12} {'loop/s':>10} {'match':>6}")
+    for n in args.submissions:
+        submissions = [random_answers(questions, rng) for _ in range(n)]
+        started = time.perf_counter()
+        encoded = key.encode(submissions)
+        encode = time.perf_counter() - started
+        started = time.perf_counter()
+        result = key.grade(*encoded)
+        scores = result.scores
+        grade = time.perf_counter() - started
+
+        sample = submissions[:min(n, 10000)]
+        started = time.perf_counter()
+        expected = loop_grade(questions, sample)
+        loop = time.perf_counter() - started
+        match = bool(np.allclose(scores[:len(sample)], expected))
+        print(f"{n:>11} {n / encode:>12,.0f} {n / grade:>12,.0f} {n / (encode + grade):>12,.0f} "
+              f"{len(sample) / loop:>10,.0f} {str(match):>6}")
+
+
+if __name__ == '__main__':
+    main()
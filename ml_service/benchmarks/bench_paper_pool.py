@@ -0,0 +1,75 @@
+"""
+Mock paper latency from the pre-assembled pool against assembling per request.
+
+Simulates an exam-day burst: `--clients` threads each start `--papers` mock
+tests as fast as they can while the refill worker runs. Reports pop latency
+percentiles, how many requests missed the pool, and for comparison the
+latency of assembling one paper on the request path.
+
+    python -m benchmarks.bench_paper_pool --clients 8 --papers 250
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from utils.paper_assembler import Blueprint, PaperAssembler
+from utils.paper_pool import PaperPool
+from utils.question_journal import load_bank
+
+
+def percentiles(latencies):
+    values = np.percentile(np.array(latencies) * 1e6, [50, 99, 100])
+    return ' '.join(f"{label} {value:>9.1f}" for label, value in zip(('p50', 'p99', 'max'), values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the mock paper pool')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--papers', type=int, default=250)
+    parser.add_argument('--target', type=int, default=1000)
+    parser.add_argument('--low-watermark', type=int, default=250)
+    args = parser.parse_args()
+
+    questions = load_bank()
+    assembler = PaperAssembler(questions, Blueprint())
+    direct = []
+    for _ in range(200):
+        started = time.perf_counter()
+        assembler.assemble()
+        direct.append(time.perf_counter() - started)
+    print(f"assemble per request (µs): {percentiles(direct)}")
+
+    pool = PaperPool(questions, target=args.target, low_watermark=args.low_watermark)
+    started = time.perf_counter()
+    pool.fill()
+    print(f"warm-up: {len(pool.assemblers)} profiles x {args.target} papers in {time.perf_counter() - started:.2f}s")
+    pool.start()
+
+    latencies = [[] for _ in range(args.clients)]
+
+    def client(out):
+        for _ in range(args.papers):
+            started = time.perf_counter()
+            pool.get('balanced')
+            out.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client, args=(out,)) for out in latencies]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    pool.stop()
+
+    stats = pool.metrics()['profiles']['balanced']
+    print(f"pool pop (µs):             {percentiles(sum(latencies, []))}")
+    print(f"burst: {stats['served']} papers in {elapsed:.2f}s, {stats['misses']} misses, "
+          f"{stats['refilled']} refilled at {stats['refillRate']:,} papers/s, depth {stats['depth']}")
+
+
+if __name__ == '__main__':
+    main()
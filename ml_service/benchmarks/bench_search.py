@@ -0,0 +1,44 @@
+"""
+Search index benchmark: build time and query latency percentiles.
+
+    python -m benchmarks.bench_search --size 100000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.synthetic import synthetic_bank, vocabulary
+from utils.search_index import QuestionSearchIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the question search index')
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    bank = synthetic_bank(args.size)
+    started = time.perf_counter()
+    index = QuestionSearchIndex(bank)
+    print(f"Built index over {len(index)} questions in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(1)
+    words = vocabulary(bank[:1000])
+    subjects = sorted({q.get('subject') for q in bank[:1000] if q.get('subject')})
+    for label, with_filters in (('text only', False), ('text + filters', True)):
+        latencies = []
+        for _ in range(args.queries):
+            query = ' '.join(rng.sample(words, rng.randint(1, 3)))
+            filters = {'subject': rng.choice(subjects), 'difficulty': 'medium'} if with_filters else None
+            started = time.perf_counter()
+            index.search(query, filters=filters, limit=10)
+            latencies.append((time.perf_counter() - started) * 1000)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(f"{label:>15}: median {statistics.median(latencies):.3f} ms, p95 {p95:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
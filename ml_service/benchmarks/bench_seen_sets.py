@@ -0,0 +1,93 @@
+"""
+Per-user seen-set size and speed, roaring against Bloom.
+
+For each number of seen questions, reports the serialized bytes per user,
+that size extrapolated to 1M users, membership checks over a whole bank of
+candidates, serialize/deserialize and merge times, and (for Bloom) the
+measured false-positive rate. A Python set of ints is the baseline. It ends
+with the latency of `NoRepeatSelector.select` against an on-disk store.
+
+    python -m benchmarks.bench_seen_sets --questions 100000 --seen 100 1000 10000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import iter_synthetic
+from utils.bitmap_index import BitmapIndex
+from utils.seen_sets import BloomSeenSet, NoRepeatSelector, RoaringSeenSet, SeenStore, load_seen_set
+
+USERS = 1_000_000
+SELECTS = 200
+
+
+def timed(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_set(name, make, ordinals, candidates, unseen):
+    seen = make()
+    add = timed(lambda: make().add_many(ordinals), repeat=3)
+    seen.add_many(ordinals)
+    contains = timed(lambda: seen.contains_many(candidates))
+    blob = seen.to_bytes()
+    dump = timed(seen.to_bytes)
+    load = timed(lambda: load_seen_set(blob))
+    other = make()
+    other.add_many(ordinals[::2] + 1)
+    merge = timed(lambda: load_seen_set(blob).update(other))
+    false_positive = seen.contains_many(unseen).mean() if len(unseen) else 0.0
+    print(f"   {name:<8} {len(blob):>9,} {len(blob) * USERS / 2 ** 30:>11.2f} {add * 1000:>8.2f} "
+          f"{contains * 1000:>12.2f} {(dump + load) * 1e6:>10.1f} {merge * 1e6:>9.1f} {false_positive:>8.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-user seen-sets')
+    parser.add_argument('--questions', type=int, default=100000)
+    parser.add_argument('--seen', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    candidates = np.arange(args.questions)
+    print(f"{args.questions:,} questions; sizes are serialized bytes, GiB is for {USERS:,} users")
+    print(f"   {'set':<8} {'bytes':>9} {'GiB':>11} {'add ms':>8} {'contains ms':>12} "
+          f"{'dump+load µs':>10} {'merge µs':>9} {'FP':>8}")
+    for count in args.seen:
+        ordinals = np.sort(rng.choice(args.questions, count, replace=False))
+        unseen = np.setdiff1d(candidates, ordinals)
+        print(f"{count:,} seen")
+        bench_set('roaring', RoaringSeenSet, ordinals, candidates, unseen)
+        bench_set('bloom', lambda: BloomSeenSet(count, args.error_rate), ordinals, candidates, unseen)
+        python_set = set(ordinals.tolist())
+        contains = timed(lambda: [c in python_set for c in candidates.tolist()])
+        print(f"   {'set()':<8} {sys.getsizeof(python_set) + 28 * count:>9,} "
+              f"{(sys.getsizeof(python_set) + 28 * count) * USERS / 2 ** 30:>11.2f} {'':>8} "
+              f"{contains * 1000:>12.2f}")
+
+    questions = list(iter_synthetic(args.questions))
+    with tempfile.TemporaryDirectory() as tmp:
+        with SeenStore(os.path.join(tmp, 'seen.db')) as store:
+            started = time.perf_counter()
+            selector = NoRepeatSelector(questions, store, BitmapIndex(questions))
+            setup = time.perf_counter() - started
+            started = time.perf_counter()
+            for i in range(SELECTS):
+                selector.select(f'user-{i % 20}', 10, {'subject': 'Algorithms'}, rng)
+            select = (time.perf_counter() - started) / SELECTS
+            print(f"select: setup {setup:.2f}s, {select * 1000:.2f} ms per 10-question draw; "
+                  f"{store.stats()}")
+
+
+if __name__ == '__main__':
+    main()
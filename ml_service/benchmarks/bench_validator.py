@@ -0,0 +1,64 @@
+"""
+Throughput of the bulk validator, over a CompactQuestionBank and over the
+question dicts writers pass to `require_valid`.
+
+One question in a hundred is corrupted (wrong answer, bad difficulty or
+marks, unknown questionType) so the violation paths are exercised too.
+Bank construction is timed separately from validation.
+
+    python -m benchmarks.bench_validator --sizes 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.synthetic import iter_synthetic
+from utils.compact_bank import CompactQuestionBank
+from utils.question_validator import validate_bank, validate_questions
+
+CORRUPTIONS = (
+    ('correctAnswer', 'none of these'),
+    ('difficulty', 'trivial'),
+    ('marks', 3),
+    ('questionType', 'TF'),
+)
+
+
+def corrupted(n, rate=0.01, seed=0):
+    rng = random.Random(seed)
+    for question in iter_synthetic(n, seed):
+        if rng.random() < rate:
+            field, value = rng.choice(CORRUPTIONS)
+            question[field] = value
+        yield question
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark bulk question validation')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'questions':>10} {'build s':>8} {'validate ms':>12} {'q/s':>12} {'dicts ms':>9} {'invalid':>8}")
+    for n in args.sizes:
+        questions = list(corrupted(n))
+        started = time.perf_counter()
+        bank = CompactQuestionBank.from_questions(questions)
+        build = time.perf_counter() - started
+
+        best = best_dicts = float('inf')
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            report = validate_bank(bank)
+            best = min(best, time.perf_counter() - started)
+            started = time.perf_counter()
+            assert validate_questions(questions).invalid_count == report.invalid_count
+            best_dicts = min(best_dicts, time.perf_counter() - started)
+        print(f"{n:>10} {build:>8.2f} {best * 1000:>12.1f} {n / best:>12,.0f} {best_dicts * 1000:>9.1f}"
+              f" {report.invalid_count:>8}")
+        del bank, questions
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""Lets the tests import `utils` and `models` the way app.py does, and shares their fixtures"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_question(qid, text=None, **fields):
+    """A valid MCQ question dict; keyword fields override or add to the defaults"""
+    return dict({'id': qid, 'text': f'Question {qid}?' if text is None else text,
+                 'options': ['A', 'B', 'C', 'D'], 'correctAnswer': 'A', 'subject': 'Operating Systems',
+                 'topic': 'Paging', 'difficulty': 'easy', 'marks': 1}, **fields)
+
+
+@pytest.fixture
+def question():
+    """The `make_question` factory"""
+    return make_question
@@ -1,5 +1,9 @@
-import json
-from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.question_store import QuestionStore
 
 # Additional GATE CSE Questions Database
 additional_questions = [
@@ -107,52 +111,21 @@ additional_questions = [
 def add_questions_to_database():
     print("📚 Adding more questions to database...")
     
-    # Load existing questions
-    try:
-        with open('gate_format_complete.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            existing_questions = data.get('questions', [])
-    except FileNotFoundError:
-        existing_questions = []
-        data = {"questions": [], "metadata": {}}
-    
-    print(f"📊 Current questions: {len(existing_questions)}")
-    
-    # Add new questions (avoid duplicates)
-    existing_ids = {q['id'] for q in existing_questions}
-    new_questions = [q for q in additional_questions if q['id'] not in existing_ids]
-    
-    combined_questions = existing_questions + new_questions
-    
-    print(f"➕ Adding {len(new_questions)} new questions")
-    print(f"📊 Total questions: {len(combined_questions)}")
-    
-    # Update metadata
-    sections = {}
-    for q in combined_questions:
-        section = q.get('section', 'Core Computer Science')
-        sections[section] = sections.get(section, 0) + 1
-    
-    data['questions'] = combined_questions
-    data['metadata'] = {
-        "totalQuestions": len(combined_questions),
-        "totalMarks": sum(q.get('marks', 1) for q in combined_questions),
-        "sections": {
-            section: {
-                "questions": count,
-                "marks": sum(q.get('marks', 1) for q in combined_questions if q.get('section') == section)
-            }
-            for section, count in sections.items()
-        },
-        "lastUpdated": datetime.now().isoformat()
-    }
-    
-    # Save
-    with open('gate_format_complete.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with QuestionStore() as store:
+        print(f"📊 Current questions: {store.count()}")
+        
+        # Add new questions (avoid duplicates)
+        new_questions = store.add_questions(additional_questions)
+        
+        print(f"➕ Adding {len(new_questions)} new questions")
+        print(f"📊 Total questions: {store.count()}")
+        
+        # Only fold the journal into the snapshot once enough ops have piled up
+        store.compact_if_needed()
+        metadata = store.compute_metadata()
     
     print("✅ Questions added successfully!")
-    return data
+    return metadata
 
 if __name__ == "__main__":
     add_questions_to_database()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Build the question banks from every generator script in one command.
+
+Each generator runs as its own stage in a worker process; the merge stage
+folds their questions into a fresh store in a fixed order (the GATE paper
+first, then the other sources as listed in MERGE_ORDER), whatever order the
+generators finish in, applies the live store's local changes (Gist imports,
+questions added or edited by hand since the last build) on top and rebases
+the live store onto the result, which becomes the canonical snapshot.
+Stages whose code (the script and the modules it imports), parameters and
+upstream outputs are unchanged since the last build are skipped.
+
+Generators draw from the build seed (GATE_BUILD_SEED or --seed), so
+rebuilding unchanged sources produces byte-identical stages and is a no-op.
+Derived artifacts (near-duplicate report, binary bank, predictor topic
+features, question ID aliases, subject shards, compressed banks) are stages
+too and are only recomputed when the banks change.
+
+    python build_bank.py              # incremental build
+    python build_bank.py --force      # rebuild every stage
+    python build_bank.py --seed 7     # a different, reproducible bank
+    python build_bank.py merge        # only the canonical bank and its inputs
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+from functools import partial
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DATA_DIR, '..'))
+sys.path.insert(0, DATA_DIR)
+
+from models.predictor import FEATURES_PATH, build_topic_features
+from utils import build_seed
+from utils.binary_bank import DEFAULT_BINARY_PATH, write_binary_bank
+from utils.build_pipeline import BuildPipeline, Stage, content_hash, source_closure
+from utils.compressed_bank import compress_bank_file
+from utils.near_duplicates import DEFAULT_REPORT_PATH, MergeReport, build_merge_report, load_questions
+from utils.question_ids import DEFAULT_ALIAS_PATH, AliasTable
+from utils.question_journal import DEFAULT_SNAPSHOT_PATH, QuestionJournal, write_json_atomic
+from utils.question_store import QuestionStore
+from utils.question_validator import require_valid
+from utils.sharded_bank import DEFAULT_SHARD_DIR, MANIFEST_NAME, write_shards
+
+BUILD_DIR = os.path.join(DATA_DIR, '.build')
+BANK_300_PATH = os.path.join(DATA_DIR, "comprehensive_300_questions.json")
+BANK_FILES = [DEFAULT_SNAPSHOT_PATH, BANK_300_PATH]
+
+# stage name -> (generator module, function or list attribute)
+GENERATORS = {
+    "gate_paper": ("gate_format_questions", "build_gate_paper"),
+    "pyq_patterns": ("generate_gate_questions", "generate_comprehensive_questions"),
+    "additional": ("add_more_questions", "additional_questions"),
+    "expanded": ("expand_questions", "comprehensive_questions"),
+    "comprehensive": ("comprehensive_gate_generator", "generate_all_questions"),
+    "questions_300": ("generate_300_plus", "generate_questions"),
+    "parametric": ("parametric_questions", "generate_questions"),
+}
+
+SERVICE_DIR = os.path.dirname(DATA_DIR)
+UTILS_DIR = os.path.join(SERVICE_DIR, "utils")
+
+def code_inputs(*paths):
+    """`paths` and the ml_service modules they import: the code a stage runs"""
+    return source_closure(paths, [SERVICE_DIR, DATA_DIR])
+
+# Sources merged into the canonical bank after the GATE paper, in this order
+MERGE_ORDER = ["pyq_patterns", "additional", "expanded", "comprehensive", "parametric"]
+
+BANK_METADATA = {
+    "format": "GATE CSE 2024",
+    "duration": "180 minutes",
+    "sources": [
+        "GATE Official Papers (1991-2025)",
+        "GATE Overflow",
+        "GeeksforGeeks",
+        "Official GATE Syllabus",
+        "Comprehensive Question Generator",
+    ],
+}
+
+def generate(module_name, attribute, seed):
+    """Run one generator and return its questions (its progress output is dropped)"""
+    build_seed.BUILD_SEED = seed
+    with contextlib.redirect_stdout(io.StringIO()):
+        module = importlib.import_module(module_name)
+        value = getattr(module, attribute)
+        return value() if callable(value) else value
+
+def live_store_changes():
+    """Questions written to the live store since the last build (see QuestionStore.local_changes)"""
+    with QuestionStore(merge_report=MergeReport()) as store:
+        return store.local_changes()
+
+def live_store(changes):
+    """Source stage for the live store's local changes, exported when the build starts"""
+    return changes
+
+def merge_bank(paper, local, *sources):
+    """
+    Fold generator outputs into a fresh store, then rebase the live store
+    (and its journal) onto them with its local changes applied on top and
+    publish the result as the canonical snapshot
+    """
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=BUILD_DIR) as workdir:
+        journal = QuestionJournal(os.path.join(workdir, "journal"), os.path.join(workdir, "bank.json"))
+        # An empty merge report: near-duplicate review happens on the published banks, not here
+        with QuestionStore(os.path.join(workdir, "bank.db"), journal, merge_report=MergeReport()) as store:
+            # The paper is the base of the bank; other sources only add ids it does not have
+            store.upsert_questions(paper)
+            for questions in sources:
+                store.add_questions(questions)
+            generated = store.all_questions()
+    with QuestionStore(merge_report=MergeReport()) as live:
+        data = live.rebase(generated, local, metadata=BANK_METADATA)
+    # Keyed on content, not the snapshot file, whose lastUpdated changes every write
+    metadata = {key: value for key, value in data["metadata"].items() if key != "lastUpdated"}
+    return {"metadata": metadata, "contentHash": content_hash(data["questions"])}
+
+def publish_300(questions):
+    """Write the standalone bank the Node server loads first"""
+    write_json_atomic(BANK_300_PATH, require_valid(questions))
+    return {"path": os.path.basename(BANK_300_PATH), "count": len(questions),
+            "contentHash": content_hash(questions)}
+
+def load_banks():
+    return {os.path.basename(path): load_questions(path) for path in BANK_FILES}
+
+def unique_questions(banks):
+    seen, questions = set(), []
+    for bank in banks.values():
+        for q in bank:
+            if q.get("id") not in seen:
+                seen.add(q.get("id"))
+                questions.append(q)
+    return questions
+
+def near_duplicate_report(*_):
+    report = build_merge_report(load_banks())
+    write_json_atomic(DEFAULT_REPORT_PATH, report)
+    return {key: value for key, value in report.items() if key != "generatedAt"}
+
+def binary_bank(*_):
+    count = write_binary_bank(unique_questions(load_banks()), DEFAULT_BINARY_PATH)
+    return {"path": os.path.basename(DEFAULT_BINARY_PATH), "count": count}
+
+def topic_features(*_):
+    features = build_topic_features(unique_questions(load_banks()))
+    write_json_atomic(FEATURES_PATH, features)
+    return features
+
+def question_aliases(*_):
+    table = AliasTable.from_banks(load_banks())
+    table.save(DEFAULT_ALIAS_PATH)
+    return table.to_dict()
+
+def subject_shards(*_):
+    return write_shards(unique_questions(load_banks()), DEFAULT_SHARD_DIR)
+
+def compressed_banks(*_):
+    return [os.path.basename(compress_bank_file(path)[0]) for path in BANK_FILES]
+
+def build_stages(seed=None):
+    seed = build_seed.BUILD_SEED if seed is None else seed
+    stages = [
+        Stage(name, partial(generate, module, attribute, seed),
+              inputs=code_inputs(os.path.join(DATA_DIR, f"{module}.py")),
+              params={"seed": seed})
+        for name, (module, attribute) in GENERATORS.items()
+    ]
+    # The live store is a source like the generators: its export is keyed on content,
+    # so the merge reruns whenever a Gist import or hand edit changed it
+    changes = live_store_changes()
+    stages.append(Stage("live_store", partial(live_store, changes), params={"contentHash": content_hash(changes)}))
+    stages.append(Stage("merge", merge_bank, deps=["gate_paper", "live_store", *MERGE_ORDER],
+                        inputs=code_inputs(os.path.join(UTILS_DIR, "question_store.py")),
+                        params=BANK_METADATA, outputs=[DEFAULT_SNAPSHOT_PATH]))
+    stages.append(Stage("publish_300", publish_300, deps=["questions_300"],
+                        inputs=code_inputs(os.path.join(UTILS_DIR, "question_validator.py")),
+                        outputs=[BANK_300_PATH]))
+
+    # Derived artifacts depend only on the bank contents reported by merge/publish_300
+    # and the modules that compute them (load_banks reads through near_duplicates)
+    derived = {
+        "near_duplicates": (near_duplicate_report, DEFAULT_REPORT_PATH, "utils/near_duplicates.py"),
+        "binary_bank": (binary_bank, DEFAULT_BINARY_PATH, "utils/binary_bank.py"),
+        "topic_features": (topic_features, FEATURES_PATH, "models/predictor.py"),
+        "question_aliases": (question_aliases, DEFAULT_ALIAS_PATH, "utils/question_ids.py"),
+        "subject_shards": (subject_shards, os.path.join(DEFAULT_SHARD_DIR, MANIFEST_NAME), "utils/sharded_bank.py"),
+    }
+    for name, (func, output, module) in derived.items():
+        inputs = code_inputs(os.path.join(SERVICE_DIR, module), os.path.join(UTILS_DIR, "near_duplicates.py"))
+        stages.append(Stage(name, func, deps=["merge", "publish_300"], inputs=inputs, outputs=[output]))
+    stages.append(Stage("compressed_banks", compressed_banks, deps=["merge", "publish_300"],
+                        inputs=code_inputs(os.path.join(UTILS_DIR, "compressed_bank.py")),
+                        outputs=[f"{os.path.splitext(path)[0]}.gqz" for path in BANK_FILES]))
+    return stages
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the GATE question banks")
+    parser.add_argument("targets", nargs="*", help="stages to build (default: all)")
+    parser.add_argument("--force", action="store_true", help="ignore the build cache")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None, help="build seed (default: GATE_BUILD_SEED or 2024)")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("  GATE Question Bank Build")
+    print("=" * 60)
+
+    pipeline = BuildPipeline(build_stages(args.seed), BUILD_DIR, workers=args.workers)
+    icons = {"built": "🔨", "cached": "⏭️ "}
+    status = pipeline.run(
+        targets=args.targets or None,
+        force=args.force,
+        on_event=lambda name, outcome: print(f"{icons[outcome]} {name}: {outcome}"),
+    )
+
+    built = sum(1 for outcome in status.values() if outcome == "built")
+    print(f"\n✅ {built} stage(s) built, {len(status) - built} up to date")
+    if "merge" in status:
+        merge = pipeline.output("merge")
+        print(f"📊 Canonical bank: {merge['metadata']['totalQuestions']} questions, "
+              f"{merge['metadata']['totalMarks']} marks")
+    return status
+
+if __name__ == "__main__":
+    main()
@@ -4,28 +4,19 @@ Generates 300+ questions following official GATE syllabus
 Based on 20 years of GATE question patterns (2005-2025)
 """
 
-import json
-from datetime import datetime
-import random
+import os
+import sys
 
-# GATE CSE Syllabus Distribution (Based on official weightage)
-SYLLABUS_WEIGHTAGE = {
-    "Algorithms": 13,  # 13%
-    "Data Structures": 10,  # 10%
-    "Operating Systems": 10,  # 10%
-    "Theory of Computation": 7,  # 7%
-    "DBMS": 9,  # 9%
-    "Computer Networks": 9,  # 9%
-    "Programming": 8,  # 8%
-    "Compiler Design": 6,  # 6%
-    "Digital Logic": 7,  # 7%
-    "Computer Organization": 7,  # 7%
-    "Discrete Mathematics": 9,  # 9%
-    "General Aptitude": 15,  # 15%
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 
-def generate_algorithms_questions():
+from utils.build_seed import build_rng
+from utils.question_store import QuestionStore
+from utils.syllabus import SYLLABUS_WEIGHTAGE
+
+
+def generate_algorithms_questions(rng=None):
     """Generate 40 Algorithms questions (13% of 300)"""
+    rng = rng or build_rng("comprehensive_gate_generator.algorithms")
     questions = []
     base_id = 300
     
@@ -79,15 +70,16 @@ def generate_algorithms_questions():
                 "subject": "Algorithms",
                 "section": "Core Computer Science",
                 "difficulty": difficulty,
-                "year": random.choice([2021, 2022, 2023, 2024]),
+                "year": rng.choice([2021, 2022, 2023, 2024]),
                 "marks": marks,
                 "questionType": "MCQ"
             })
     
     return questions
 
-def generate_data_structures_questions():
+def generate_data_structures_questions(rng=None):
     """Generate 30 Data Structures questions (10% of 300)"""
+    rng = rng or build_rng("comprehensive_gate_generator.data_structures")
     questions = []
     base_id = 400
     
@@ -144,66 +136,36 @@ def generate_data_structures_questions():
                 "subject": "Data Structures",
                 "section": "Core Computer Science",
                 "difficulty": difficulty,
-                "year": random.choice([2021, 2022, 2023, 2024]),
+                "year": rng.choice([2021, 2022, 2023, 2024]),
                 "marks": marks,
                 "questionType": "MCQ"
             })
     
     return questions
 
+SOURCES = [
+    "GATE Official Papers (2005-2025)",
+    "GATE Overflow",
+    "Official GATE Syllabus",
+    "Comprehensive Question Generator"
+]
+
+def generate_all_questions():
+    """Every batch this generator currently produces, in batch order"""
+    return generate_algorithms_questions() + generate_data_structures_questions()
+
 def save_questions_batch(questions, batch_name):
-    """Save a batch of questions"""
-    try:
-        with open('gate_format_complete.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            existing = data.get('questions', [])
-    except FileNotFoundError:
-        existing = []
-        data = {}
-    
-    # Add new questions (avoid duplicates)
-    existing_ids = {q['id'] for q in existing}
-    new_questions = [q for q in questions if q['id'] not in existing_ids]
-    
-    all_questions = existing + new_questions
-    
-    # Calculate metadata
-    sections = {}
-    subjects = {}
-    for q in all_questions:
-        section = q.get('section', 'Core Computer Science')
-        subject = q.get('subject', 'Computer Science')
-        sections[section] = sections.get(section, 0) + 1
-        subjects[subject] = subjects.get(subject, 0) + 1
-    
-    data = {
-        "questions": all_questions,
-        "metadata": {
-            "totalQuestions": len(all_questions),
-            "totalMarks": sum(q.get('marks', 1) for q in all_questions),
-            "sections": {
-                section: {
-                    "questions": count,
-                    "marks": sum(q.get('marks', 1) for q in all_questions if q.get('section') == section)
-                }
-                for section, count in sections.items()
-            },
-            "subjects": subjects,
-            "lastUpdated": datetime.now().isoformat(),
-            "sources": [
-                "GATE Official Papers (2005-2025)",
-                "GATE Overflow",
-                "Official GATE Syllabus",
-                "Comprehensive Question Generator"
-            ]
-        }
-    }
-    
-    with open('gate_format_complete.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Save a batch of questions (appended to the journal, not a full rewrite)"""
+    with QuestionStore() as store:
+        # Add new questions (avoid duplicates)
+        new_questions = store.add_questions(questions)
+        
+        # Only fold the journal into the snapshot once enough ops have piled up
+        store.compact_if_needed(metadata={"sources": SOURCES})
+        total = store.count()
     
     print(f"✅ {batch_name}: Added {len(new_questions)} questions")
-    print(f"📊 Total questions now: {len(all_questions)}")
+    print(f"📊 Total questions now: {total}")
     return len(new_questions)
 
 def main():
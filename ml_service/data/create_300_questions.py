@@ -1,8 +1,15 @@
 """Quick script to generate 300+ GATE questions"""
 import json
-import random
+import os
+import sys
 
-def create_questions():
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.build_seed import build_rng
+from utils.question_validator import require_valid
+
+def create_questions(rng=None):
+    rng = rng or build_rng("create_300_questions")
     questions = []
     qid = 1
     
@@ -25,9 +32,9 @@ def create_questions():
                 "topic": topic,
                 "subject": "Operating Systems",
                 "section": "Core Computer Science",
-                "difficulty": random.choice(["easy", "medium", "hard"]),
-                "year": random.choice([2020, 2021, 2022, 2023, 2024]),
-                "marks": random.choice([1, 2]),
+                "difficulty": rng.choice(["easy", "medium", "hard"]),
+                "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
+                "marks": rng.choice([1, 2]),
                 "questionType": "MCQ"
             })
             qid += 1
@@ -36,7 +43,7 @@ def create_questions():
     return questions
 
 if __name__ == "__main__":
-    qs = create_questions()
+    qs = require_valid(create_questions())
     print(f"Total: {len(qs)}")
     with open("test_output.json", "w") as f:
         json.dump(qs, f, indent=2)
@@ -1,5 +1,11 @@
 import json
-import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.build_seed import build_rng
+from utils.question_validator import require_valid
 
 # Enhanced GATE CSE Questions based on actual exam patterns
 # Sourced from GATE previous years and standard resources
@@ -380,7 +386,8 @@ enhanced_questions = {
     ]
 }
 
-def generate_comprehensive_db():
+def generate_comprehensive_db(rng=None):
+    rng = rng or build_rng("enhanced_questions")
     all_questions = []
     question_id = 1
     years = [2019, 2020, 2021, 2022, 2023, 2024]
@@ -395,7 +402,7 @@ def generate_comprehensive_db():
                 "topic": subject,
                 "subject": subject,
                 "difficulty": q["difficulty"],
-                "year": random.choice(years),
+                "year": rng.choice(years),
                 "marks": q["marks"],
                 "explanation": q.get("explanation", "")
             }
@@ -403,7 +410,7 @@ def generate_comprehensive_db():
             question_id += 1
     
     # Shuffle for variety
-    random.shuffle(all_questions)
+    rng.shuffle(all_questions)
     
     data = {
         "metadata": {
@@ -417,6 +424,7 @@ def generate_comprehensive_db():
         "questions": all_questions
     }
     
+    require_valid(all_questions)
     with open('gate_questions_complete.json', 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
     
@@ -1,5 +1,9 @@
-import json
-from datetime import datetime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.question_store import QuestionStore
 
 # Comprehensive GATE CSE Questions
 comprehensive_questions = [
@@ -45,62 +49,27 @@ def expand_question_database():
     print("=" * 70)
     print()
     
-    # Load existing
-    try:
-        with open('gate_format_complete.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            existing = data.get('questions', [])
-    except FileNotFoundError:
-        existing = []
-        data = {}
-    
-    print(f"📊 Current questions: {len(existing)}")
-    
-    # Add new questions
-    existing_ids = {q['id'] for q in existing}
-    new_questions = [q for q in comprehensive_questions if q['id'] not in existing_ids]
-    
-    all_questions = existing + new_questions
-    
-    print(f"➕ Adding {len(new_questions)} new questions")
-    print(f"📊 Total questions: {len(all_questions)}")
-    
-    # Calculate metadata
-    sections = {}
-    subjects = {}
-    for q in all_questions:
-        section = q.get('section', 'Core Computer Science')
-        subject = q.get('subject', 'Computer Science')
-        sections[section] = sections.get(section, 0) + 1
-        subjects[subject] = subjects.get(subject, 0) + 1
-    
-    data = {
-        "questions": all_questions,
-        "metadata": {
-            "totalQuestions": len(all_questions),
-            "totalMarks": sum(q.get('marks', 1) for q in all_questions),
-            "sections": {
-                section: {
-                    "questions": count,
-                    "marks": sum(q.get('marks', 1) for q in all_questions if q.get('section') == section)
-                }
-                for section, count in sections.items()
-            },
-            "subjects": subjects,
-            "lastUpdated": datetime.now().isoformat()
-        }
-    }
+    with QuestionStore() as store:
+        print(f"📊 Current questions: {store.count()}")
+        
+        # Add new questions
+        new_questions = store.add_questions(comprehensive_questions)
+        
+        print(f"➕ Adding {len(new_questions)} new questions")
+        print(f"📊 Total questions: {store.count()}")
+        
+        # Only fold the journal into the snapshot once enough ops have piled up
+        store.compact_if_needed()
+        metadata = store.compute_metadata()
     
-    # Save
-    with open('gate_format_complete.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    subjects = metadata['subjects']
     
     print("\n✅ Database expanded successfully!")
     print(f"\n📊 Summary by Subject:")
     for subject, count in sorted(subjects.items()):
         print(f"   {subject}: {count} questions")
     
-    return data
+    return metadata
 
 if __name__ == "__main__":
     expand_question_database()
@@ -1,120 +1,144 @@
+import argparse
 import json
-import requests
+import os
+import sys
 from datetime import datetime
 
-def fetch_gist_questions():
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.bank_stream import batched, iter_topic_bank
+from utils.http_cache import CacheMiss, fetch
+from utils.question_ids import stable_id
+from utils.question_store import QuestionStore
+from utils.question_validator import split_valid
+
+# GitHub Gist raw URL (point GIST_URL at a local file server to test offline)
+GIST_URL = os.environ.get(
+    "GIST_URL",
+    "https://gist.githubusercontent.com/madhurimarawat/376ed280655bbd1a8d712741f282a08c/raw/",
+)
+BATCH_SIZE = 500
+
+# Fields a republished Gist question can change while staying the same question
+TRACKED_FIELDS = ("correctAnswer", "explanation", "topic", "subject", "difficulty", "year", "marks")
+
+FETCH_STATUS = {
+    "downloaded": "✅ Downloaded a new copy of the Gist",
+    "not_modified": "✅ Gist not modified since the last fetch (304), using the cached copy",
+    "offline": "📴 Offline, using the cached copy of the Gist",
+}
+
+def to_question(topic, q):
+    """Map a Gist record onto the question bank format"""
+    question = {
+        "text": q.get('question', ''),
+        "options": q.get('options', []),
+        "correctAnswer": q.get('answer', ''),
+        "explanation": q.get('explanation', ''),
+        "topic": topic,
+        "subject": q.get('subject', 'Computer Science'),
+        "section": "Core Computer Science",
+        "difficulty": q.get('difficulty', 'medium'),
+        "year": q.get('year', 2024),
+        "marks": q.get('marks', 1),
+        "source": "GitHub Gist"
+    }
+    # Content-addressed ids: re-importing never renumbers questions
+    return {"id": stable_id(question), **question}
+
+def sync_batch(store, batch):
+    """Insert new questions and update changed Gist ones; returns (added, updated)"""
+    new, changed = [], []
+    for q in batch:
+        stored = store.get(q["id"])
+        if stored is None:
+            new.append(q)
+        elif stored.get("source") == q["source"] and any(stored.get(f) != q.get(f) for f in TRACKED_FIELDS):
+            # Keep the stored id so the update replaces the row in place
+            changed.append(dict(q, id=stored["id"]))
+    added = store.add_questions(new, dedup_on='text') if new else []
+    if changed:
+        store.upsert_questions(changed)
+    return len(added), len(changed)
+
+def fetch_gist_questions(url=GIST_URL, offline=False, force=False):
     """
     Fetch GATE CSE questions from GitHub Gist
     URL: https://gist.github.com/madhurimarawat/376ed280655bbd1a8d712741f282a08c
+
+    The raw payload is cached with its ETag/Last-Modified and revalidated
+    with a conditional request. If the payload is the one already imported
+    (a 304, or offline with an imported cache) nothing else runs; `force`
+    re-imports it anyway.
     """
     
     print("🔍 Fetching questions from GitHub Gist...")
     
-    # GitHub Gist raw URL
-    gist_url = "https://gist.githubusercontent.com/madhurimarawat/376ed280655bbd1a8d712741f282a08c/raw/"
+    try:
+        entry, status = fetch(url, offline=offline)
+    except CacheMiss as e:
+        print(f"❌ {e}")
+        print("💡 Tip: Run once with network access to populate the cache")
+        return None
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Error fetching from Gist: {e}")
+        print("💡 Tip: Check your internet connection and the Gist URL")
+        return None
+    
+    print(FETCH_STATUS[status])
+    result = {"status": status, "processed": 0, "added": 0, "updated": 0, "rejected": {}}
+    if not force and entry.meta.get("importedSha256") == entry.digest:
+        print("⏭️  Payload already imported, nothing to do")
+        return result
     
     try:
-        response = requests.get(gist_url)
-        response.raise_for_status()
-        
-        # Parse the JSON data
-        data = response.json()
-        
-        print(f"✅ Successfully fetched data from Gist")
-        
-        # Process questions
-        all_questions = []
-        question_id = 1
-        
-        # The gist contains questions organized by topics
-        for topic, topic_data in data.items():
-            if isinstance(topic_data, dict) and 'questions' in topic_data:
-                questions = topic_data['questions']
-                
-                for q in questions:
-                    question = {
-                        "id": f"gist_{question_id}",
-                        "text": q.get('question', ''),
-                        "options": q.get('options', []),
-                        "correctAnswer": q.get('answer', ''),
-                        "explanation": q.get('explanation', ''),
-                        "topic": topic,
-                        "subject": q.get('subject', 'Computer Science'),
-                        "section": "Core Computer Science",
-                        "difficulty": q.get('difficulty', 'medium'),
-                        "year": q.get('year', 2024),
-                        "marks": q.get('marks', 1),
-                        "source": "GitHub Gist"
-                    }
-                    
-                    # Validate question has required fields
-                    if question['text'] and len(question['options']) >= 4 and question['correctAnswer']:
-                        all_questions.append(question)
-                        question_id += 1
-        
-        print(f"✅ Processed {len(all_questions)} questions")
-        
-        # Load existing questions
-        existing_questions = []
-        try:
-            with open('gate_format_complete.json', 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-                existing_questions = existing_data.get('questions', [])
-                print(f"📚 Found {len(existing_questions)} existing questions")
-        except FileNotFoundError:
-            print("📝 No existing questions file found, creating new one")
-        
-        # Combine questions (avoid duplicates based on text)
-        existing_texts = {q['text'] for q in existing_questions}
-        new_questions = [q for q in all_questions if q['text'] not in existing_texts]
-        
-        combined_questions = existing_questions + new_questions
+        with QuestionStore() as store:
+            print(f"📚 Found {store.count()} existing questions")
+            
+            # Parse, validate and sync one batch at a time instead of
+            # holding the whole Gist document in memory
+            records = iter_topic_bank(entry.payload_path)
+            questions = (to_question(topic, q) for topic, q in records)
+            rejected = result["rejected"]
+            for batch in batched(questions, BATCH_SIZE):
+                result["processed"] += len(batch)
+                valid, report = split_valid(batch)
+                for rule, positions in report.violations.items():
+                    rejected[rule] = rejected.get(rule, 0) + len(positions)
+                added, updated = sync_batch(store, valid)
+                result["added"] += added
+                result["updated"] += updated
+            
+            print(f"✅ Processed {result['processed']} questions")
+            for rule, count in rejected.items():
+                print(f"⚠️  Rejected {count} questions: {rule}")
+            print(f"➕ Added {result['added']} new questions")
+            print(f"✏️  Updated {result['updated']} changed questions")
+            print(f"📊 Total questions: {store.count()}")
+            
+            # Only fold the journal into the snapshot once enough ops have piled up
+            if result["added"] or result["updated"]:
+                store.compact_if_needed(metadata={
+                    "sources": ["GATE Format Questions", "GitHub Gist"]
+                })
+                result["metadata"] = store.compute_metadata()
         
-        print(f"➕ Added {len(new_questions)} new questions")
-        print(f"📊 Total questions: {len(combined_questions)}")
+        entry.update(importedSha256=entry.digest, importedAt=datetime.now().isoformat())
         
-        # Calculate metadata
-        sections = {}
-        for q in combined_questions:
-            section = q.get('section', 'Core Computer Science')
-            sections[section] = sections.get(section, 0) + 1
+        if "metadata" in result:
+            metadata = result["metadata"]
+            print(f"✅ Saved to the question store")
+            print(f"\n📊 Summary:")
+            print(f"   Total Questions: {metadata['totalQuestions']}")
+            print(f"   Total Marks: {metadata['totalMarks']}")
+            print(f"   Sections:")
+            for section, data in metadata['sections'].items():
+                print(f"      {section}: {data['questions']} questions, {data['marks']} marks")
         
-        # Create output structure
-        output = {
-            "questions": combined_questions,
-            "metadata": {
-                "totalQuestions": len(combined_questions),
-                "totalMarks": sum(q.get('marks', 1) for q in combined_questions),
-                "sections": {
-                    section: {
-                        "questions": count,
-                        "marks": sum(q.get('marks', 1) for q in combined_questions if q.get('section') == section)
-                    }
-                    for section, count in sections.items()
-                },
-                "lastUpdated": datetime.now().isoformat(),
-                "sources": ["GATE Format Questions", "GitHub Gist"]
-            }
-        }
+        return result
         
-        # Save to file
-        with open('gate_format_complete.json', 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2, ensure_ascii=False)
-        
-        print(f"✅ Saved to gate_format_complete.json")
-        print(f"\n📊 Summary:")
-        print(f"   Total Questions: {output['metadata']['totalQuestions']}")
-        print(f"   Total Marks: {output['metadata']['totalMarks']}")
-        print(f"   Sections:")
-        for section, data in output['metadata']['sections'].items():
-            print(f"      {section}: {data['questions']} questions, {data['marks']} marks")
-        
-        return output
-        
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error fetching from Gist: {e}")
-        print("💡 Tip: Check your internet connection and the Gist URL")
-        return None
     except json.JSONDecodeError as e:
         print(f"❌ Error parsing JSON: {e}")
         return None
@@ -123,16 +147,23 @@ def fetch_gist_questions():
         return None
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import GATE CSE questions from GitHub Gist")
+    parser.add_argument("--url", default=GIST_URL, help="Gist raw URL (or a local file server)")
+    parser.add_argument("--offline", action="store_true", help="use the cached copy without any request")
+    parser.add_argument("--force", action="store_true", help="re-import even if the payload is unchanged")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("  GATE CSE Questions - GitHub Gist Importer")
     print("=" * 60)
     print()
     
-    result = fetch_gist_questions()
+    result = fetch_gist_questions(args.url, offline=args.offline, force=args.force)
     
     if result:
         print("\n✅ Successfully imported questions from GitHub Gist!")
-        print("🔄 Restart the server to load the new questions")
+        if result["added"] or result["updated"]:
+            print("🔄 Restart the server to load the new questions")
     else:
         print("\n❌ Failed to import questions")
         print("📝 Using existing questions database")
@@ -1,5 +1,10 @@
-import json
-import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.bank_metadata import MetadataAggregator
+from utils.question_store import QuestionStore
 
 # GATE CSE Format: 65 Questions Total
 # Section 1: General Aptitude (10 questions, 15 marks)
@@ -592,8 +597,8 @@ gate_questions = {
     ]
 }
 
-def generate_gate_format_test():
-    """Generate a GATE format test with 65 questions"""
+def build_gate_paper():
+    """The 65 paper questions with their GATE IDs (no store writes)"""
     all_questions = []
     question_id = 1
     year = 2024
@@ -615,40 +620,39 @@ def generate_gate_format_test():
             all_questions.append(question)
             question_id += 1
     
-    # Calculate totals
-    ga_count = len([q for q in all_questions if q["section"] == "General Aptitude"])
-    em_count = len([q for q in all_questions if q["section"] == "Engineering Mathematics"])
-    cs_count = len([q for q in all_questions if q["section"] == "Core Computer Science"])
+    return all_questions
+
+def generate_gate_format_test():
+    """Generate a GATE format test with 65 questions"""
+    all_questions = build_gate_paper()
+    
+    # Calculate totals in one pass
+    totals = MetadataAggregator.from_questions(all_questions).to_dict()
+    section_totals = totals["sections"]
+    ga_count = section_totals["General Aptitude"]["questions"]
+    em_count = section_totals["Engineering Mathematics"]["questions"]
+    cs_count = section_totals["Core Computer Science"]["questions"]
     
-    total_marks = sum(q["marks"] for q in all_questions)
+    total_marks = totals["totalMarks"]
     
-    data = {
-        "metadata": {
-            "totalQuestions": len(all_questions),
-            "totalMarks": total_marks,
-            "sections": {
-                "General Aptitude": {"questions": ga_count, "marks": sum(q["marks"] for q in all_questions if q["section"] == "General Aptitude")},
-                "Engineering Mathematics": {"questions": em_count, "marks": sum(q["marks"] for q in all_questions if q["section"] == "Engineering Mathematics")},
-                "Core Computer Science": {"questions": cs_count, "marks": sum(q["marks"] for q in all_questions if q["section"] == "Core Computer Science")}
-            },
+    # The paper is the base of the canonical bank; re-running refreshes it in place
+    with QuestionStore() as store:
+        store.upsert_questions(all_questions)
+        # Only fold the journal into the snapshot once enough ops have piled up
+        store.compact_if_needed(metadata={
             "format": "GATE CSE 2024",
-            "duration": "180 minutes",
-            "lastUpdated": "2024-11-29"
-        },
-        "questions": all_questions
-    }
-    
-    with open('gate_format_complete.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+            "duration": "180 minutes"
+        })
+        metadata = store.compute_metadata()
     
     print(f"✅ Generated GATE format test with {len(all_questions)} questions")
     print(f"📊 Section Distribution:")
-    print(f"   - General Aptitude: {ga_count} questions ({data['metadata']['sections']['General Aptitude']['marks']} marks)")
-    print(f"   - Engineering Mathematics: {em_count} questions ({data['metadata']['sections']['Engineering Mathematics']['marks']} marks)")
-    print(f"   - Core Computer Science: {cs_count} questions ({data['metadata']['sections']['Core Computer Science']['marks']} marks)")
+    print(f"   - General Aptitude: {ga_count} questions ({section_totals['General Aptitude']['marks']} marks)")
+    print(f"   - Engineering Mathematics: {em_count} questions ({section_totals['Engineering Mathematics']['marks']} marks)")
+    print(f"   - Core Computer Science: {cs_count} questions ({section_totals['Core Computer Science']['marks']} marks)")
     print(f"📝 Total Marks: {total_marks}")
     
-    return data
+    return metadata
 
 if __name__ == "__main__":
     generate_gate_format_test()
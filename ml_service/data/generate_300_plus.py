@@ -4,9 +4,17 @@ Generate 300+ GATE CSE Questions
 Complete question bank across all subjects
 """
 import json
-import random
+import os
+import sys
 
-def main():
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.build_seed import build_rng
+from utils.question_validator import require_valid
+
+def generate_questions(rng=None):
+    """Build the full question list (no files written)"""
+    rng = rng or build_rng("generate_300_plus")
     questions = []
     qid = 1
     
@@ -60,7 +68,7 @@ def main():
             "subject": "Operating Systems",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -111,7 +119,7 @@ def main():
             "subject": "Database Management Systems",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -162,7 +170,7 @@ def main():
             "subject": "Computer Networks",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -226,8 +234,8 @@ def main():
             "subject": "DSA",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
-            "marks": random.choice([1, 2]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
+            "marks": rng.choice([1, 2]),
             "questionType": "MCQ"
         })
         qid += 1
@@ -275,8 +283,8 @@ def main():
             "subject": "Theory of Computation",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
-            "marks": random.choice([1, 2]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
+            "marks": rng.choice([1, 2]),
             "questionType": "MCQ"
         })
         qid += 1
@@ -329,7 +337,7 @@ def main():
             "subject": "COA",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -373,7 +381,7 @@ def main():
             "subject": "Compiler Design",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -422,7 +430,7 @@ def main():
             "subject": "Digital Logic",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -486,7 +494,7 @@ def main():
             "subject": "Mathematics",
             "section": "Engineering Mathematics",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -530,7 +538,7 @@ def main():
             "subject": "Programming & C",
             "section": "Core Computer Science",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -574,7 +582,7 @@ def main():
             "subject": "General Aptitude",
             "section": "General Aptitude",
             "difficulty": diff,
-            "year": random.choice([2020, 2021, 2022, 2023, 2024]),
+            "year": rng.choice([2020, 2021, 2022, 2023, 2024]),
             "marks": 1,
             "questionType": "MCQ"
         })
@@ -582,6 +590,11 @@ def main():
     
     print(f"✓ General Aptitude: {len(ga_data)} questions")
     
+    return questions
+
+def main():
+    questions = require_valid(generate_questions())
+    
     # Save
     output_file = "comprehensive_300_questions.json"
     with open(output_file, 'w', encoding='utf-8') as f:
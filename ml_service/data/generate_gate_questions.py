@@ -1,6 +1,9 @@
-import json
-from datetime import datetime
-import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.question_store import QuestionStore
 
 # Comprehensive GATE CSE Questions based on official syllabus and PYQ patterns
 # Sources: GATE Overflow, GeeksforGeeks, Official GATE Papers (1991-2025)
@@ -348,64 +351,30 @@ def add_to_database():
     print("=" * 70)
     print()
     
-    # Load existing questions
-    try:
-        with open('gate_format_complete.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            existing = data.get('questions', [])
-    except FileNotFoundError:
-        existing = []
-        data = {}
-    
-    print(f"📊 Current questions: {len(existing)}")
-    
-    # Generate new questions
-    new_questions = generate_comprehensive_questions()
-    
-    # Add new questions (avoid duplicates)
-    existing_ids = {q['id'] for q in existing}
-    unique_new = [q for q in new_questions if q['id'] not in existing_ids]
-    
-    all_questions = existing + unique_new
-    
-    print(f"➕ Adding {len(unique_new)} new questions")
-    print(f"📊 Total questions: {len(all_questions)}")
-    
-    # Calculate metadata
-    sections = {}
-    subjects = {}
-    for q in all_questions:
-        section = q.get('section', 'Core Computer Science')
-        subject = q.get('subject', 'Computer Science')
-        sections[section] = sections.get(section, 0) + 1
-        subjects[subject] = subjects.get(subject, 0) + 1
+    sources = [
+        "GATE Official Papers (1991-2025)",
+        "GATE Overflow",
+        "GeeksforGeeks",
+        "Official GATE Syllabus"
+    ]
     
-    data = {
-        "questions": all_questions,
-        "metadata": {
-            "totalQuestions": len(all_questions),
-            "totalMarks": sum(q.get('marks', 1) for q in all_questions),
-            "sections": {
-                section: {
-                    "questions": count,
-                    "marks": sum(q.get('marks', 1) for q in all_questions if q.get('section') == section)
-                }
-                for section, count in sections.items()
-            },
-            "subjects": subjects,
-            "lastUpdated": datetime.now().isoformat(),
-            "sources": [
-                "GATE Official Papers (1991-2025)",
-                "GATE Overflow",
-                "GeeksforGeeks",
-                "Official GATE Syllabus"
-            ]
-        }
-    }
+    with QuestionStore() as store:
+        print(f"📊 Current questions: {store.count()}")
+        
+        # Generate new questions
+        new_questions = generate_comprehensive_questions()
+        
+        # Add new questions (avoid duplicates)
+        unique_new = store.add_questions(new_questions)
+        
+        print(f"➕ Adding {len(unique_new)} new questions")
+        print(f"📊 Total questions: {store.count()}")
+        
+        # Only fold the journal into the snapshot once enough ops have piled up
+        store.compact_if_needed(metadata={"sources": sources})
+        metadata = store.compute_metadata()
     
-    # Save
-    with open('gate_format_complete.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    subjects = metadata['subjects']
     
     print("\n✅ Questions added successfully!")
     print(f"\n📊 Summary by Subject:")
@@ -413,10 +382,10 @@ def add_to_database():
         print(f"   {subject}: {count} questions")
     
     print(f"\n📚 Sources:")
-    for source in data['metadata']['sources']:
+    for source in sources:
         print(f"   • {source}")
     
-    return data
+    return metadata
 
 if __name__ == "__main__":
     add_to_database()
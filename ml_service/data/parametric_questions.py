@@ -0,0 +1,46 @@
+"""
+Numeric GATE questions from the parametric templates in utils/question_templates.py
+(merge sort comparisons, page faults for a reference string, subnet host counts).
+
+    python parametric_questions.py            # 20 per template into the store
+    python parametric_questions.py --count 200
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.build_seed import build_numpy_rng
+from utils.question_store import QuestionStore
+from utils.question_templates import TEMPLATES, generate
+
+COUNT_PER_TEMPLATE = 20
+
+
+def generate_questions(count_per_template=COUNT_PER_TEMPLATE, rng=None):
+    rng = rng or build_numpy_rng("parametric_questions")
+    return generate(count_per_template, rng)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Add parametric template questions to the bank')
+    parser.add_argument('--count', type=int, default=COUNT_PER_TEMPLATE, help='questions per template')
+    args = parser.parse_args(argv)
+
+    questions = generate_questions(args.count)
+    with QuestionStore() as store:
+        added = store.add_questions(questions)
+        # Only fold the journal into the snapshot once enough ops have piled up
+        store.compact_if_needed()
+        metadata = store.compute_metadata()
+
+    print(f"🧮 Generated {len(questions)} questions from {len(TEMPLATES)} templates")
+    print(f"➕ Added {len(added)} new questions")
+    print(f"📊 Total questions: {metadata['totalQuestions']}")
+    return metadata
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
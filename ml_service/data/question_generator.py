@@ -1,5 +1,11 @@
 import json
-import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from utils.build_seed import build_rng
+from utils.question_validator import require_valid
 
 # Comprehensive GATE CSE Questions Database
 questions_db = {
@@ -412,7 +418,8 @@ questions_db = {
     ]
 }
 
-def generate_questions_json():
+def generate_questions_json(rng=None):
+    rng = rng or build_rng("question_generator")
     all_questions = []
     question_id = 1
     years = [2019, 2020, 2021, 2022, 2023, 2024]
@@ -427,7 +434,7 @@ def generate_questions_json():
                 "topic": subject,
                 "subject": subject,
                 "difficulty": q["difficulty"],
-                "year": random.choice(years),
+                "year": rng.choice(years),
                 "marks": q["marks"]
             }
             all_questions.append(question)
@@ -443,6 +450,7 @@ def generate_questions_json():
         "questions": all_questions
     }
     
+    require_valid(all_questions)
     with open('gate_questions_complete.json', 'w') as f:
         json.dump(data, f, indent=2)
     
@@ -1,15 +1,39 @@
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
+import json
 import pickle
 import os
 from datetime import datetime
 
+FEATURES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'topic_features.json')
+
+def build_topic_features(questions):
+    """Per-subject question counts, marks and year spread of the question bank"""
+    features = {}
+    total = 0
+    for q in questions:
+        subject = q.get('subject') or q.get('topic')
+        if not subject:
+            continue
+        entry = features.setdefault(subject, {'questions': 0, 'marks': 0, 'years': {}})
+        entry['questions'] += 1
+        entry['marks'] += q.get('marks', 1)
+        year = str(q.get('year', ''))
+        if year:
+            entry['years'][year] = entry['years'].get(year, 0) + 1
+        total += 1
+    for entry in features.values():
+        entry['share'] = round(entry['questions'] / total, 4)
+        entry['years'] = dict(sorted(entry['years'].items()))
+    return dict(sorted(features.items()))
+
 class TopicPredictor:
     def __init__(self):
         self.model = None
         self.scaler = StandardScaler()
         self.load_model()
+        self.features = self.load_features()
         
         # Historical GATE CSE data patterns (based on actual trends)
         self.historical_weights = {
@@ -64,6 +88,13 @@ class TopicPredictor:
                 random_state=42
             )
     
+    def load_features(self, path=FEATURES_PATH):
+        """Bank features written by the data build (empty if not built yet)"""
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
     def calculate_topic_score(self, topic):
         """Calculate importance score based on multiple factors"""
         base_weight = self.historical_weights.get(topic, 0.75)
@@ -115,6 +146,7 @@ class TopicPredictor:
         """Retrain model with latest data"""
         print('Retraining model with latest GATE patterns...')
         # In production, this would fetch and train on real data
+        self.features = self.load_features()
         return True
     
     def get_topic_details(self, topic_name):
@@ -129,5 +161,6 @@ class TopicPredictor:
             'historicalFrequency': round(base_weight * 100, 1),
             'recentTrend': 'Increasing' if trend > 1.05 else 'Stable' if trend > 0.95 else 'Decreasing',
             'recommendedStudyHours': max(10, int(score / 5)),
-            'difficulty': 'High' if score > 85 else 'Medium' if score > 75 else 'Moderate'
+            'difficulty': 'High' if score > 85 else 'Medium' if score > 75 else 'Moderate',
+            'bankQuestions': self.features.get(topic_name, {}).get('questions', 0)
         }
@@ -0,0 +1,154 @@
+import threading
+
+import numpy as np
+import pytest
+
+from utils.adaptive_testing import GRID, AdaptiveTestEngine, AdaptiveTestError, probability
+
+SUBJECTS = ('Algorithms', 'Databases', 'Compiler Design')
+
+
+def synthetic_bank(per_subject=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {'id': f'{subject[:3]}_{i}', 'subject': subject, 'questionType': 'MCQ',
+         'options': ['A', 'B', 'C', 'D'], 'correctAnswer': 'A',
+         'irt': {'a': float(rng.uniform(0.8, 2.0)), 'b': float(rng.uniform(-3, 3)), 'c': 0.0}}
+        for subject in SUBJECTS for i in range(per_subject)
+    ]
+
+
+def simulate(engine, session, true_ability, rng):
+    while not session.finished:
+        position = engine.next_item(session, rng)
+        if position is None:
+            break
+        p = probability(true_ability, engine.a[position], engine.b[position], engine.c[position])
+        engine.record(session, position, rng.random() < p)
+    return session
+
+
+def test_eap_matches_brute_force_posterior_mean():
+    engine = AdaptiveTestEngine(synthetic_bank(20), weights={s: 1 for s in SUBJECTS})
+    session = engine.new_session()
+    positions, answers = [0, 25, 47, 3, 58], [True, False, True, True, False]
+    for position, correct in zip(positions, answers):
+        engine.record(session, position, correct)
+
+    grid = np.linspace(-4, 4, 81)
+    likelihood = np.exp(-0.5 * grid ** 2)
+    for position, correct in zip(positions, answers):
+        p = probability(grid, engine.a[position], engine.b[position], engine.c[position])
+        likelihood *= p if correct else 1 - p
+    posterior = likelihood / likelihood.sum()
+    mean = posterior @ grid
+    assert session.ability == pytest.approx(mean, abs=1e-9)
+    assert session.standard_error == pytest.approx(np.sqrt(posterior @ (grid - mean) ** 2), abs=1e-9)
+
+
+@pytest.mark.parametrize('true_ability', [-2.0, -0.5, 0.0, 1.0, 2.5])
+def test_eap_converges_to_true_ability(true_ability):
+    engine = AdaptiveTestEngine(synthetic_bank(), weights={s: 1 for s in SUBJECTS})
+    errors, ses = [], []
+    for seed in range(20):
+        session = engine.new_session(max_items=60, min_items=60)
+        simulate(engine, session, true_ability, np.random.default_rng(seed))
+        errors.append(session.ability - true_ability)
+        ses.append(session.standard_error)
+    assert abs(np.mean(errors)) < 0.25
+    assert np.sqrt(np.mean(np.square(errors))) < 0.45
+    assert np.mean(ses) < 0.35
+
+
+def test_standard_error_stopping_rule():
+    engine = AdaptiveTestEngine(synthetic_bank(), weights={s: 1 for s in SUBJECTS})
+    session = simulate(engine, engine.new_session(max_items=100, min_items=5, se_target=0.4), 0.3,
+                       np.random.default_rng(1))
+    assert 5 <= len(session.responses) < 100
+    assert session.standard_error <= 0.4
+
+
+def test_content_balancing_follows_weights():
+    engine = AdaptiveTestEngine(synthetic_bank(), weights={'Algorithms': 3, 'Databases': 1, 'Compiler Design': 0})
+    session = simulate(engine, engine.new_session(max_items=40, min_items=40), 0.0, np.random.default_rng(2))
+    counts = engine.summary(session)['subjects']
+    assert counts == {'Algorithms': 30, 'Databases': 10}
+    # Every prefix stays within one item of its target share
+    running = {'Algorithms': 0, 'Databases': 0}
+    for n, position in enumerate(session.administered, 1):
+        running[engine.subjects[engine.subject_index[position]]] += 1
+        assert abs(running['Algorithms'] - 0.75 * n) <= 1
+
+
+def test_exhausted_subject_hands_over_to_the_others():
+    bank = synthetic_bank(per_subject=30)[:35]     # 30 Algorithms, 5 Databases
+    engine = AdaptiveTestEngine(bank, weights={'Algorithms': 1, 'Databases': 1})
+    session = simulate(engine, engine.new_session(max_items=20, min_items=20), 0.0, np.random.default_rng(3))
+    assert engine.summary(session)['subjects'] == {'Algorithms': 15, 'Databases': 5}
+    assert len(set(session.administered)) == 20
+
+
+@pytest.mark.parametrize('limits', [
+    {'max_items': 'x'}, {'se_target': 'abc'}, {'min_items': None}, {'max_items': 0},
+    {'max_items': 5, 'min_items': 10}, {'se_target': 0}, {'se_target': float('nan')},
+])
+def test_bad_limits_raise_adaptive_test_error(limits):
+    engine = AdaptiveTestEngine(synthetic_bank(5), weights={s: 1 for s in SUBJECTS})
+    with pytest.raises(AdaptiveTestError):
+        engine.begin(**limits)
+
+
+def test_respond_finishes_and_forgets_the_session():
+    engine = AdaptiveTestEngine(synthetic_bank(10), weights={s: 1 for s in SUBJECTS})
+    session_id, question = engine.begin(max_items=3, min_items=3)
+    assert 'correctAnswer' not in question
+    results = [engine.respond(session_id, 'A') for _ in range(3)]
+    assert [r['finished'] for r in results] == [False, False, True]
+    assert 'question' not in results[-1] and results[-1]['answered'] == 3
+    with pytest.raises(KeyError):
+        engine.respond(session_id, 'A')
+
+
+def test_concurrent_answers_to_one_session_are_serialized():
+    engine = AdaptiveTestEngine(synthetic_bank(50), weights={s: 1 for s in SUBJECTS})
+    session_id, _ = engine.begin(max_items=40, min_items=40)
+    session = engine.sessions[session_id]
+    accepted, start = [], threading.Barrier(8)
+
+    def worker():
+        start.wait()
+        for _ in range(10):
+            try:
+                accepted.append(engine.respond(session_id, 'A'))
+            except KeyError:
+                return
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(accepted) == 40
+    assert sorted(r['answered'] for r in accepted) == list(range(1, 41))
+    assert len(session.administered) == len(set(session.administered)) == 40
+    assert session_id not in engine.sessions
+    assert len(GRID) == len(session.log_posterior)
+
+
+@pytest.mark.parametrize('weights', [
+    {'Unknown Subject': 1}, {s: 0 for s in SUBJECTS}, {'Algorithms': 'high'}, {'Algorithms': float('nan')},
+    ['Algorithms'],
+])
+def test_bad_weights_raise_adaptive_test_error(weights):
+    with pytest.raises(AdaptiveTestError):
+        AdaptiveTestEngine(synthetic_bank(5), weights=weights)
+    engine = AdaptiveTestEngine(synthetic_bank(5), weights={s: 1 for s in SUBJECTS})
+    with pytest.raises(AdaptiveTestError):
+        engine.set_weights(weights)
+
+
+def test_empty_bank_fails_per_session_not_at_startup():
+    engine = AdaptiveTestEngine([])
+    with pytest.raises(AdaptiveTestError):
+        engine.begin()
+    assert not engine.sessions
@@ -0,0 +1,35 @@
+import numpy as np
+
+from utils.alias_sampler import AliasTable, PracticeSampler
+
+
+def skewed_sampler(question):
+    # One heavy single-question stratum: oversampled rounds keep redrawing it
+    questions = [question('Algorithms_0', subject='Algorithms')]
+    questions += [question(f'Databases_{i}', subject='Databases', topic=f'T{i % 3}') for i in range(123)]
+    questions += [question(f'Compiler Design_{i}', subject='Compiler Design') for i in range(50)]
+    return PracticeSampler(questions, {'skewed': {'Algorithms': 1e9, 'Databases': 1}})
+
+
+def test_skewed_weights_still_fill_the_set(question):
+    sampler = skewed_sampler(question)
+    assert sampler.reachable['skewed'] == 124
+    for seed in range(5):
+        positions = sampler.sample_positions(100, 'skewed', np.random.default_rng(seed))
+        assert len(positions) == len(set(positions)) == 100
+        assert all(sampler.questions[p]['subject'] != 'Compiler Design' for p in positions)
+
+
+def test_count_is_capped_at_the_reachable_questions(question):
+    sampler = skewed_sampler(question)
+    positions = sampler.sample_positions(500, 'skewed', np.random.default_rng(0))
+    assert sorted(positions) == list(range(124))
+
+
+def test_draw_shares_follow_weights(question):
+    sampler = PracticeSampler([question(f'{s}_{i}', subject=s) for s in ('A', 'B') for i in range(500)],
+                              {'w': {'A': 3, 'B': 1}})
+    assert sampler.shares('w') == {'A': 0.75, 'B': 0.25}
+    table = AliasTable([3, 1])
+    draws = table.sample(100000, np.random.default_rng(0))
+    assert abs(np.mean(draws == 0) - 0.75) < 0.01
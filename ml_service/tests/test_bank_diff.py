@@ -0,0 +1,39 @@
+from utils.bank_diff import diff_questions
+
+
+def test_edited_question_without_stable_id_is_modified(question):
+    old = [question('os_1', 'What is paging?'), question('os_2', 'What is thrashing?')]
+    new = [question('os_1', 'What is demand paging?'), question('os_2', 'What is thrashing?')]
+    diff = diff_questions(old, new)
+    assert diff.summary() == {'added': 0, 'removed': 0, 'modified': 1, 'unchanged': 1}
+    [(key, _, _, fields)] = diff.modified
+    assert (key, fields) == ('os_1', ['text'])
+    assert list(diff.changelog()) == [{'op': 'update', 'id': 'os_1', 'question': new[0], 'fields': ['text']}]
+
+
+def test_reused_id_on_new_content_still_pairs_once(question):
+    old = [question('a', 'Old text'), question('b', 'Kept')]
+    new = [question('b', 'Kept'), question('c', 'Brand new')]
+    diff = diff_questions(old, new)
+    assert [q['id'] for q in diff.added] == ['c']
+    assert [q['id'] for q in diff.removed] == ['a']
+
+
+def test_content_key_reports_edits_as_remove_and_add(question):
+    diff = diff_questions([question('a', 'Old text')], [question('a', 'New text')], key='content')
+    assert diff.summary() == {'added': 1, 'removed': 1, 'modified': 0, 'unchanged': 0}
+
+
+def test_changelog_keeps_both_questions_when_ids_swap(question):
+    old = [question('x', 'What is paging?', stableId='s1'), question('y', 'What is thrashing?', stableId='s2')]
+    new = [question('y', 'What is paging?', stableId='s1'), question('x', 'What is thrashing?', stableId='s2')]
+    ops = list(diff_questions(old, new).changelog())
+    assert [op['op'] for op in ops] == ['delete', 'delete', 'insert', 'insert']
+
+    bank = {q['id']: q for q in old}
+    for op in ops:
+        if op['op'] == 'delete':
+            bank.pop(op['id'], None)
+        else:
+            bank[op['id']] = op['question']
+    assert bank == {q['id']: q for q in new}
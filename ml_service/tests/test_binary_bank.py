@@ -0,0 +1,22 @@
+import pytest
+
+from utils.binary_bank import BinaryBankError, BinaryQuestionBank, write_binary_bank
+
+
+def test_round_trip_and_lookup_by_id(tmp_path, question):
+    questions = [question(qid, year=2020) for qid in ('os_10', 'os_2', 'GATE_PYQ_1', 'ds_7')]
+    path = str(tmp_path / 'bank.gqb')
+    write_binary_bank(questions, path)
+    with BinaryQuestionBank(path) as bank:
+        assert list(bank) == questions
+        for position, q in enumerate(questions):
+            assert bank.position_of(q['id']) == position
+        assert bank.position_of('os_3') is None
+        assert bank.position_of(10) is None
+
+
+@pytest.mark.parametrize('bad_id', [None, 10])
+def test_missing_or_non_string_ids_are_rejected(tmp_path, question, bad_id):
+    questions = [question('os_1'), question(bad_id)]
+    with pytest.raises(BinaryBankError):
+        write_binary_bank(questions, str(tmp_path / 'bank.gqb'))
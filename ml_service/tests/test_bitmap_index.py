@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from utils.bitmap_index import BitmapIndex, FilterError, parse_count
+
+
+def bank(n):
+    subjects = ['Algorithms', 'DBMS', 'Operating Systems']
+    return [{'id': f'q{i}', 'subject': subjects[i % 3], 'difficulty': 'hard' if i % 2 else 'easy',
+             'year': 2020 + i % 4, 'marks': 1 + i % 2} for i in range(n)]
+
+
+def test_filters_match_a_linear_scan():
+    questions = bank(300)
+    index = BitmapIndex(questions)
+    expression = {'or': [{'subject': 'DBMS', 'year': ['2021', 2022]}, {'not': {'marks': 1}}]}
+    expected = [i for i, q in enumerate(questions)
+                if (q['subject'] == 'DBMS' and q['year'] in (2021, 2022)) or q['marks'] != 1]
+    assert index.positions(expression).tolist() == expected
+    assert index.count(expression) == len(expected)
+
+
+def test_draws_never_repeat_a_question():
+    index = BitmapIndex(bank(30))
+    draws = index.draw([{'filter': {'subject': 'DBMS'}, 'count': 6}, {'filter': {'subject': 'DBMS'}, 'count': 6}],
+                       rng=random.Random(3))
+    ids = [q['id'] for draw in draws for q in draw]
+    assert [len(draw) for draw in draws] == [6, 4]
+    assert len(set(ids)) == 10
+
+
+@pytest.mark.parametrize('expression', [
+    {'year': 'abc'},
+    {'marks': 1.5},
+    {'marks': True},
+    {'subject': {'name': 'DBMS'}},
+    {'and': 5},
+    {'or': {'subject': 'DBMS'}},
+    {'and': ['DBMS']},
+    {'grade': 'A'},
+    ['subject'],
+])
+def test_malformed_filters_raise_filter_error(expression):
+    with pytest.raises(FilterError):
+        BitmapIndex(bank(10)).resolve(expression)
+
+
+@pytest.mark.parametrize('clauses', [
+    [{'count': 'two'}],
+    [{'count': 2.7}],
+    [{'count': -1}],
+    [{'count': None}],
+    ['subject'],
+    {'filter': {}},
+])
+def test_malformed_draws_raise_filter_error(clauses):
+    with pytest.raises(FilterError):
+        BitmapIndex(bank(10)).draw(clauses)
+
+
+def test_count_accepts_integral_values():
+    assert [parse_count(value) for value in (0, 3, 3.0, '4')] == [0, 3, 3, 4]
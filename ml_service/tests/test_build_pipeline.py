@@ -0,0 +1,58 @@
+import os
+
+from utils.build_pipeline import source_closure
+from utils.question_journal import QuestionJournal
+from utils.question_store import QuestionStore
+
+
+def open_store(tmp_path):
+    journal = QuestionJournal(str(tmp_path / 'journal'), str(tmp_path / 'bank.json'))
+    return QuestionStore(str(tmp_path / 'bank.db'), journal)
+
+
+def test_rebase_keeps_local_changes(tmp_path, question):
+    with open_store(tmp_path) as store:
+        store.rebase([question('gen_1', 'What is paging?'), question('gen_2', 'What is thrashing?')])
+        assert store.local_changes() == {'questions': [], 'deleted': []}
+
+        store.add_questions([question('gist_1', 'What is a TLB?')])
+        store.upsert_questions([question('gen_1', 'What is demand paging?')])
+        store.delete_questions(['gen_2'])
+        changes = store.local_changes()
+        assert [q['id'] for q in changes['questions']] == ['gen_1', 'gist_1']
+        assert changes['deleted'] == ['gen_2']
+
+        # A rebuild regenerates every generator question; the local changes survive it
+        data = store.rebase([question('gen_1', 'What is paging?'), question('gen_2', 'What is thrashing?'),
+                             question('gen_3', 'What is a page fault?')])
+        texts = {q['id']: q['text'] for q in data['questions']}
+        assert texts == {'gen_1': 'What is demand paging?', 'gen_3': 'What is a page fault?',
+                         'gist_1': 'What is a TLB?'}
+        assert store.journal.pending_ops() == 0
+        assert store.get(store.get('gist_1')['stableId'])['id'] == 'gist_1'
+
+
+def test_reopened_store_takes_snapshot_as_build_base(tmp_path, question):
+    with open_store(tmp_path) as store:
+        store.rebase([question('gen_1', 'What is paging?')])
+        store.add_questions([question('hand_1', 'What is segmentation?')])
+    os.remove(tmp_path / 'bank.db')
+
+    # Reseeded from snapshot plus journal: only the journaled question is local
+    with open_store(tmp_path) as store:
+        assert [q['id'] for q in store.local_changes()['questions']] == ['hand_1']
+
+
+def test_source_closure_follows_imports(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'a.py').write_text('from pkg import b\nimport json\n')
+    (tmp_path / 'pkg' / 'b.py').write_text('def f():\n    from pkg.c import g\n')
+    (tmp_path / 'pkg' / 'c.py').write_text('from pkg.a import x\n')
+    (tmp_path / 'pkg' / 'unused.py').write_text('')
+    stage = tmp_path / 'stage.py'
+    stage.write_text('from pkg.a import x\n')
+
+    closure = source_closure([str(stage)], [str(tmp_path)])
+    assert [os.path.relpath(path, tmp_path) for path in closure] == [
+        os.path.join('pkg', 'a.py'), os.path.join('pkg', 'b.py'), os.path.join('pkg', 'c.py'), 'stage.py'
+    ]
@@ -0,0 +1,38 @@
+import pytest
+
+from utils.compact_bank import CompactQuestionBank
+
+
+def test_round_trip_keeps_absent_options_and_answer_absent(question):
+    questions = [
+        question('mcq', year=2020, explanation='Paging splits memory into frames.'),
+        question('nat', questionType='NAT', options=[], correctAnswer='12'),
+        {'id': 'draft', 'text': 'Question draft?', 'topic': 'Paging'},
+        question('null_answer', correctAnswer=None, source='gist'),
+    ]
+    bank = CompactQuestionBank.from_questions(questions)
+    assert list(bank) == questions
+    assert 'options' not in bank[2] and 'correctAnswer' not in bank[2]
+    assert bank.get('nat')['options'] == []
+    assert bank.value('options', 2) == [] and bank.value('correctAnswer', 2) is None
+
+
+@pytest.mark.parametrize('field, value', [
+    ('year', 40000),
+    ('year', -1),
+    ('marks', 1.5),
+    ('marks', '2'),
+    ('marks', True),
+])
+def test_out_of_range_integers_are_rejected(question, field, value):
+    bank = CompactQuestionBank([question('a')])
+    with pytest.raises(ValueError, match=field):
+        bank.append(question('b', **{field: value}))
+    assert len(bank) == 1 and bank.positions == {'a': 0}
+    assert [len(bank.column(name)) for name in ('year', 'marks', 'subject')] == [1, 1, 1]
+
+
+def test_integral_floats_are_stored_as_ints(question):
+    bank = CompactQuestionBank.from_questions([question('a', year=2024.0, marks=2.0)])
+    assert bank[0]['year'] == 2024 and bank[0]['marks'] == 2
+    assert isinstance(bank[0]['marks'], int)
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from utils.grading import AnswerKey, GradingError, answer_correct
+
+QUESTIONS = [
+    {'id': 'mcq1', 'questionType': 'MCQ', 'marks': 1, 'options': ['A', 'B', 'C', 'D'],
+     'correctAnswer': 'B', 'section': 'General Aptitude'},
+    {'id': 'mcq2', 'questionType': 'MCQ', 'marks': 2, 'options': ['A', 'B', 'C', 'D'],
+     'correctAnswer': 'C', 'section': 'Core Computer Science'},
+    {'id': 'msq2', 'questionType': 'MSQ', 'marks': 2, 'options': ['A', 'B', 'C', 'D'],
+     'correctAnswer': ['A', 'C'], 'section': 'Core Computer Science'},
+    {'id': 'nat1', 'questionType': 'NAT', 'marks': 1, 'correctAnswer': '2.5 to 2.6',
+     'section': 'General Aptitude'},
+    {'id': 'nat2', 'questionType': 'NAT', 'marks': 2, 'correctAnswer': 42,
+     'section': 'Core Computer Science'},
+]
+
+
+@pytest.fixture
+def key():
+    return AnswerKey(QUESTIONS)
+
+
+def grade(key, answers, details=True):
+    return key.grade_answers([answers]).to_dicts(details=details)[0]
+
+
+def test_all_correct_scores_full_marks(key):
+    result = grade(key, {'mcq1': 'B', 'mcq2': 'C', 'msq2': ['C', 'A'], 'nat1': '2.55', 'nat2': 42})
+    assert result['score'] == result['maxScore'] == 8
+    assert (result['correct'], result['wrong'], result['unanswered'], result['negativeMarks']) == (5, 0, 0, 0)
+
+
+def test_wrong_one_mark_mcq_loses_a_third(key):
+    result = grade(key, {'mcq1': 'A'})
+    assert result['marks']['mcq1'] == -0.33
+    assert key.grade_answers([{'mcq1': 'A'}]).scores[0] == pytest.approx(-1 / 3)
+
+
+def test_wrong_two_mark_mcq_loses_two_thirds(key):
+    result = key.grade_answers([{'mcq2': 'D'}])
+    assert result.scores[0] == pytest.approx(-2 / 3)
+    assert result.negative[0] == pytest.approx(2 / 3)
+
+
+def test_msq_and_nat_carry_no_negative_marks(key):
+    result = grade(key, {'msq2': ['A'], 'nat1': '3.1', 'nat2': 41})
+    assert result['score'] == 0 and result['negativeMarks'] == 0
+    assert result['wrong'] == 3
+    # Choosing a superset of the correct options is also wrong, still without penalty
+    assert grade(key, {'msq2': ['A', 'B', 'C']})['marks']['msq2'] == 0
+
+
+@pytest.mark.parametrize('answer, correct', [
+    ('2.5', True), (2.6, True), ('2.55', True), ('2.49', False), (2.61, False),
+])
+def test_nat_range_bounds_are_inclusive(key, answer, correct):
+    assert grade(key, {'nat1': answer})['marks']['nat1'] == (1 if correct else 0)
+    assert answer_correct(QUESTIONS[3], answer) is correct
+
+
+def test_unanswered_questions_score_zero(key):
+    result = grade(key, {'mcq1': None, 'msq2': [], 'nat1': ''})
+    assert result['unanswered'] == 5
+    assert result['score'] == 0 and result['wrong'] == 0
+
+
+def test_unknown_option_is_answered_and_wrong(key):
+    result = grade(key, {'mcq1': 'E', 'msq2': ['A', 'C', 'Z']})
+    assert result['marks'] == {'mcq1': -0.33, 'mcq2': 0, 'msq2': 0, 'nat1': 0, 'nat2': 0}
+    assert result['wrong'] == 2 and result['unanswered'] == 3
+
+
+@pytest.mark.parametrize('answer', ['forty-two', 'abc', True, [42]])
+def test_non_numeric_nat_answer_is_wrong_without_penalty(key, answer):
+    result = grade(key, {'nat2': answer})
+    assert result['marks']['nat2'] == 0
+    assert result['wrong'] == 1 and result['negativeMarks'] == 0
+
+
+def test_section_breakdown(key):
+    result = grade(key, {'mcq1': 'B', 'nat1': '2.5', 'mcq2': 'A', 'msq2': ['A', 'C']})
+    assert result['sections'] == {'Core Computer Science': 1.33, 'General Aptitude': 2.0}
+    assert sum(result['sections'].values()) == pytest.approx(result['score'], abs=0.01)
+
+
+def test_batch_matches_per_answer_grading(key):
+    rng = np.random.default_rng(0)
+    options = ['A', 'B', 'C', 'D']
+    submissions = [{
+        'mcq1': rng.choice(options).item(), 'mcq2': rng.choice(options).item(),
+        'msq2': sorted(rng.choice(options, rng.integers(1, 4), replace=False).tolist()),
+        'nat1': str(round(float(rng.uniform(2.4, 2.7)), 2)), 'nat2': int(rng.integers(40, 44)),
+    } for _ in range(200)]
+    scores = key.grade_answers(submissions).scores
+    for answers, score in zip(submissions, scores):
+        expected = sum(q['marks'] if answer_correct(q, answers[q['id']])
+                       else (-q['marks'] / 3 if q['questionType'] == 'MCQ' else 0) for q in QUESTIONS)
+        assert score == pytest.approx(expected)
+
+
+def test_take_orders_and_rejects_unknown_ids(key):
+    subset = key.take(['nat1', 'mcq1'])
+    assert subset.ids == ['nat1', 'mcq1'] and subset.max_score == 2
+    with pytest.raises(GradingError):
+        key.take(['mcq1', 'missing'])
+    with pytest.raises(GradingError):
+        key.take('mcq1')
+    with pytest.raises(GradingError, match='mcq1'):
+        key.take(['mcq1', 'nat1', 'mcq1'])
+
+
+def test_duplicate_question_ids_are_rejected():
+    with pytest.raises(GradingError, match='nat1'):
+        AnswerKey(QUESTIONS + [dict(QUESTIONS[3], correctAnswer=7)])
+    with pytest.raises(GradingError):
+        AnswerKey([{'questionType': 'NAT', 'correctAnswer': 1}, {'questionType': 'NAT', 'correctAnswer': 2}],
+                  strict=False)
+
+
+@pytest.mark.parametrize('submission', [['mcq1', 'B'], 'B', None])
+def test_malformed_submission_raises_grading_error(key, submission):
+    with pytest.raises(GradingError):
+        key.grade_answers([submission])
+
+
+@pytest.mark.parametrize('answer', [5, {'A': True}, [['A']]])
+def test_malformed_choice_answer_raises_grading_error(key, answer):
+    with pytest.raises(GradingError):
+        key.grade_answers([{'msq2': answer}])
+
+
+def test_ungradable_answer_key_is_rejected_unless_lenient():
+    bad = [{'id': 'x', 'questionType': 'MCQ', 'options': ['A', 'B'], 'correctAnswer': 'Z'}]
+    with pytest.raises(GradingError):
+        AnswerKey(bad)
+    lenient = AnswerKey(bad, strict=False)
+    assert lenient.grade_answers([{'x': 'Z'}]).to_dicts()[0]['score'] == 0
@@ -0,0 +1,71 @@
+"""
+Loader tests against a real mongod. They use a throwaway database on
+MONGODB_TEST_URI (default: a local mongod) and are skipped when none answers.
+"""
+
+import os
+import uuid
+
+import pytest
+
+pymongo = pytest.importorskip('pymongo')
+
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from utils.mongo_loader import COLLECTION, ensure_indexes, load_questions, to_document
+
+TEST_URI = os.environ.get('MONGODB_TEST_URI', 'mongodb://localhost:27017')
+
+
+@pytest.fixture
+def collection():
+    client = pymongo.MongoClient(TEST_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command('ping')
+    except PyMongoError:
+        client.close()
+        pytest.skip(f'no mongod at {TEST_URI}')
+    name = f'gate_prep_test_{uuid.uuid4().hex[:8]}'
+    yield client[name][COLLECTION]
+    client.drop_database(name)
+    client.close()
+
+
+def test_stable_id_index_is_partial(collection):
+    ensure_indexes(collection)
+    index = collection.index_information()['stableId_1']
+    assert index['unique']
+    assert index['partialFilterExpression'] == {'stableId': {'$exists': True}}
+    # Documents created by the Node model carry no stableId; they must not collide on null
+    collection.insert_many([{'text': 'a'}, {'text': 'b'}])
+
+
+def test_reload_updates_in_place(collection, question):
+    ensure_indexes(collection)
+    questions = [question(f'q{i}') for i in range(25)]
+    first = load_questions(questions, collection, batch_size=10, workers=2)
+    ids = {doc['stableId']: doc['_id'] for doc in collection.find()}
+    second = load_questions(questions, collection, batch_size=10, workers=2)
+
+    assert (first.inserted, second.inserted) == (25, 0)
+    assert {doc['stableId']: doc['_id'] for doc in collection.find()} == ids
+
+
+def test_duplicate_stable_id_rejected(collection, question):
+    ensure_indexes(collection)
+    document = to_document(question('q1', stableId='abc'))
+    collection.insert_one(dict(document))
+    with pytest.raises(DuplicateKeyError):
+        collection.insert_one(dict(document))
+
+
+def test_document_fields_match_question_model(question):
+    document = to_document(question('q1', correctAnswer=['A', 'C'], questionType='MSQ',
+                                    section='Core Computer Science', stableId='abc'))
+    assert document['correctAnswer'] == 'A;C'
+    assert document['legacyId'] == 'q1'
+    assert document['section'] == 'Core Computer Science'
+    assert set(document) <= {
+        'stableId', 'legacyId', 'text', 'options', 'correctAnswer', 'topic', 'subject', 'section',
+        'difficulty', 'questionType', 'year', 'marks', 'explanation',
+    }
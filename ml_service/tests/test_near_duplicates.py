@@ -0,0 +1,41 @@
+from utils.near_duplicates import NearDuplicateIndex, find_clusters, question_features, similarity
+
+
+def question(qid, text, options, answer, **fields):
+    return dict({'id': qid, 'text': text, 'options': options, 'correctAnswer': answer}, **fields)
+
+
+BELADY_SHORT = question('Q0027', 'Belady anomaly in?', ['FIFO', 'LRU', 'Optimal', 'All'], 'FIFO')
+BELADY_LONG = question('GATE2024_Q38', "Which page replacement algorithm suffers from Belady's anomaly?",
+                       ['LRU', 'FIFO', 'Optimal', 'LFU'], 'FIFO')
+# Same words as the short stem, but a different question: its answer differs
+BELADY_FREE = question('os_9', "Which page replacement algorithm is free from Belady's anomaly?",
+                       ['LRU', 'FIFO', 'Optimal', 'LFU'], 'Optimal')
+QUICK_SORT = question('algo_1', 'What is the worst case time complexity of Quick Sort?',
+                      ['O(n)', 'O(n log n)', 'O(n^2)', 'O(log n)'], 'O(n^2)')
+INSERTION_SORT = question('Q0104', 'Insertion sort worst case?',
+                          ['O(n)', 'O(n log n)', 'O(n^2)', 'O(log n)'], 'O(n^2)')
+
+
+def test_short_stem_matches_longer_rewording():
+    score = similarity(question_features(BELADY_SHORT), question_features(BELADY_LONG))
+    assert score >= 0.8
+
+    clusters = find_clusters([BELADY_LONG, QUICK_SORT, BELADY_SHORT])
+    assert [[position for position, _ in cluster] for cluster in clusters] == [[0, 2]]
+
+
+def test_short_stem_needs_same_answer_and_all_its_words():
+    assert similarity(question_features(BELADY_SHORT), question_features(BELADY_FREE)) < 0.8
+    # "insertion" is not in the Quick Sort stem, however much else is shared
+    assert similarity(question_features(INSERTION_SORT), question_features(QUICK_SORT)) < 0.8
+    assert find_clusters([BELADY_FREE, BELADY_SHORT, QUICK_SORT, INSERTION_SORT]) == []
+
+
+def test_index_finds_short_stems_in_either_order():
+    index = NearDuplicateIndex()
+    assert index.add_many([BELADY_SHORT, QUICK_SORT]) == []
+    [(position, earlier, _)] = index.add_many([BELADY_LONG])
+    assert (position, earlier) == (2, 0)
+    assert [key for key, _ in index.query(BELADY_SHORT)] == ['Q0027', 'GATE2024_Q38']
+    assert index.query(BELADY_FREE) == []
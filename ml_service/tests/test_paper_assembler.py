@@ -0,0 +1,24 @@
+import pytest
+
+from utils.paper_assembler import Blueprint, BlueprintError
+
+
+@pytest.mark.parametrize('data', [
+    {'sections': [{'questions': 10, 'marks': 15}]},
+    {'sections': [{'name': '', 'questions': 10, 'marks': 15}]},
+    {'sections': ['General Aptitude']},
+    {'sections': [{'name': 'General Aptitude', 'questions': 'ten', 'marks': 15}]},
+    {'sections': [{'name': 'General Aptitude', 'questions': 10, 'marks': 25}]},
+    {'weightage': {'Algorithms': 'high'}},
+    {'difficulty': ['easy']},
+    'General Aptitude',
+])
+def test_malformed_blueprints_raise_blueprint_error(data):
+    with pytest.raises(BlueprintError):
+        Blueprint.from_dict(data)
+
+
+def test_missing_keys_keep_gate_defaults():
+    blueprint = Blueprint.from_dict({'difficulty': {'hard': 1}})
+    assert (blueprint.total_questions, blueprint.total_marks) == (65, 100)
+    assert blueprint.difficulty == {'hard': 1}
@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+import pytest
+
+from utils.paper_assembler import Blueprint
+from utils.paper_pool import PaperPool
+
+SECTIONS = [{'name': 'Core Computer Science', 'questions': 4, 'marks': 6}]
+
+
+@pytest.fixture
+def bank(question):
+    return [question(f'{subject}_{marks}_{i}', subject=subject, marks=marks, section='Core Computer Science')
+            for subject in ('Algorithms', 'DBMS') for marks in (1, 2) for i in range(6)]
+
+
+def custom(easy):
+    return Blueprint(sections=SECTIONS, difficulty={'easy': easy})
+
+
+def make_pool(bank, **options):
+    return PaperPool(bank, profiles={'balanced': Blueprint(sections=SECTIONS)}, target=6, low_watermark=2,
+                     batch=4, custom_target=3, custom_low_watermark=1, max_custom=2, **options)
+
+
+def test_refill_tops_a_drained_pool_back_up(bank):
+    pool = make_pool(bank)
+    assert pool.fill(np.random.default_rng(0)) == 6
+    papers = [pool.get('balanced') for _ in range(8)]
+    assert all(paper['totalQuestions'] == 4 and paper['totalMarks'] == 6 for paper in papers)
+    metrics = pool.metrics()['profiles']['balanced']
+    # The last two came from an empty pool
+    assert (metrics['depth'], metrics['served'], metrics['misses']) == (0, 8, 2)
+    assert pool.refill('balanced') == 6
+    assert pool.refill('balanced') == 0
+
+
+def test_worker_refills_below_the_low_watermark(bank):
+    pool = make_pool(bank).start()
+    try:
+        deadline = time.monotonic() + 10
+        while pool.metrics()['profiles']['balanced']['depth'] < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for _ in range(5):
+            pool.get('balanced')
+        while pool.metrics()['profiles']['balanced']['depth'] < 6 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.metrics()['profiles']['balanced']['depth'] == 6
+    finally:
+        pool.stop(timeout=5)
+
+
+def test_custom_pools_are_bounded_and_idle_ones_evicted(bank):
+    pool = make_pool(bank)
+    first, second = pool.profile_for(custom(1)), pool.profile_for(custom(2))
+    assert first != second and pool.profile_for(custom(1)) == first
+    pool.fill()
+    assert [len(pool.papers[name]) for name in (first, second)] == [3, 3]
+
+    # Every custom slot is in use: a third blueprint gets no pool, but still gets papers
+    assert pool.profile_for(custom(3)) is None
+    assert pool.assemble(custom(3))['totalQuestions'] == 4
+    assert pool.evict_idle() == []
+
+    pool.get(first)
+    assert pool.evict_idle(idle=0) == [second, first]
+    assert sorted(pool.assemblers) == ['balanced']
+    assert pool.refill(first) == 0
+    with pytest.raises(KeyError):
+        pool.get(first)
+
+    third = pool.profile_for(custom(3))
+    assert third is not None and pool.metrics()['customProfiles'] == 1
+    assert pool.metrics()['customEvicted'] == 2
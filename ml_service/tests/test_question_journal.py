@@ -0,0 +1,64 @@
+import json
+import os
+
+from utils.question_journal import QuestionJournal, write_json_atomic
+
+
+def make_journal(tmp_path, segment_size=1000, snapshot=None):
+    snapshot_path = str(tmp_path / 'bank.json')
+    if snapshot is not None:
+        write_json_atomic(snapshot_path, {'questions': snapshot, 'metadata': {}})
+    return QuestionJournal(str(tmp_path / 'journal'), snapshot_path, segment_size=segment_size)
+
+
+def test_replay_is_idempotent(tmp_path, question):
+    journal = make_journal(tmp_path, snapshot=[question('a', 'Paging?'), question('b', 'Thrashing?')])
+    # Ops a reader already applied (the snapshot holds `a`) replay to the same bank
+    journal.insert([question('a', 'Paging?'), question('c', 'TLB?')])
+    journal.update([question('b', 'What is thrashing?')])
+    journal.delete(['a', 'missing'])
+    journal.insert([question('a', 'Demand paging?')])
+
+    first = journal.replay()
+    assert journal.replay() == first
+    assert [(q['id'], q['text']) for q in first.values()] == [
+        ('b', 'What is thrashing?'), ('c', 'TLB?'), ('a', 'Demand paging?')]
+    assert journal.questions() == list(first.values())
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path, question):
+    journal = make_journal(tmp_path, segment_size=2, snapshot=[question('a', 'Paging?')])
+    journal.insert([question('b', 'Thrashing?', marks=2), question('c', 'TLB?')])
+    journal.delete(['a'])
+    expected = journal.questions()
+
+    snapshot = journal.compact(metadata={'format': 'GATE CSE 2024'})
+    assert journal.segments() == [] and journal.pending_ops() == 0
+    assert journal.questions() == expected == snapshot['questions']
+    assert snapshot['metadata']['totalQuestions'] == 2
+    assert snapshot['metadata']['totalMarks'] == 3
+    assert snapshot['metadata']['format'] == 'GATE CSE 2024'
+
+
+def test_segments_roll_over_at_segment_size(tmp_path, question):
+    journal = make_journal(tmp_path, segment_size=3)
+    journal.insert([question(f'q{i}', f'Question {i}?') for i in range(4)])
+    journal.insert([question(f'q{i}', f'Question {i}?') for i in range(4, 7)])
+
+    assert [os.path.basename(path) for path in journal.segments()] == [
+        'segment-000001.jsonl', 'segment-000002.jsonl', 'segment-000003.jsonl']
+    assert [op['id'] for op in journal.iter_ops()] == [f'q{i}' for i in range(7)]
+    assert journal.pending_ops() == 7
+
+
+def test_append_after_torn_final_line(tmp_path, question):
+    journal = make_journal(tmp_path)
+    journal.insert([question('a', 'Paging?')])
+    # A writer crashed halfway through its next op
+    torn = json.dumps({'op': 'insert', 'id': 'b', 'question': question('b', 'Thrashing?')})
+    with open(journal.segments()[-1], 'a', encoding='utf-8') as f:
+        f.write(torn[:len(torn) // 2])
+
+    journal.insert([question('c', 'TLB?')])
+    assert [op['id'] for op in journal.iter_ops()] == ['a', 'c']
+    assert [q['id'] for q in journal.questions()] == ['a', 'c']
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from utils.question_journal import QuestionJournal, write_json_atomic
+from utils.question_store import QuestionStore
+from utils.question_validator import QuestionValidationError
+
+
+def open_store(tmp_path):
+    journal = QuestionJournal(str(tmp_path / 'journal'), str(tmp_path / 'bank.json'))
+    return QuestionStore(str(tmp_path / 'bank.db'), journal)
+
+
+def test_first_open_seeds_from_snapshot_and_journal(tmp_path, question):
+    write_json_atomic(str(tmp_path / 'bank.json'), {
+        'questions': [question('a', 'What is paging?'), question('b', 'What is thrashing?', marks=2)],
+        'metadata': {},
+    })
+    journal = QuestionJournal(str(tmp_path / 'journal'), str(tmp_path / 'bank.json'))
+    journal.insert([question('c', 'What is a TLB?')])
+    journal.delete(['a'])
+
+    with open_store(tmp_path) as store:
+        assert [q['id'] for q in store.iter_questions()] == ['b', 'c']
+        assert store.compute_metadata()['totalMarks'] == 3
+        # Seeding is not itself journaled
+        assert store.journal.pending_ops() == 2
+
+
+def test_add_questions_skips_known_ids_and_content(tmp_path, question):
+    with open_store(tmp_path) as store:
+        added = store.add_questions([question('a', 'What is paging?'), question('b', 'What is thrashing?')])
+        assert [q['id'] for q in added] == ['a', 'b']
+
+        # Same id, and a renumbered copy of `b` (same stable id), are both skipped
+        added = store.add_questions([question('a', 'Changed?'), question('b2', 'What is thrashing?'),
+                                     question('c', 'What is a TLB?')])
+        assert [q['id'] for q in added] == ['c']
+        assert store.get('a')['text'] == 'What is paging?'
+        assert store.get(store.get('b')['stableId'])['id'] == 'b'
+        assert store.count() == 3
+        assert store.journal.pending_ops() == 3
+
+
+def test_add_questions_rejects_invalid_batch_whole(tmp_path, question):
+    with open_store(tmp_path) as store:
+        with pytest.raises(QuestionValidationError):
+            store.add_questions([question('a', 'What is paging?'), question('b', 'Bad?', correctAnswer='E')])
+        assert store.count() == 0
+        assert store.journal.pending_ops() == 0
+
+
+def test_upsert_replaces_and_keeps_metadata_in_step(tmp_path, question):
+    with open_store(tmp_path) as store:
+        store.add_questions([question('a', 'What is paging?'), question('b', 'What is thrashing?')])
+        assert store.upsert_questions([question('a', 'What is demand paging?', marks=2, subject='DBMS'),
+                                       question('c', 'What is a TLB?')]) == 2
+        assert store.delete_questions(['b']) == 1
+
+        assert [(q['id'], q['text']) for q in store.iter_questions()] == [
+            ('a', 'What is demand paging?'), ('c', 'What is a TLB?')]
+        metadata = store.compute_metadata()
+        assert (metadata['totalQuestions'], metadata['totalMarks']) == (2, 3)
+        assert metadata['subjects'] == {'DBMS': 1, 'Operating Systems': 1}
+
+
+def test_export_json_and_compaction(tmp_path, question):
+    with open_store(tmp_path) as store:
+        store.add_questions([question('a', 'What is paging?'), question('b', 'What is thrashing?')])
+        data = store.export_json(str(tmp_path / 'export.json'), metadata={'format': 'GATE CSE 2024'})
+        with open(tmp_path / 'export.json', encoding='utf-8') as f:
+            assert json.load(f) == data
+        assert [q['id'] for q in data['questions']] == ['a', 'b']
+        assert data['metadata']['format'] == 'GATE CSE 2024'
+        assert data['metadata']['totalQuestions'] == 2
+
+        assert store.compact_if_needed(threshold=3) is None
+        assert store.compact_if_needed(threshold=2)['questions'] == data['questions']
+        assert store.journal.pending_ops() == 0
+        assert store.journal.questions() == data['questions']
@@ -0,0 +1,62 @@
+import numpy as np
+
+from utils.question_templates import TEMPLATES, MergeSortComparisons, PageFaults
+from utils.question_validator import require_valid
+
+
+def simulate(policy, frames, refs):
+    """Page faults by direct simulation, one reference at a time"""
+    memory, faults = [], 0
+    for t, page in enumerate(refs):
+        if page in memory:
+            if policy == 'LRU':
+                memory.remove(page)
+                memory.append(page)
+            continue
+        faults += 1
+        if len(memory) == frames:
+            if policy == 'Optimal':
+                upcoming = refs[t + 1:]
+                victim = max(memory, key=lambda p: upcoming.index(p) if p in upcoming else len(refs))
+                memory.remove(victim)
+            else:
+                # FIFO and LRU both keep the eviction order at the front
+                memory.pop(0)
+        memory.append(page)
+    return faults
+
+
+def test_page_faults_match_simulation():
+    template = PageFaults()
+    params = template.sample(np.random.default_rng(7), 3000)
+    faults = template.solve(params)
+    for policy, frames, refs, answer in zip(params['policy'].tolist(), params['frames'].tolist(),
+                                            params['refs'].tolist(), faults.tolist()):
+        assert answer == simulate(PageFaults.POLICIES[policy], frames, refs), (policy, frames, refs)
+
+
+def test_lru_worst_case_faults_on_every_reference():
+    # Cycling through one more page than there are frames defeats LRU (and FIFO) entirely
+    params = {'policy': np.array([1, 0, 2]), 'frames': np.array([3, 3, 3]),
+              'refs': np.tile(np.array([0, 1, 2, 3] * 3), (3, 1))}
+    assert PageFaults().solve(params).tolist() == [12, 12, simulate('Optimal', 3, [0, 1, 2, 3] * 3)]
+
+
+def test_merge_sort_worst_case_matches_recurrence():
+    worst = {1: 0}
+    for n in range(2, 600):
+        worst[n] = worst[n // 2] + worst[n - n // 2] + n - 1
+    n = np.arange(5, 600)
+    params = {'kind': np.zeros(len(n), dtype=np.int64), 'n': n, 'm': np.zeros(len(n), dtype=np.int64)}
+    assert MergeSortComparisons().solve(params).tolist() == [worst[k] for k in n.tolist()]
+
+
+def test_nat_questions_have_their_own_empty_option_lists():
+    questions = TEMPLATES['page_faults'].generate(50, np.random.default_rng(1))
+    assert len(questions) == 50
+    assert all(q['questionType'] == 'NAT' and q['options'] == [] for q in questions)
+    assert len({id(q['options']) for q in questions}) == 50
+    questions[0]['options'].append('4')
+    assert questions[1]['options'] == []
+    assert all(q['correctAnswer'].isdigit() for q in questions[1:])
+    require_valid(questions[1:])
@@ -0,0 +1,61 @@
+import pytest
+
+from utils.compact_bank import CompactQuestionBank
+from utils.question_validator import QuestionValidationError, require_valid, validate_bank, validate_questions
+
+
+@pytest.fixture
+def mixed(question):
+    return [
+        question('ok'),
+        question('nat', questionType='NAT', options=[], correctAnswer='2.5 to 2.6'),
+        question('msq', questionType='MSQ', correctAnswer=['A', 'C']),
+        question('dup'),
+        question('dup', text='What is thrashing?'),
+        question(None),
+        question('no_text', text=''),
+        question('no_topic', topic=None),
+        question('hard', difficulty='trivial'),
+        question('marks', marks=3),
+        question('type', questionType='TF'),
+        question('options', options=['A', 'B']),
+        question('answer', correctAnswer='E'),
+        question('msq_answer', questionType='MSQ', correctAnswer=['A', 'E']),
+        question('nat_answer', questionType='NAT', options=[], correctAnswer='about 3'),
+        question('no_answer', correctAnswer=''),
+    ]
+
+
+def test_dicts_and_compact_bank_agree(mixed):
+    report = validate_questions(mixed)
+    assert report.to_dict() == validate_bank(CompactQuestionBank.from_questions(mixed)).to_dict()
+    assert report.to_dict() == {
+        'missing_id': [None],
+        'duplicate_id': ['dup', 'dup'],
+        'missing_text': ['no_text'],
+        'missing_topic': ['no_topic'],
+        'missing_answer': ['no_answer'],
+        'invalid_difficulty': ['hard'],
+        'invalid_question_type': ['type'],
+        'invalid_marks': ['marks'],
+        'too_few_options': ['options'],
+        'answer_not_in_options': ['answer', 'msq_answer'],
+        'invalid_nat_answer': ['nat_answer'],
+    }
+
+
+def test_require_valid_does_not_build_a_compact_bank(monkeypatch, mixed):
+    def build(*args):
+        raise AssertionError('require_valid built a CompactQuestionBank')
+    monkeypatch.setattr(CompactQuestionBank, '__init__', build)
+
+    questions = mixed[:3]
+    assert require_valid(iter(questions)) == questions
+    with pytest.raises(QuestionValidationError) as error:
+        require_valid(mixed)
+    assert error.value.report.invalid_count == 13
+
+
+def test_unhashable_values_are_reported_not_raised(question):
+    report = validate_questions([question('a', marks=[1]), question('b', difficulty=['easy'])])
+    assert report.to_dict() == {'invalid_difficulty': ['b'], 'invalid_marks': ['a']}
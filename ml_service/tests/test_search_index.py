@@ -0,0 +1,60 @@
+import pytest
+
+from utils.question_journal import JournalTail, QuestionJournal, write_json_atomic
+from utils.search_index import QuestionSearchIndex, SearchError
+
+
+def test_removed_questions_leave_document_frequency(question):
+    index = QuestionSearchIndex([question(f'q{i}', 'round robin scheduling') for i in range(10)]
+                                + [question('other', 'page replacement')])
+    for i in range(9):
+        index.remove(f'q{i}')
+    assert index.df['robin'] == 1
+    [(found, score)] = index.search('robin')
+    assert found['id'] == 'q9' and score > 0
+
+
+def test_term_with_only_removed_postings_matches_nothing(question):
+    index = QuestionSearchIndex([question('a', 'deadlock avoidance'), question('b', 'paging')])
+    index.remove('a')
+    assert index.search('deadlock') == []
+
+
+def test_apply_ops_updates_and_deletes(question):
+    index = QuestionSearchIndex([question('a', 'deadlock avoidance'), question('b', 'paging')])
+    index.apply_ops([
+        {'op': 'update', 'id': 'a', 'question': question('a', 'bankers algorithm')},
+        {'op': 'delete', 'id': 'b'},
+        {'op': 'insert', 'id': 'c', 'question': question('c', 'thrashing and paging')},
+    ])
+    assert index.search('deadlock') == []
+    assert [q['id'] for q, _ in index.search('paging')] == ['c']
+    assert len(index) == 2
+
+
+def test_non_integer_year_raises_search_error(question):
+    index = QuestionSearchIndex([question('a', 'paging', year=2020)])
+    with pytest.raises(SearchError):
+        index.search('paging', filters={'year': ['abc']})
+    with pytest.raises(SearchError):
+        index.search('nothing matches this', filters={'year': 'abc'})
+    assert [q['id'] for q, _ in index.search('paging', filters={'year': ['2020']})] == ['a']
+
+
+def test_journal_tail_returns_new_ops_then_none_after_compaction(tmp_path, question):
+    snapshot = str(tmp_path / 'bank.json')
+    write_json_atomic(snapshot, {'questions': [question('a', 'paging')], 'metadata': {}})
+    journal = QuestionJournal(str(tmp_path / 'journal'), snapshot, segment_size=2)
+    journal.insert([question('b', 'segmentation')])
+    tail = JournalTail(journal)
+
+    assert tail.poll() == []
+    journal.insert([question('c', 'thrashing'), question('d', 'belady anomaly')])
+    journal.delete(['a'])
+    assert [(op['op'], op['id']) for op in tail.poll()] == [('insert', 'c'), ('insert', 'd'), ('delete', 'a')]
+    assert tail.poll() == []
+
+    journal.compact()
+    assert tail.poll() is None
+    journal.insert([question('e', 'working set')])
+    assert [op['id'] for op in tail.poll()] == ['e']
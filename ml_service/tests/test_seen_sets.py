@@ -0,0 +1,40 @@
+import threading
+
+import numpy as np
+
+from utils.seen_sets import NoRepeatSelector, SeenStore
+
+
+def bank(n):
+    return [{'id': f'q{i}', 'text': f'Question {i}?', 'options': ['A', 'B']} for i in range(n)]
+
+
+def test_concurrent_selects_never_serve_a_question_twice(tmp_path):
+    with SeenStore(str(tmp_path / 'seen.db')) as store:
+        selector = NoRepeatSelector(bank(200), store)
+        served, start = [], threading.Barrier(8)
+
+        def worker(seed):
+            rng = np.random.default_rng(seed)
+            start.wait()
+            for _ in range(5):
+                questions, repeated = selector.select('user-1', 5, rng=rng)
+                assert repeated == 0
+                served.extend(q['id'] for q in questions)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(served) == len(set(served)) == 200
+
+
+def test_repeats_start_once_unseen_questions_run_out(tmp_path):
+    with SeenStore(str(tmp_path / 'seen.db')) as store:
+        selector = NoRepeatSelector(bank(10), store)
+        first, repeated = selector.select('user-1', 8)
+        assert repeated == 0
+        second, repeated = selector.select('user-1', 5)
+        assert repeated == 3
+        assert {q['id'] for q in first}.isdisjoint(q['id'] for q in second[:2])
@@ -0,0 +1,46 @@
+import pytest
+
+from utils.sharded_bank import ShardedBank, write_shards
+
+
+@pytest.fixture
+def questions(question):
+    return [
+        question('alg_1', subject='Algorithms', year=2022),
+        question('alg_2', subject='Algorithms', year=2023),
+        question('db_1', subject='DBMS', year=2023),
+        question('c_1', subject='C', year=2023),
+        question('cpp_1', subject='C++', year=2023),
+        # Core GATE-paper questions name their subject in `topic`
+        question('os_1', subject=None, topic='Operating Systems', section='Core Computer Science', year=2023),
+    ]
+
+
+def test_query_opens_only_its_shards(tmp_path, questions):
+    manifest = write_shards(questions, str(tmp_path / 'shards'))
+    assert manifest['totalQuestions'] == len(questions)
+    bank = ShardedBank(str(tmp_path / 'shards'))
+
+    assert bank.loaded() == []
+    assert [q['id'] for q in bank.questions(subject='Algorithms')] == ['alg_1', 'alg_2']
+    assert bank.loaded() == ['algorithms.json']
+    assert [q['id'] for q in bank.questions(subject='Operating Systems')] == ['os_1']
+    assert bank.count(subject='Algorithms', year=2023) == 1
+    # "C" and "C++" slug to the same name and still get separate shards
+    assert sorted(entry['file'] for entry in bank.shards(subject=['C', 'C++'])) == ['c.json', 'c_.json']
+
+
+def test_shard_cache_is_bounded(tmp_path, questions):
+    write_shards(questions, str(tmp_path / 'shards'))
+    bank = ShardedBank(str(tmp_path / 'shards'), cache_size=2)
+    for subject in ('Algorithms', 'DBMS', 'Algorithms', 'C'):
+        list(bank.questions(subject=subject))
+    assert bank.loaded() == ['algorithms.json', 'c.json']
+
+
+def test_year_shards(tmp_path, questions):
+    manifest = write_shards(questions, str(tmp_path / 'shards'), by_year=True)
+    bank = ShardedBank(str(tmp_path / 'shards'))
+    assert [entry['file'] for entry in bank.shards(subject='Algorithms', year=2023)] == ['algorithms-2023.json']
+    assert [q['id'] for q in bank.questions(year=2023)] == ['alg_2', 'c_1', 'cpp_1', 'db_1', 'os_1']
+    assert len(manifest['shards']) == 6
@@ -0,0 +1,271 @@
+"""
+Computerized adaptive testing (CAT) over the question bank.
+
+Items follow the three-parameter logistic model. A question's `irt` field
+(`{a, b, c}`) is used when present. Otherwise discrimination is 1, the
+`difficulty` label sets b (easy -1, medium 0, hard 1), and guessing is 1/4
+for MCQ and 0 for MSQ/NAT, since those cannot be guessed from four options.
+
+Ability is estimated by EAP on a fixed grid of ability values with a
+standard normal prior. A session holds its log-posterior on that grid, so an
+answer updates the estimate in O(grid). The next item is the most
+informative one at the current estimate, subject to content balancing: the
+subject that is furthest behind its weight (SYLLABUS_WEIGHTAGE by default)
+is asked next. Item information is computed once for every grid point, and
+only each subject's TOP_ITEMS most informative items per grid point are
+kept. Selection walks that short list past the items already asked, so its
+cost does not grow with the bank. To limit exposure it picks at random among
+the `exposure` best ("randomesque" selection).
+
+    engine = AdaptiveTestEngine(questions)
+    session_id, question = engine.begin()
+    result = engine.respond(session_id, answer)    # next question or final ability
+"""
+
+import math
+import threading
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.grading import answer_correct
+from utils.question_validator import DEFAULT_QUESTION_TYPE
+from utils.syllabus import SYLLABUS_WEIGHTAGE, question_subject
+
+GRID = np.linspace(-4.0, 4.0, 81)
+SCALE = 1.702                   # logistic scaling constant (D) for the normal-ogive metric
+DIFFICULTY_B = {'easy': -1.0, 'medium': 0.0, 'hard': 1.0}
+GUESSING = {'MCQ': 0.25, 'MSQ': 0.0, 'NAT': 0.0}
+TOP_ITEMS = 48
+ITEM_CHUNK = 8192
+
+DEFAULT_MAX_ITEMS = 30
+DEFAULT_MIN_ITEMS = 5
+DEFAULT_SE_TARGET = 0.3
+DEFAULT_EXPOSURE = 3
+SESSION_CACHE_SIZE = 50000
+HIDDEN_FIELDS = ('correctAnswer', 'explanation')
+
+
+class AdaptiveTestError(ValueError):
+    pass
+
+
+def item_parameters(question):
+    """(a, b, c) 3PL parameters of a question"""
+    irt = question.get('irt') or {}
+    question_type = question.get('questionType') or DEFAULT_QUESTION_TYPE
+    return (
+        float(irt.get('a', 1.0)),
+        float(irt.get('b', DIFFICULTY_B.get(question.get('difficulty'), 0.0))),
+        float(irt.get('c', GUESSING.get(question_type, 0.0))),
+    )
+
+
+def probability(theta, a, b, c):
+    """P(correct) for abilities `theta` (column) and items a, b, c (row); broadcasts"""
+    return c + (1 - c) / (1 + np.exp(-SCALE * a * (theta - b)))
+
+
+def information(theta, a, b, c):
+    """Fisher information of 3PL items at abilities `theta`; broadcasts like `probability`"""
+    p = probability(theta, a, b, c)
+    return (SCALE * a) ** 2 * ((p - c) / (1 - c)) ** 2 * (1 - p) / p
+
+
+def public_question(question):
+    """A question as shown during a test: no answer or explanation"""
+    return {field: value for field, value in question.items() if field not in HIDDEN_FIELDS}
+
+
+class CATSession:
+    """Per-test state: log-posterior over GRID, items asked and responses"""
+
+    __slots__ = ('log_posterior', 'administered', 'responses', 'subject_counts', 'pending',
+                 'max_items', 'min_items', 'se_target', 'lock')
+
+    def __init__(self, subjects, max_items=DEFAULT_MAX_ITEMS, min_items=DEFAULT_MIN_ITEMS,
+                 se_target=DEFAULT_SE_TARGET):
+        try:
+            max_items, min_items, se_target = int(max_items), int(min_items), float(se_target)
+        except (TypeError, ValueError):
+            raise AdaptiveTestError("maxItems and minItems must be integers and seTarget a number") from None
+        if max_items < 1 or not 0 <= min_items <= max_items:
+            raise AdaptiveTestError(f"Need 0 <= minItems <= maxItems and maxItems >= 1, "
+                                    f"got minItems={min_items}, maxItems={max_items}")
+        if not se_target > 0:
+            raise AdaptiveTestError(f"seTarget must be positive, got {se_target}")
+        self.log_posterior = -0.5 * GRID ** 2           # standard normal prior
+        self.administered = []
+        self.responses = []
+        self.subject_counts = np.zeros(subjects, dtype=np.int32)
+        self.pending = None
+        self.max_items = max_items
+        self.min_items = min_items
+        self.se_target = se_target
+        # Serializes answers to one session; the engine lock only guards the session table
+        self.lock = threading.Lock()
+
+    def posterior(self):
+        weights = np.exp(self.log_posterior - self.log_posterior.max())
+        return weights / weights.sum()
+
+    @property
+    def ability(self):
+        return float(self.posterior() @ GRID)
+
+    @property
+    def standard_error(self):
+        weights = self.posterior()
+        mean = weights @ GRID
+        return float(math.sqrt(weights @ (GRID - mean) ** 2))
+
+    @property
+    def finished(self):
+        answered = len(self.responses)
+        return answered >= self.max_items or (answered >= self.min_items and self.standard_error <= self.se_target)
+
+
+class AdaptiveTestEngine:
+    """Item parameters, per-grid-point information rankings and the live sessions"""
+
+    def __init__(self, questions, weights=None, exposure=DEFAULT_EXPOSURE, cache_size=SESSION_CACHE_SIZE):
+        self.questions = list(questions)
+        self.exposure = exposure
+        self.cache_size = cache_size
+        self.sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+        params = np.array([item_parameters(q) for q in self.questions], dtype=np.float64).reshape(-1, 3)
+        self.a, self.b, self.c = params.T
+        subjects = [question_subject(q) for q in self.questions]
+        self.subjects = sorted(set(subjects))
+        subject_of = {subject: i for i, subject in enumerate(self.subjects)}
+        self.subject_index = np.array([subject_of[s] for s in subjects], dtype=np.int32)
+        self.members = [np.flatnonzero(self.subject_index == i) for i in range(len(self.subjects))]
+        self.sizes = np.array([len(m) for m in self.members], dtype=np.int64)
+        self.set_weights(SYLLABUS_WEIGHTAGE if weights is None else weights)
+        self.top = [self._rank(members) for members in self.members]
+
+    def set_weights(self, weights):
+        """Content-balancing targets: each subject's share of the items asked"""
+        if not isinstance(weights, dict) or not all(
+                isinstance(w, (int, float)) and not isinstance(w, bool) and math.isfinite(w)
+                for w in weights.values()):
+            raise AdaptiveTestError("Adaptive test weights must map subjects to numeric weights")
+        raw = np.array([max(weights.get(s, 0), 0) for s in self.subjects], dtype=np.float64)
+        # An empty bank has nothing to weigh; `begin` reports it per request
+        if self.subjects and not raw.sum() > 0:
+            raise AdaptiveTestError("Adaptive test weights leave no subject to ask")
+        self.targets = raw / raw.sum() if self.subjects else raw
+
+    def _rank(self, members):
+        """(grid, up to TOP_ITEMS) bank positions of a subject, most informative first at each grid point"""
+        keep = min(TOP_ITEMS, len(members))
+        best_positions = np.empty((len(GRID), 0), dtype=np.int64)
+        best_info = np.empty((len(GRID), 0))
+        theta = GRID[:, None]
+        for start in range(0, len(members), ITEM_CHUNK):
+            chunk = members[start:start + ITEM_CHUNK]
+            info = information(theta, self.a[chunk], self.b[chunk], self.c[chunk])
+            positions = np.concatenate([best_positions, np.broadcast_to(chunk, info.shape)], axis=1)
+            info = np.concatenate([best_info, info], axis=1)
+            if info.shape[1] > keep:
+                top = np.argpartition(-info, keep - 1, axis=1)[:, :keep]
+                positions = np.take_along_axis(positions, top, axis=1)
+                info = np.take_along_axis(info, top, axis=1)
+            best_positions, best_info = positions, info
+        order = np.argsort(-best_info, axis=1, kind='stable')
+        return np.take_along_axis(best_positions, order, axis=1).astype(np.int32)
+
+    def new_session(self, **limits):
+        return CATSession(len(self.subjects), **limits)
+
+    def _next_subject(self, session, rng):
+        open_subjects = (session.subject_counts < self.sizes) & (self.targets > 0)
+        if not open_subjects.any():
+            return None
+        deficit = self.targets * (len(session.administered) + 1) - session.subject_counts
+        deficit = deficit + 1e-9 * rng.random(len(deficit))
+        deficit[~open_subjects] = -np.inf
+        return int(np.argmax(deficit))
+
+    def next_item(self, session, rng=None):
+        """Bank position of the next item for `session` (None once nothing is left to ask)"""
+        rng = rng if rng is not None else np.random.default_rng()
+        subject = self._next_subject(session, rng)
+        if subject is None:
+            return None
+        point = int(np.abs(GRID - session.ability).argmin())
+        asked = set(session.administered)
+        candidates = []
+        for position in self.top[subject][point].tolist():
+            if position not in asked:
+                candidates.append(position)
+                if len(candidates) == self.exposure:
+                    break
+        if not candidates:
+            # Every ranked item of this subject was asked already: rank the rest at the estimate
+            members = self.members[subject]
+            members = members[~np.isin(members, session.administered)]
+            info = information(session.ability, self.a[members], self.b[members], self.c[members])
+            candidates = members[np.argsort(-info)[:self.exposure]].tolist()
+        return int(candidates[rng.integers(len(candidates))])
+
+    def record(self, session, position, correct):
+        """Update `session` with the response to item `position`"""
+        p = probability(GRID, self.a[position], self.b[position], self.c[position])
+        session.log_posterior = session.log_posterior + np.log(p if correct else 1 - p)
+        session.administered.append(int(position))
+        session.responses.append(bool(correct))
+        session.subject_counts[self.subject_index[position]] += 1
+
+    def summary(self, session):
+        return {
+            'ability': round(session.ability, 3),
+            'standardError': round(session.standard_error, 3),
+            'answered': len(session.responses),
+            'answeredCorrectly': sum(session.responses),
+            'subjects': {self.subjects[i]: int(n) for i, n in enumerate(session.subject_counts) if n},
+        }
+
+    def begin(self, rng=None, **limits):
+        """Start a session; (session id, first question)"""
+        session = self.new_session(**limits)
+        session.pending = self.next_item(session, rng)
+        if session.pending is None:
+            raise AdaptiveTestError("The bank has no questions for the adaptive test weights")
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self.sessions[session_id] = session
+            if len(self.sessions) > self.cache_size:
+                self.sessions.popitem(last=False)
+        return session_id, public_question(self.questions[session.pending])
+
+    def respond(self, session_id, answer, rng=None):
+        """
+        Grade the answer to the session's pending question and move on:
+        `{finished, correct, ability, standardError, ..., question}` with the
+        next question, or without one once the stopping rule is met.
+        """
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                raise KeyError(f"Unknown or expired adaptive session: {session_id}")
+            self.sessions.move_to_end(session_id)
+        with session.lock:
+            position = session.pending
+            if position is None:
+                # A concurrent answer finished the test first
+                raise KeyError(f"Unknown or expired adaptive session: {session_id}")
+            correct = answer_correct(self.questions[position], answer)
+            self.record(session, position, correct)
+            session.pending = None if session.finished else self.next_item(session, rng)
+            result = dict(self.summary(session), correct=correct, finished=session.pending is None)
+            if session.pending is not None:
+                result['question'] = public_question(self.questions[session.pending])
+        if result['finished']:
+            with self._lock:
+                self.sessions.pop(session_id, None)
+        return result
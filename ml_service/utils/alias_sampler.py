@@ -0,0 +1,147 @@
+"""
+Weighted practice-set sampling with Walker/Vose alias tables.
+
+Questions are grouped once into (subject, topic, difficulty) strata. A
+weight source (TopicPredictor importance scores, SYLLABUS_WEIGHTAGE, ...)
+gives each subject a weight, which is split evenly over the subject's
+strata, so a practice set covers a subject's topics and difficulties instead
+of following whichever topic has the most questions. The weights go into an
+alias table: a draw is one uniform stratum index plus one coin flip, so each
+draw costs O(1) however large the bank is. The question inside the stratum
+is also uniform. Re-weighting only rebuilds the table, which is O(strata).
+Draws repeat, so a set is drawn in a few oversampled rounds; if heavily
+skewed weights leave it short after MAX_ROUNDS, the rest is drawn exactly,
+weighted and without replacement, from the reachable questions not yet drawn.
+
+    sampler = PracticeSampler(questions, {'syllabus': SYLLABUS_WEIGHTAGE})
+    sampler.set_weights('predictor', predictor_weights(predictor.predict_important_topics()))
+    questions = sampler.sample(20, source='predictor')
+"""
+
+import numpy as np
+
+from utils.syllabus import question_subject
+
+MAX_ROUNDS = 8
+OVERSAMPLE = 1.5
+
+
+class AliasTable:
+    """Vose's alias method over a weight vector: O(n) to build, O(1) per draw"""
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        total = weights.sum()
+        if len(weights) == 0 or total <= 0 or (weights < 0).any():
+            raise ValueError("Alias table needs non-negative weights with a positive sum")
+        n = len(weights)
+        scaled = weights * (n / total)
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding error, so it keeps prob 1 and never aliases
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, count, rng):
+        """`count` independent draws (indices into the weight vector)"""
+        column = rng.integers(0, len(self.prob), count)
+        return np.where(rng.random(count) < self.prob[column], column, self.alias[column])
+
+
+def predictor_weights(predictions):
+    """Subject -> importance score from `TopicPredictor.predict_important_topics()`"""
+    return {entry['topic']: entry['score'] for entry in predictions['topicImportance']}
+
+
+class PracticeSampler:
+    """Strata over a bank plus one alias table per named weight source"""
+
+    def __init__(self, questions, sources=None):
+        self.questions = list(questions)
+        strata = {}
+        for position, question in enumerate(self.questions):
+            key = (question_subject(question), question.get('topic'), question.get('difficulty'))
+            strata.setdefault(key, []).append(position)
+        self.strata = list(strata)
+        # Positions grouped by stratum: stratum s owns members[offsets[s]:offsets[s] + sizes[s]]
+        self.sizes = np.array([len(strata[key]) for key in self.strata], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(self.sizes)[:-1]]).astype(np.int64)
+        self.members = np.array([p for key in self.strata for p in strata[key]], dtype=np.int64)
+        self.tables = {}
+        self.weights = {}
+        self.stratum_masses = {}
+        self.reachable = {}         # questions in positively weighted strata, per source
+        for name, weights in (sources or {}).items():
+            self.set_weights(name, weights)
+
+    def stratum_weights(self, weights):
+        """Subject weights split evenly over each subject's strata (unweighted subjects get 0)"""
+        per_subject = {}
+        for subject, _, _ in self.strata:
+            per_subject[subject] = per_subject.get(subject, 0) + 1
+        return np.array([max(weights.get(subject, 0), 0) / per_subject[subject]
+                         for subject, _, _ in self.strata], dtype=np.float64)
+
+    def set_weights(self, name, weights):
+        """(Re)build the alias table for weight source `name` from subject weights"""
+        stratum_weights = self.stratum_weights(weights)
+        self.tables[name] = AliasTable(stratum_weights)
+        self.weights[name] = dict(weights)
+        self.stratum_masses[name] = stratum_weights
+        self.reachable[name] = int(self.sizes[stratum_weights > 0].sum())
+
+    def shares(self, name):
+        """Expected share of draws per subject under weight source `name`"""
+        table = self.tables[name]
+        prob = np.zeros(len(table))
+        # Column i is picked with 1/n and yields i with prob[i], alias[i] otherwise
+        np.add.at(prob, np.arange(len(table)), table.prob / len(table))
+        np.add.at(prob, table.alias, (1 - table.prob) / len(table))
+        shares = {}
+        for (subject, _, _), p in zip(self.strata, prob.tolist()):
+            if p > 0:
+                shares[subject] = shares.get(subject, 0) + p
+        return {subject: round(p, 4) for subject, p in sorted(shares.items(), key=lambda item: -item[1])}
+
+    def sample_positions(self, count, source, rng=None):
+        """
+        `count` distinct bank positions drawn under weight source `source`
+        (fewer only if fewer questions have a positive weight)
+        """
+        if source not in self.tables:
+            raise KeyError(f"Unknown weight source: {source}")
+        rng = rng if rng is not None else np.random.default_rng()
+        table = self.tables[source]
+        count = min(count, self.reachable[source])
+        drawn = np.empty(0, dtype=np.int64)
+        for _ in range(MAX_ROUNDS):
+            if len(drawn) >= count:
+                break
+            n = int((count - len(drawn)) * OVERSAMPLE) + 1
+            strata = table.sample(n, rng)
+            within = (rng.random(n) * self.sizes[strata]).astype(np.int64)
+            drawn = np.concatenate([drawn, self.members[self.offsets[strata] + within]])
+            # Keep draw order while dropping repeats
+            _, first = np.unique(drawn, return_index=True)
+            drawn = drawn[np.sort(first)]
+        if len(drawn) < count:
+            # Each question carries its stratum's weight split over the stratum, aligned with `members`
+            mass = np.repeat(self.stratum_masses[source] / self.sizes, self.sizes)
+            mass[np.isin(self.members, drawn)] = 0
+            left = np.flatnonzero(mass)
+            extra = rng.choice(self.members[left], count - len(drawn), replace=False,
+                               p=mass[left] / mass[left].sum())
+            drawn = np.concatenate([drawn, extra])
+        return drawn[:count].tolist()
+
+    def sample(self, count, source, rng=None):
+        return [self.questions[p] for p in self.sample_positions(count, source, rng)]
@@ -0,0 +1,278 @@
+"""
+Question-level diff between two bank files.
+
+Questions are matched by key rather than by position: their `stableId` (or
+the content hash `stable_id` computes, for banks written before stable IDs),
+the legacy `id`, or always the content hash. The old bank is indexed by key
+in one pass, then the new bank is streamed against it, so a diff is linear in
+the size of both banks. Unchanged questions are skipped with a single dict
+comparison; modified ones are compared field by field. A content hash
+changes when the question is edited, so with the default key a second pass
+pairs the added and removed questions that share an `id` as modifications.
+
+Compressed banks (`.gqz`, see utils/compressed_bank.py) store each question
+as one compact JSON line, so when both sides are `.gqz` files, questions
+whose encoded bytes are identical are matched on the raw bytes and only the
+rest are decoded: unchanged questions (nearly all of them, between two
+builds) never reach the JSON parser.
+
+The changelog is in the journal op format (`{"op": insert|update|delete,
+"id", "question"}`), so `QuestionSearchIndex.apply_ops` or `QuestionJournal.append`
+can consume it directly.
+
+    git show HEAD:ml_service/data/gate_format_complete.json > /tmp/old.json
+    python -m utils.bank_diff /tmp/old.json data/gate_format_complete.json --changelog changes.jsonl
+    python -m utils.bank_diff old/gate_format_complete.gqz data/gate_format_complete.gqz
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from utils.bank_stream import iter_bank
+from utils.compressed_bank import CompressedQuestionBank
+from utils.question_ids import stable_id
+
+KEYS = ('stableId', 'id', 'content')
+_MISSING = object()
+
+
+def key_function(key='stableId'):
+    """question -> diff key for one of KEYS"""
+    if key == 'stableId':
+        return lambda q: q.get('stableId') or stable_id(q)
+    if key == 'id':
+        return lambda q: q.get('id')
+    if key == 'content':
+        return stable_id
+    raise ValueError(f"Unknown diff key: {key} (expected one of {', '.join(KEYS)})")
+
+
+def _keyed(questions, key):
+    """(key, question) pairs; repeated keys become key#2, key#3... so occurrences pair up in order"""
+    seen, repeats = set(), Counter()
+    for question in questions:
+        k = key(question)
+        if k in seen:
+            repeats[k] += 1
+            k = f"{k}#{repeats[k] + 1}"
+        else:
+            seen.add(k)
+        yield k, question
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Hold off the cyclic collector while a bank is indexed: every full
+    collection rescans all the question dicts held so far, which made
+    indexing quadratic-ish, and parsed JSON has no reference cycles to free.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def changed_fields(old, new):
+    """Sorted names of fields whose values differ (a missing field differs from any value)"""
+    return sorted(field for field in old.keys() | new.keys()
+                  if old.get(field, _MISSING) != new.get(field, _MISSING))
+
+
+class BankDiff:
+    """Added, removed and modified questions between two banks"""
+
+    def __init__(self, added, removed, modified, unchanged):
+        self.added = added            # new questions
+        self.removed = removed        # old questions
+        self.modified = modified      # (key, old, new, fields)
+        self.unchanged = unchanged
+
+    @property
+    def empty(self):
+        return not (self.added or self.removed or self.modified)
+
+    def field_counts(self):
+        """How many modified questions changed each field"""
+        return Counter(field for _, _, _, fields in self.modified for field in fields)
+
+    def changelog(self):
+        """
+        Journal ops turning the old bank into the new one: every delete
+        first (so a reused id is not deleted after its new question lands),
+        then updates and inserts in new-bank order. A question whose `id`
+        changed is deleted under the old id and inserted under the new one;
+        its delete goes with the others, so two questions that swap ids both
+        survive.
+        """
+        for question in self.removed:
+            yield {"op": "delete", "id": question.get('id')}
+        for _, old, _, fields in self.modified:
+            if 'id' in fields:
+                yield {"op": "delete", "id": old.get('id')}
+        for _, _, new, fields in self.modified:
+            if 'id' in fields:
+                yield {"op": "insert", "id": new.get('id'), "question": new}
+            else:
+                yield {"op": "update", "id": new.get('id'), "question": new, "fields": fields}
+        for question in self.added:
+            yield {"op": "insert", "id": question.get('id'), "question": question}
+
+    def to_dict(self, limit=None):
+        """Report with old/new values of each changed field (`limit` caps each list)"""
+        return {
+            "summary": self.summary(),
+            "fieldCounts": dict(self.field_counts().most_common()),
+            "added": [q.get('id') for q in self.added[:limit]],
+            "removed": [q.get('id') for q in self.removed[:limit]],
+            "modified": [
+                {"key": key, "id": new.get('id'),
+                 "changes": {field: {"old": old.get(field), "new": new.get(field)} for field in fields}}
+                for key, old, new, fields in self.modified[:limit]
+            ],
+        }
+
+    def summary(self):
+        return {"added": len(self.added), "removed": len(self.removed),
+                "modified": len(self.modified), "unchanged": self.unchanged}
+
+
+def _pair_by_id(added, removed, modified):
+    """
+    Second pass over the questions the key left unmatched: an added and a
+    removed question with the same `id` (unique on both sides) are one
+    question whose content changed.
+    """
+    removed_by_id = {}
+    for question in removed:
+        removed_by_id.setdefault(question.get('id'), []).append(question)
+    added_ids = Counter(question.get('id') for question in added)
+    paired = {qid for qid, questions in removed_by_id.items()
+              if qid is not None and len(questions) == 1 and added_ids[qid] == 1}
+    if not paired:
+        return added, removed, modified
+    for question in added:
+        if question.get('id') in paired:
+            previous = removed_by_id[question['id']][0]
+            modified.append((question['id'], previous, question, changed_fields(previous, question)))
+    return ([q for q in added if q.get('id') not in paired],
+            [q for q in removed if q.get('id') not in paired], modified)
+
+
+def diff_questions(old_questions, new_questions, key='stableId'):
+    """Diff two iterables of questions; only the old side is held in memory"""
+    by_stable_id = key == 'stableId'
+    key = key_function(key)
+    added, modified, unchanged = [], [], 0
+    with _gc_paused():
+        old = dict(_keyed(old_questions, key))
+        for k, question in _keyed(new_questions, key):
+            previous = old.pop(k, None)
+            if previous is None:
+                added.append(question)
+            elif previous == question:
+                unchanged += 1
+            else:
+                modified.append((k, previous, question, changed_fields(previous, question)))
+    # Whatever the new bank did not claim was removed; dicts keep old-bank order
+    removed = list(old.values())
+    if by_stable_id:
+        added, removed, modified = _pair_by_id(added, removed, modified)
+    return BankDiff(added, removed, modified, unchanged)
+
+
+def diff_encoded(old_lines, new_lines, key='stableId'):
+    """
+    Diff two streams of encoded questions (one compact JSON document each).
+    Byte-identical questions cancel out before anything is decoded.
+    """
+    with _gc_paused():
+        pending = Counter(old_lines)
+        changed, unchanged = [], 0
+        for line in new_lines:
+            count = pending.get(line)
+            if count:
+                unchanged += 1
+                if count == 1:
+                    del pending[line]
+                else:
+                    pending[line] = count - 1
+            else:
+                changed.append(line)
+    diff = diff_questions(map(json.loads, pending.elements()), map(json.loads, changed), key)
+    diff.unchanged += unchanged
+    return diff
+
+
+def _is_compressed(path):
+    return str(path).endswith('.gqz')
+
+
+def diff_banks(old_path, new_path, key='stableId'):
+    """Diff two bank files: JSON (either layout) or, on both sides, compressed .gqz banks"""
+    if _is_compressed(old_path) and _is_compressed(new_path):
+        with CompressedQuestionBank(old_path) as old, CompressedQuestionBank(new_path) as new:
+            return diff_encoded(old.lines(), new.lines(), key)
+    return diff_questions(_iter_any(old_path), _iter_any(new_path), key)
+
+
+def _iter_any(path):
+    if _is_compressed(path):
+        with CompressedQuestionBank(path) as bank:
+            yield from bank
+    else:
+        yield from iter_bank(path)
+
+
+def write_changelog(diff, path):
+    """Write the changelog as JSON Lines; returns the number of ops"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for op in diff.changelog():
+            f.write(json.dumps(op, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff two question banks question by question')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--key', choices=KEYS, default='stableId',
+                        help='match questions by stableId (content hash if absent, then id), id or content hash')
+    parser.add_argument('--changelog', help='write journal ops (JSON Lines) here')
+    parser.add_argument('--report', help='write the field-level report (JSON) here')
+    parser.add_argument('--limit', type=int, default=None, help='cap each list in the report')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    diff = diff_banks(args.old, args.new, args.key)
+    elapsed = time.perf_counter() - started
+
+    summary = diff.summary()
+    print(f"🔍 Diffed by {args.key} in {elapsed:.2f}s")
+    print(f"   ➕ {summary['added']} added, ➖ {summary['removed']} removed, "
+          f"✏️  {summary['modified']} modified, {summary['unchanged']} unchanged")
+    for field, count in diff.field_counts().most_common():
+        print(f"   {field}: {count}")
+    if args.changelog:
+        ops = write_changelog(diff, args.changelog)
+        print(f"💾 {ops} changelog ops saved to: {args.changelog}")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(diff.to_dict(args.limit), f, indent=2, ensure_ascii=False)
+        print(f"💾 Report saved to: {args.report}")
+    return diff
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,103 @@
+"""
+Single-pass metadata aggregation for question banks.
+
+`MetadataAggregator` keeps section, subject, difficulty, year and marks
+counters that are updated per question, so appending a batch only touches the
+new questions. Its `to_dict` output is the `metadata` block of the bank
+snapshot and can be fed back to `from_metadata` to resume without a rescan.
+"""
+
+DEFAULT_SECTION = 'Core Computer Science'
+DEFAULT_SUBJECT = 'Computer Science'
+
+
+class MetadataAggregator:
+    """Incrementally maintained bank totals"""
+
+    def __init__(self):
+        self.total_questions = 0
+        self.total_marks = 0
+        self.sections = {}
+        self.subjects = {}
+        self.difficulties = {}
+        self.years = {}
+        self.marks = {}
+
+    @classmethod
+    def from_questions(cls, questions):
+        aggregator = cls()
+        aggregator.add_many(questions)
+        return aggregator
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        """Resume from a previous `to_dict()`; None if the metadata predates the aggregator"""
+        if not metadata or 'marksDistribution' not in metadata:
+            return None
+        aggregator = cls()
+        aggregator.total_questions = metadata.get('totalQuestions', 0)
+        aggregator.total_marks = metadata.get('totalMarks', 0)
+        aggregator.sections = {
+            section: [totals['questions'], totals['marks']]
+            for section, totals in metadata.get('sections', {}).items()
+        }
+        aggregator.subjects = dict(metadata.get('subjects', {}))
+        aggregator.difficulties = dict(metadata.get('difficulties', {}))
+        aggregator.years = {int(year): count for year, count in metadata.get('years', {}).items()}
+        aggregator.marks = {int(marks): count for marks, count in metadata['marksDistribution'].items()}
+        return aggregator
+
+    def _apply(self, question, sign):
+        marks = question.get('marks', 1)
+        section = question.get('section', DEFAULT_SECTION)
+        subject = question.get('subject') or DEFAULT_SUBJECT
+
+        self.total_questions += sign
+        self.total_marks += sign * marks
+
+        totals = self.sections.setdefault(section, [0, 0])
+        totals[0] += sign
+        totals[1] += sign * marks
+        self.subjects[subject] = self.subjects.get(subject, 0) + sign
+        self.marks[marks] = self.marks.get(marks, 0) + sign
+
+        difficulty = question.get('difficulty')
+        if difficulty is not None:
+            self.difficulties[difficulty] = self.difficulties.get(difficulty, 0) + sign
+        year = question.get('year')
+        if year is not None:
+            self.years[year] = self.years.get(year, 0) + sign
+
+    def add(self, question):
+        self._apply(question, 1)
+
+    def remove(self, question):
+        self._apply(question, -1)
+
+    def replace(self, old, new):
+        if old is not None:
+            self.remove(old)
+        self.add(new)
+
+    def add_many(self, questions):
+        for q in questions:
+            self._apply(q, 1)
+        return self
+
+    def to_dict(self):
+        def nonzero(counts):
+            return {key: count for key, count in counts.items() if count}
+
+        return {
+            "totalQuestions": self.total_questions,
+            "totalMarks": self.total_marks,
+            "sections": {
+                section: {"questions": count, "marks": marks}
+                for section, (count, marks) in self.sections.items()
+                if count
+            },
+            "subjects": nonzero(self.subjects),
+            "difficulties": nonzero(self.difficulties),
+            "years": {str(year): count for year, count in sorted(self.years.items()) if count},
+            "marksDistribution": {str(marks): count for marks, count in sorted(self.marks.items()) if count},
+        }
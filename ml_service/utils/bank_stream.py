@@ -0,0 +1,202 @@
+"""
+Streaming reader and generator pipeline for question banks.
+
+`iter_bank` yields questions one at a time from either bank layout, a bare
+array (`comprehensive_300_questions.json`) or a `{metadata, questions}`
+document (`gate_format_complete.json`), reading the source in fixed-size
+chunks. Each question is decoded on its own, so memory is bounded by the
+largest single question rather than the file. Sources can be a path, an open
+file or an iterable of str/bytes chunks such as `response.iter_content()`.
+
+The stage functions (`validate`, `dedup`, `index_into`, `batched`) are
+generators that chain into bounded-memory pipelines:
+
+    questions = dedup(validate(iter_bank(path)))
+    for batch in batched(questions, 1000):
+        store.add_questions(batch)
+"""
+
+import codecs
+import json
+import os
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+REQUIRED_FIELDS = ('text', 'correctAnswer')
+
+_decoder = json.JSONDecoder()
+
+
+class _Scanner:
+    """Incremental JSON tokenizer over a chunked source"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append one more chunk; False at end of input"""
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            self.buffer += self.utf8.decode(b'', final=True)
+            return False
+        if isinstance(chunk, bytes):
+            chunk = self.utf8.decode(chunk)
+        # Drop the consumed prefix so the buffer only holds unread input
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f"Expected one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """
+        Walk the object at the cursor, yielding each key with the cursor on
+        its value; the consumer must read the value before resuming.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+    def elements(self):
+        """Decode the array at the cursor one element at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def _chunks(source, chunk_size=CHUNK_SIZE):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        yield from source
+
+
+def iter_bank(source, metadata=None):
+    """
+    Yield questions from an array bank or a `{metadata, questions}` bank.
+    Top-level keys other than `questions` are stored into `metadata` if a
+    dict is passed (complete once the generator is exhausted).
+    """
+    scanner = _Scanner(_chunks(source))
+    if scanner.peek() == '[':
+        yield from scanner.elements()
+        return
+    for key in scanner.items():
+        if key == 'questions' and scanner.peek() == '[':
+            yield from scanner.elements()
+        elif metadata is not None:
+            value = scanner.value()
+            metadata.update(value if key == 'metadata' and isinstance(value, dict) else {key: value})
+        else:
+            scanner.value()
+
+
+def iter_topic_bank(source):
+    """
+    Yield (topic, record) pairs from a `{topic: {questions: [...]}}` bank such
+    as the GitHub Gist import, streaming each topic's question array.
+    """
+    scanner = _Scanner(_chunks(source))
+    for topic in scanner.items():
+        if scanner.peek() != '{':
+            scanner.value()
+            continue
+        for key in scanner.items():
+            if key == 'questions' and scanner.peek() == '[':
+                for record in scanner.elements():
+                    yield topic, record
+            else:
+                scanner.value()
+
+
+def validate(questions, required=REQUIRED_FIELDS, min_options=0, rejected=None):
+    """Pass through questions with every required field set; others go to `rejected`"""
+    for q in questions:
+        if all(q.get(field) for field in required) and len(q.get('options', ())) >= min_options:
+            yield q
+        elif rejected is not None:
+            rejected.append(q.get('id'))
+
+
+def dedup(questions, key='id', seen=None):
+    """Drop questions whose `key` was already seen (in this stream or in `seen`)"""
+    seen = set() if seen is None else seen
+    for q in questions:
+        value = q.get(key)
+        if value in seen:
+            continue
+        seen.add(value)
+        yield q
+
+
+def index_into(questions, *indexes):
+    """Add each question to every index (anything with `add`) as it streams past"""
+    for q in questions:
+        for index in indexes:
+            index.add(q)
+        yield q
+
+
+def batched(questions, size=1000):
+    """Group a stream into lists of at most `size`"""
+    batch = []
+    for q in questions:
+        batch.append(q)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,291 @@
+"""
+Memory-mapped binary question bank.
+
+Layout (little-endian):
+
+    header       magic, version, count and the offset of each section below
+    categories   JSON value tables for the categorical fields
+    records      fixed-width record per question (see RECORD_DTYPE)
+    options      (offset, length) per option string, grouped per question
+    id order     question positions sorted by id, for lookups by id
+    heap         UTF-8 strings; repeated options/answers/explanations stored once
+
+The file is opened with a read-only `mmap` and the record table is a NumPy
+view over it, so question i is fetched in O(1) without parsing anything else,
+and every worker process opening the same file shares its pages.
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from utils.compact_bank import CATEGORICAL_FIELDS, FIELD_ORDER, KNOWN_FIELDS, MISSING_CODE, MISSING_INT
+from utils.near_duplicates import DEFAULT_BANKS, load_questions
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_BINARY_PATH = os.path.join(DATA_DIR, 'question_bank.gqb')
+
+MAGIC = b'GQBANK\x00\x01'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQQQQQQ')
+ABSENT = 0xFFFFFFFF
+
+STRING_FIELDS = ('id', 'text', 'explanation', 'answer', 'extras')
+RECORD_DTYPE = np.dtype(
+    [(field, '<u8') for field in STRING_FIELDS]
+    + [(f'{field}_len', '<u4') for field in STRING_FIELDS]
+    + [('options', '<u8'), ('options_count', '<u4')]
+    + [(field, '<u2') for field in CATEGORICAL_FIELDS]
+    + [('year', '<i2'), ('marks', '<i2')]
+)
+OPTION_DTYPE = np.dtype([('offset', '<u8'), ('length', '<u4')])
+
+
+class BinaryBankError(ValueError):
+    pass
+
+
+class _Heap:
+    """String heap with optional de-duplication of repeated values"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.shared = {}
+
+    def add(self, value, share=False):
+        if value is None:
+            return 0, ABSENT
+        if share and value in self.shared:
+            return self.shared[value]
+        encoded = value.encode('utf-8')
+        location = (len(self.data), len(encoded))
+        self.data += encoded
+        if share:
+            self.shared[value] = location
+        return location
+
+
+def write_binary_bank(questions, path=DEFAULT_BINARY_PATH):
+    """Compile questions into a binary bank at `path`; returns the count"""
+    questions = list(questions)
+    # position_of binary-searches the ids, so every question needs a string id to sort and compare by
+    bad = [q.get('id') for q in questions if not isinstance(q.get('id'), str)]
+    if bad:
+        raise BinaryBankError(f"{len(bad)} question(s) have a missing or non-string id, e.g. {bad[:5]}")
+    heap = _Heap()
+    categories = {field: {} for field in CATEGORICAL_FIELDS}
+    records = np.zeros(len(questions), dtype=RECORD_DTYPE)
+    options = []
+
+    for i, q in enumerate(questions):
+        record = records[i]
+        answer = q.get('correctAnswer')
+        extras = {key: value for key, value in q.items() if key not in KNOWN_FIELDS}
+        strings = {
+            'id': heap.add(q.get('id')),
+            'text': heap.add(q.get('text')),
+            'explanation': heap.add(q.get('explanation'), share=True),
+            'answer': heap.add(None if answer is None else json.dumps(answer, ensure_ascii=False), share=True),
+            'extras': heap.add(json.dumps(extras, ensure_ascii=False) if extras else None),
+        }
+        for field, (offset, length) in strings.items():
+            record[field] = offset
+            record[f'{field}_len'] = length
+
+        record['options'] = len(options)
+        record['options_count'] = len(q.get('options', ()))
+        options.extend(heap.add(str(option), share=True) for option in q.get('options', ()))
+
+        for field in CATEGORICAL_FIELDS:
+            if field in q:
+                codes = categories[field]
+                record[field] = codes.setdefault(json.dumps(q[field]), len(codes) + 1)
+            else:
+                record[field] = MISSING_CODE
+        for field in ('year', 'marks'):
+            value = q.get(field)
+            record[field] = MISSING_INT if value is None else value
+
+    option_table = np.array(options, dtype=OPTION_DTYPE)
+    id_order = np.array(
+        sorted(range(len(questions)), key=lambda i: questions[i]['id']), dtype='<u4'
+    )
+    category_blob = json.dumps({
+        field: [json.loads(value) for value in codes] for field, codes in categories.items()
+    }, ensure_ascii=False).encode('utf-8')
+
+    categories_at = HEADER.size
+    records_at = categories_at + len(category_blob)
+    options_at = records_at + records.nbytes
+    id_order_at = options_at + option_table.nbytes
+    heap_at = id_order_at + id_order.nbytes
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(questions), categories_at, records_at,
+                            options_at, id_order_at, heap_at, len(heap.data)))
+        f.write(category_blob)
+        f.write(records.tobytes())
+        f.write(option_table.tobytes())
+        f.write(id_order.tobytes())
+        f.write(heap.data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(questions)
+
+
+class BinaryQuestionBank:
+    """Read-only, mmap-backed view of a compiled question bank"""
+
+    def __init__(self, path=DEFAULT_BINARY_PATH):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.count, categories_at, records_at,
+         options_at, id_order_at, self.heap_at, _) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise BinaryBankError(f"{path} is not a version {VERSION} binary question bank")
+
+        categories = json.loads(self._mmap[categories_at:records_at])
+        self.categories = {field: [None] + values for field, values in categories.items()}
+        self.records = np.frombuffer(self._mmap, RECORD_DTYPE, self.count, records_at)
+        option_count = (id_order_at - options_at) // OPTION_DTYPE.itemsize
+        self.option_table = np.frombuffer(self._mmap, OPTION_DTYPE, option_count, options_at)
+        self.id_order = np.frombuffer(self._mmap, '<u4', self.count, id_order_at)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        # NumPy views pin the mapping, so drop them before unmapping
+        self.records = self.option_table = self.id_order = None
+        self._mmap.close()
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, offset, length):
+        if length == ABSENT:
+            return None
+        start = self.heap_at + offset
+        return self._mmap[start:start + length].decode('utf-8')
+
+    def _record(self, position):
+        """Record fields of question `position` as plain Python values"""
+        return dict(zip(RECORD_DTYPE.names, self.records[position].tolist()))
+
+    def _field(self, record, field):
+        if field in CATEGORICAL_FIELDS:
+            code = record[field]
+            return None if code == MISSING_CODE else self.categories[field][code]
+        if field in ('year', 'marks'):
+            return None if record[field] == MISSING_INT else record[field]
+        if field == 'options':
+            start = record['options']
+            entries = self.option_table[start:start + record['options_count']].tolist()
+            return [self._string(offset, length) for offset, length in entries]
+        if field == 'correctAnswer':
+            answer = self._string(record['answer'], record['answer_len'])
+            return None if answer is None else json.loads(answer)
+        return self._string(record[field], record[f'{field}_len'])
+
+    def value(self, field, position):
+        """One field of question `position`, decoding nothing else"""
+        record = self._record(position)
+        if field in KNOWN_FIELDS:
+            return self._field(record, field)
+        extras = self._string(record['extras'], record['extras_len'])
+        return json.loads(extras).get(field) if extras else None
+
+    def column(self, field):
+        """Zero-copy codes (categorical fields) or values (year, marks)"""
+        return self.records[field]
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += self.count
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        record = self._record(position)
+        question = {}
+        for field in FIELD_ORDER:
+            value = self._field(record, field)
+            # A categorical code other than MISSING_CODE means the key was present, even if null
+            if value is not None or field == 'options' or (
+                    field in CATEGORICAL_FIELDS and record[field] != MISSING_CODE):
+                question[field] = value
+        extras = self._string(record['extras'], record['extras_len'])
+        if extras:
+            question.update(json.loads(extras))
+        return question
+
+    def position_of(self, question_id):
+        """Position of `question_id` by binary search over the id order, or None"""
+        if not isinstance(question_id, str):
+            return None
+        ids = _IdView(self)
+        index = bisect.bisect_left(ids, question_id)
+        if index < self.count and ids[index] == question_id:
+            return int(self.id_order[index])
+        return None
+
+    def get(self, question_id):
+        position = self.position_of(question_id)
+        return None if position is None else self[position]
+
+    def __iter__(self):
+        for position in range(self.count):
+            yield self[position]
+
+
+class _IdView:
+    """Sorted sequence of ids for `bisect`, decoded lazily from the heap"""
+
+    def __init__(self, bank):
+        self.bank = bank
+
+    def __len__(self):
+        return self.bank.count
+
+    def __getitem__(self, index):
+        record = self.bank._record(int(self.bank.id_order[index]))
+        return self.bank._string(record['id'], record['id_len'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile JSON question banks into a binary bank')
+    parser.add_argument('banks', nargs='*', default=DEFAULT_BANKS)
+    parser.add_argument('--output', default=DEFAULT_BINARY_PATH)
+    args = parser.parse_args(argv)
+
+    questions, seen = [], set()
+    for path in args.banks:
+        for q in load_questions(path):
+            if q.get('id') not in seen:
+                seen.add(q.get('id'))
+                questions.append(q)
+    print(f"📦 Compiling {len(questions)} questions from {len(args.banks)} banks...")
+
+    started = time.perf_counter()
+    count = write_binary_bank(questions, args.output)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Wrote {count} questions ({os.path.getsize(args.output) / 1024:.1f} KiB) in {elapsed:.2f}s")
+    print(f"💾 Binary bank saved to: {args.output}")
+    return count
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
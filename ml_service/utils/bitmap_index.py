@@ -0,0 +1,281 @@
+"""
+Bitmap index for filtered random sampling of questions.
+
+Every value of every indexed field gets one bitmap (a NumPy array of uint64
+words, bit i set when question i has that value). Filters are small JSON
+expressions resolved with word-wise AND/OR/NOT:
+
+    {"subject": "Algorithms", "difficulty": "hard"}          # fields AND together
+    {"year": [2022, 2023]}                                   # list values OR together
+    {"and": [...]}, {"or": [...]}, {"not": {"year": 2019}}
+
+Sampling uses per-word popcount prefix sums, so k distinct questions are drawn
+in O(k log words) once a filter is resolved; resolved filters are cached.
+"""
+
+import json
+import random
+from collections import OrderedDict
+
+import numpy as np
+
+INDEXED_FIELDS = ('subject', 'topic', 'section', 'difficulty', 'year', 'marks', 'questionType')
+INTEGER_FIELDS = ('year', 'marks')
+
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """Set bits per uint64 word"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    return _POPCOUNT8[words.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint8)
+
+
+def pack_mask(mask, words):
+    """Boolean mask -> little-endian uint64 bitmap of `words` words"""
+    packed = np.packbits(mask, bitorder='little')
+    out = np.zeros(words * 8, dtype=np.uint8)
+    out[:len(packed)] = packed
+    return out.view(np.uint64)
+
+
+def floyd_sample(n, k, rng):
+    """k distinct integers from range(n) in O(k) (Floyd's algorithm)"""
+    chosen = set()
+    for j in range(n - k, n):
+        value = rng.randrange(j + 1)
+        chosen.add(j if value in chosen else value)
+    return list(chosen)
+
+
+class FilterError(ValueError):
+    pass
+
+
+def parse_count(value, name='count'):
+    """A draw size: a non-negative integer (an integral float or digit string is accepted)"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    elif isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise FilterError(f"{name} must be a non-negative integer, got {value!r}")
+    return value
+
+
+class BitmapIndex:
+    """One bitmap per (field, value) over an append-only question list"""
+
+    def __init__(self, questions=(), cache_size=256):
+        self.questions = []
+        self.words = 0
+        self.bitmaps = {field: {} for field in INDEXED_FIELDS}
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.add_many(questions)
+
+    def __len__(self):
+        return len(self.questions)
+
+    @staticmethod
+    def _value(field, value):
+        if field in INTEGER_FIELDS and value is not None:
+            return int(value)
+        return value
+
+    @staticmethod
+    def _filter_value(field, value):
+        """A filter's value as indexed, or FilterError for a non-integer year/marks"""
+        if field not in INTEGER_FIELDS or value is None:
+            return value
+        try:
+            if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                raise ValueError
+            return int(value)
+        except (TypeError, ValueError):
+            raise FilterError(f"{field} must be an integer, got {value!r}") from None
+
+    def _grow(self, needed_words):
+        if needed_words <= self.words:
+            return
+        words = max(needed_words, self.words * 2, 16)
+        for values in self.bitmaps.values():
+            for value, bitmap in values.items():
+                grown = np.zeros(words, dtype=np.uint64)
+                grown[:self.words] = bitmap
+                values[value] = grown
+        self.words = words
+
+    def add_many(self, questions):
+        """Bulk-index questions with one vectorized pass per (field, value)"""
+        questions = list(questions)
+        if not questions:
+            return
+        start = len(self.questions)
+        self.questions.extend(questions)
+        self._grow((len(self.questions) + 63) // 64)
+        self._cache.clear()
+
+        for field in INDEXED_FIELDS:
+            codes = {}
+            column = np.fromiter(
+                (codes.setdefault(self._value(field, q.get(field)), len(codes)) for q in questions),
+                dtype=np.int64, count=len(questions),
+            )
+            # Group positions by value; within a group positions ascend, so the
+            # bits of each word are OR-reduced over contiguous runs
+            order = np.argsort(column, kind='stable')
+            bounds = np.flatnonzero(np.diff(column[order])) + 1
+            for value, group in zip(codes, np.split(order + start, bounds)):
+                words = group >> 6
+                bits = np.left_shift(np.uint64(1), (group & 63).astype(np.uint64))
+                runs = np.flatnonzero(np.diff(words, prepend=-1))
+                bitmap = self.bitmaps[field].get(value)
+                if bitmap is None:
+                    bitmap = self.bitmaps[field][value] = np.zeros(self.words, dtype=np.uint64)
+                bitmap[words[runs]] |= np.bitwise_or.reduceat(bits, runs)
+
+    def add(self, question):
+        position = len(self.questions)
+        self.questions.append(question)
+        self._grow(position // 64 + 1)
+        self._cache.clear()
+        word, bit = divmod(position, 64)
+        for field in INDEXED_FIELDS:
+            value = self._value(field, question.get(field))
+            bitmap = self.bitmaps[field].get(value)
+            if bitmap is None:
+                bitmap = self.bitmaps[field][value] = np.zeros(self.words, dtype=np.uint64)
+            bitmap[word] |= np.uint64(1 << bit)
+        return position
+
+    def _universe(self):
+        return pack_mask(np.ones(len(self.questions), dtype=bool), self.words)
+
+    def _empty(self):
+        return np.zeros(self.words, dtype=np.uint64)
+
+    def _field_bitmap(self, field, wanted):
+        if field not in self.bitmaps:
+            raise FilterError(f"Unknown filter field: {field}")
+        if not isinstance(wanted, (list, tuple, set)):
+            wanted = [wanted]
+        result = self._empty()
+        for value in wanted:
+            if isinstance(value, (dict, list)):
+                raise FilterError(f"{field} values must be scalars, got {value!r}")
+            bitmap = self.bitmaps[field].get(self._filter_value(field, value))
+            if bitmap is not None:
+                result |= bitmap
+        return result
+
+    def resolve(self, expression):
+        """Bitmap of questions matching a filter expression (None matches all)"""
+        if expression is None or expression == {}:
+            return self._universe()
+        if not isinstance(expression, dict):
+            raise FilterError(f"Filter must be an object, got {expression!r}")
+
+        result = None
+        for key, value in expression.items():
+            if key in ('and', 'or') and not isinstance(value, list):
+                raise FilterError(f"'{key}' takes a list of filters, got {value!r}")
+            if key == 'and':
+                part = self._universe()
+                for sub in value:
+                    part &= self.resolve(sub)
+            elif key == 'or':
+                part = self._empty()
+                for sub in value:
+                    part |= self.resolve(sub)
+            elif key == 'not':
+                part = self._universe() & ~self.resolve(value)
+            else:
+                part = self._field_bitmap(key, value)
+            result = part if result is None else result & part
+        return result
+
+    def _resolved(self, expression):
+        """(bitmap, cumulative popcount) for an expression, LRU-cached"""
+        key = json.dumps(expression, sort_keys=True, default=str)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            return entry
+        bitmap = self.resolve(expression)
+        entry = (bitmap, np.cumsum(popcount(bitmap), dtype=np.int64))
+        self._cache[key] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def count(self, expression=None):
+        cumulative = self._resolved(expression)[1]
+        return int(cumulative[-1]) if len(cumulative) else 0
+
+    def positions(self, expression=None):
+        """All matching positions (O(N/64) words; prefer `sample` for draws)"""
+        bitmap = self._resolved(expression)[0]
+        bits = np.unpackbits(bitmap.view(np.uint8), bitorder='little')
+        return np.flatnonzero(bits[:len(self.questions)])
+
+    @staticmethod
+    def _select(bitmap, cumulative, ranks):
+        """Positions of the given 0-based ranks among set bits"""
+        ranks = np.asarray(ranks, dtype=np.int64)
+        words = np.searchsorted(cumulative, ranks, side='right')
+        before = np.where(words > 0, cumulative[words - 1], 0)
+        within = ranks - before
+        bits = np.unpackbits(
+            bitmap[words].view(np.uint8).reshape(-1, 8), axis=1, bitorder='little'
+        )
+        bit = np.argmax(np.cumsum(bits, axis=1) > within[:, None], axis=1)
+        return words * 64 + bit
+
+    def sample_positions(self, expression, k, rng=None, exclude=()):
+        """
+        Up to k distinct uniformly random matching positions, skipping the
+        positions in `exclude` (e.g. questions drawn by an earlier clause).
+        """
+        rng = rng or random
+        bitmap, cumulative = self._resolved(expression)
+        if exclude:
+            bitmap = bitmap.copy()
+            for position in exclude:
+                word, bit = divmod(position, 64)
+                if word < len(bitmap):
+                    bitmap[word] &= ~np.uint64(1 << bit)
+            cumulative = np.cumsum(popcount(bitmap), dtype=np.int64)
+        total = int(cumulative[-1]) if len(cumulative) else 0
+        k = min(k, total)
+        if k <= 0:
+            return []
+        return self._select(bitmap, cumulative, floyd_sample(total, k, rng)).tolist()
+
+    def sample(self, expression, k, rng=None, exclude=()):
+        return [self.questions[p] for p in self.sample_positions(expression, k, rng, exclude)]
+
+    def draw(self, clauses, exclude=None, rng=None):
+        """
+        Several filtered draws with no question repeated, e.g.
+        [{"filter": {"subject": "Algorithms", "difficulty": "hard"}, "count": 2},
+         {"filter": {"subject": "Operating Systems", "difficulty": "medium"}, "count": 3}]
+        with `exclude` a filter every draw must avoid ({"year": 2019}).
+        Malformed clauses, filters or counts raise FilterError.
+        """
+        if not isinstance(clauses, list):
+            raise FilterError(f"draws must be a list of {{filter, count}} objects, got {clauses!r}")
+        taken = []
+        results = []
+        for clause in clauses:
+            if not isinstance(clause, dict):
+                raise FilterError(f"Each draw must be a {{filter, count}} object, got {clause!r}")
+            count = parse_count(clause.get('count', 1))
+            expression = clause.get('filter') or {}
+            if exclude:
+                expression = {'and': [expression, {'not': exclude}]}
+            positions = self.sample_positions(expression, count, rng, taken)
+            taken.extend(positions)
+            results.append([self.questions[p] for p in positions])
+        return results
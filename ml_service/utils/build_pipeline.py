@@ -0,0 +1,261 @@
+"""
+Dependency-aware, incremental build runner.
+
+A build is a DAG of `Stage`s. Each stage is a picklable function of its
+dependencies' outputs that returns a JSON-serializable result, which is
+written to the build directory. Independent stages run in parallel worker
+processes as soon as their dependencies finish.
+
+A stage's key is a hash of its name, its input files' contents, its
+parameters and its dependencies' output hashes. Results are stored by content
+hash under `objects/`, and the cache index remembers every key -> result seen,
+so a stage is skipped whenever its key has been built before (including after
+reverting a change) and any files it writes are still as it left them. Only
+stages downstream of a real change are rebuilt, and a stage whose result comes
+out identical stops the rebuild from propagating further.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from utils.question_journal import write_json_atomic
+
+MANIFEST_NAME = 'manifest.json'
+CACHE_INDEX_NAME = 'cache.json'
+
+
+class BuildError(RuntimeError):
+    pass
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def content_hash(data):
+    """Hash of a JSON-serializable value, independent of dict key order"""
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _module_path(name, search_path):
+    """Source file of dotted module `name` under one of `search_path`, if any"""
+    parts = name.split('.')
+    for root in search_path:
+        for candidate in (os.path.join(root, *parts) + '.py', os.path.join(root, *parts, '__init__.py')):
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+    return None
+
+
+def source_closure(paths, search_path):
+    """
+    `paths` plus every module they import from `search_path`, directly or
+    through each other, as a sorted list of files. Keying a stage on this
+    means an edit to code the stage never runs does not rebuild it.
+    """
+    pending = [os.path.abspath(path) for path in paths]
+    found = set()
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                # `from utils import build_seed` names a module, not an attribute
+                names = [node.module, *(f'{node.module}.{alias.name}' for alias in node.names)]
+            else:
+                continue
+            for name in names:
+                module = _module_path(name, search_path)
+                if module is not None:
+                    pending.append(module)
+    return sorted(found)
+
+
+class Stage:
+    """
+    One build step. `func(*dependency_outputs)` runs in a worker process;
+    `inputs` are files whose contents invalidate the stage, `params` are
+    extra JSON values that do the same, and `outputs` are files the stage
+    writes besides its result (rebuilt if missing or modified).
+    """
+
+    def __init__(self, name, func, deps=(), inputs=(), params=None, outputs=()):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.inputs = tuple(inputs)
+        self.params = params or {}
+        self.outputs = tuple(outputs)
+
+    def key(self, dep_hashes):
+        return content_hash({
+            'name': self.name,
+            'inputs': {os.path.basename(path): file_digest(path) for path in self.inputs},
+            'params': self.params,
+            'deps': [dep_hashes[dep] for dep in self.deps],
+        })
+
+
+def _output_digests(paths):
+    return {path: file_digest(path) if os.path.exists(path) else None for path in paths}
+
+
+def _execute(func, dep_paths, objects_dir, output_files):
+    """Worker entry point: load dependency outputs, run, store the result by hash"""
+    outputs = []
+    for path in dep_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            outputs.append(json.load(f))
+    result = func(*outputs)
+    output_hash = content_hash(result)
+    object_path = os.path.join(objects_dir, f'{output_hash}.json')
+    if not os.path.exists(object_path):
+        write_json_atomic(object_path, result)
+    return output_hash, _output_digests(output_files)
+
+
+class BuildPipeline:
+    """Runs a DAG of stages with a persistent manifest of stage keys"""
+
+    def __init__(self, stages, build_dir, workers=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.build_dir = build_dir
+        self.workers = workers
+        self.objects_dir = os.path.join(build_dir, 'objects')
+        self.manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+        self.cache_index_path = os.path.join(build_dir, CACHE_INDEX_NAME)
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in self.stages]
+            if missing:
+                raise BuildError(f"Stage {stage.name} depends on unknown stages: {missing}")
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        order, state = [], {}
+
+        def visit(name):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise BuildError(f"Dependency cycle through stage {name}")
+            state[name] = 'visiting'
+            for dep in self.stages[name].deps:
+                visit(dep)
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def object_path(self, output_hash):
+        return os.path.join(self.objects_dir, f'{output_hash}.json')
+
+    @staticmethod
+    def _load(path):
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_manifest(self):
+        """Stage name -> output hash of its latest build"""
+        return self._load(self.manifest_path)
+
+    def output(self, name):
+        """Latest result of stage `name`"""
+        with open(self.object_path(self.load_manifest()[name]), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _reusable(self, stage, entry):
+        return (
+            entry is not None
+            and os.path.exists(self.object_path(entry['output']))
+            and all(_output_digests(stage.outputs).get(path) == digest
+                    for path, digest in entry.get('files', {}).items())
+            and set(entry.get('files', {})) == set(stage.outputs)
+        )
+
+    def run(self, targets=None, force=False, on_event=None):
+        """
+        Build `targets` (default: every stage) and what they depend on.
+        Returns {stage: 'built' | 'cached'}; `on_event(stage, status)` is
+        called as each stage settles.
+        """
+        os.makedirs(self.objects_dir, exist_ok=True)
+        wanted = self._closure(targets or list(self.stages))
+        manifest = self.load_manifest()
+        cache = self._load(self.cache_index_path)
+        hashes, status = {}, {}
+        pending = [name for name in self.order if name in wanted]
+        running = {}
+
+        def settle(name, output_hash, outcome):
+            hashes[name] = output_hash
+            status[name] = outcome
+            manifest[name] = output_hash
+            if on_event:
+                on_event(name, outcome)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                # Cached stages settle immediately and may unblock others, so
+                # keep scheduling until nothing new becomes ready
+                ready = True
+                while ready:
+                    ready = [n for n in pending if all(dep in hashes for dep in self.stages[n].deps)]
+                    for name in ready:
+                        pending.remove(name)
+                        stage = self.stages[name]
+                        key = stage.key(hashes)
+                        entry = cache.get(key)
+                        if not force and self._reusable(stage, entry):
+                            settle(name, entry['output'], 'cached')
+                            continue
+                        future = pool.submit(
+                            _execute, stage.func,
+                            [self.object_path(hashes[dep]) for dep in stage.deps],
+                            self.objects_dir, list(stage.outputs),
+                        )
+                        running[future] = (name, key)
+
+                if not running:
+                    if pending:
+                        raise BuildError(f"Stages could not be scheduled: {pending}")
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, key = running.pop(future)
+                    output_hash, files = future.result()
+                    cache[key] = {'output': output_hash, 'files': files}
+                    settle(name, output_hash, 'built')
+                    # Persist progress so a failed build keeps finished stages
+                    write_json_atomic(self.cache_index_path, cache)
+                    write_json_atomic(self.manifest_path, manifest)
+        write_json_atomic(self.manifest_path, manifest)
+        return status
+
+    def _closure(self, targets):
+        wanted, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.stages:
+                raise BuildError(f"Unknown stage: {name}")
+            if name not in wanted:
+                wanted.add(name)
+                stack.extend(self.stages[name].deps)
+        return wanted
@@ -0,0 +1,212 @@
+"""
+Memory-compact, column-oriented question bank.
+
+A list of question dicts repeats the same keys and low-cardinality strings
+("Core Computer Science", "medium", "MCQ", ...) in every record. Here each
+field is a column instead: categorical fields are small integer codes into a
+shared value table, year and marks are fixed-width NumPy arrays, options are
+one flat list of interned strings with an offsets array, and only the
+per-question free text (id, text, explanation) is stored as-is. A small flags
+column records whether `options` and `correctAnswer` were present, the way
+code 0 does for categorical fields. `bank[i]` rebuilds the original dict on
+demand.
+"""
+
+import sys
+
+import numpy as np
+
+CATEGORICAL_FIELDS = ('section', 'subject', 'topic', 'difficulty', 'questionType')
+INTEGER_FIELDS = ('year', 'marks')
+TEXT_FIELDS = ('id', 'text', 'explanation')
+FIELD_ORDER = (
+    'id', 'text', 'options', 'correctAnswer', 'explanation', 'topic', 'subject',
+    'section', 'difficulty', 'year', 'marks', 'questionType',
+)
+KNOWN_FIELDS = frozenset(FIELD_ORDER)
+
+# Code / value marking a field that was absent from the source record
+MISSING_CODE = 0
+MISSING_INT = -1
+MAX_INT = np.iinfo(np.int16).max
+_MISSING = object()
+
+# Presence flags for the fields with no spare code of their own
+HAS_OPTIONS = 1
+HAS_ANSWER = 2
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _small_int(field, value):
+    """`value` for an int16 column; MISSING_INT (-1) is reserved for absent"""
+    if value is None:
+        return MISSING_INT
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, (int, np.integer)) or not 0 <= value <= MAX_INT:
+        raise ValueError(f"{field} must be an integer from 0 to {MAX_INT}, got {value!r}")
+    return value
+
+
+class _Categories:
+    """Value table for one categorical field; code 0 means 'absent'"""
+
+    def __init__(self):
+        self.values = [_MISSING]
+        self.codes = {}
+
+    def code(self, value):
+        if value is _MISSING:
+            return MISSING_CODE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(_intern(value))
+        return code
+
+
+class _GrowableArray:
+    """Append-only NumPy array with amortized doubling"""
+
+    def __init__(self, dtype, capacity=1024):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.concatenate([self.data, np.empty_like(self.data)])
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self):
+        return self.data[:self.size]
+
+    def trim(self):
+        self.data = self.data[:self.size].copy()
+
+
+class CompactQuestionBank:
+    """Struct-of-arrays question bank with categorical codes and interned options"""
+
+    def __init__(self, questions=()):
+        self.categories = {field: _Categories() for field in CATEGORICAL_FIELDS}
+        self.codes = {field: _GrowableArray(np.uint16) for field in CATEGORICAL_FIELDS}
+        self.integers = {field: _GrowableArray(np.int16) for field in INTEGER_FIELDS}
+        self.texts = {field: [] for field in TEXT_FIELDS}
+        self.options = []
+        self.option_offsets = _GrowableArray(np.uint32)
+        self.option_offsets.append(0)
+        self.answers = []
+        self.flags = _GrowableArray(np.uint8)
+        self.extras = {}
+        self.positions = {}
+        self.extend(questions)
+
+    @classmethod
+    def from_questions(cls, questions):
+        bank = cls(questions)
+        bank.trim()
+        return bank
+
+    def __len__(self):
+        return len(self.answers)
+
+    def append(self, question):
+        position = len(self.answers)
+        # Checked before any column grows, so a bad value leaves the bank as it was
+        integers = [_small_int(field, question.get(field)) for field in INTEGER_FIELDS]
+        for field in CATEGORICAL_FIELDS:
+            self.codes[field].append(self.categories[field].code(question.get(field, _MISSING)))
+        for field, value in zip(INTEGER_FIELDS, integers):
+            self.integers[field].append(value)
+        for field in TEXT_FIELDS:
+            self.texts[field].append(question.get(field))
+
+        for option in question.get('options', ()):
+            self.options.append(_intern(option))
+        self.option_offsets.append(len(self.options))
+
+        answer = question.get('correctAnswer')
+        self.answers.append([_intern(a) for a in answer] if isinstance(answer, list) else _intern(answer))
+        self.flags.append((HAS_OPTIONS if 'options' in question else 0)
+                          | (HAS_ANSWER if 'correctAnswer' in question else 0))
+
+        extra = {key: value for key, value in question.items() if key not in KNOWN_FIELDS}
+        if extra:
+            self.extras[position] = extra
+        self.positions[question.get('id')] = position
+        return position
+
+    def extend(self, questions):
+        for question in questions:
+            self.append(question)
+
+    def trim(self):
+        """Release spare array capacity once loading is done"""
+        for column in (*self.codes.values(), *self.integers.values(), self.option_offsets, self.flags):
+            column.trim()
+
+    def value(self, field, position):
+        """One field of one question without building the whole record"""
+        if field in CATEGORICAL_FIELDS:
+            value = self.categories[field].values[self.codes[field].data[position]]
+            return None if value is _MISSING else value
+        if field in INTEGER_FIELDS:
+            value = int(self.integers[field].data[position])
+            return None if value == MISSING_INT else value
+        if field in TEXT_FIELDS:
+            return self.texts[field][position]
+        if field == 'options':
+            start, end = self.option_offsets.data[position:position + 2]
+            return self.options[start:end]
+        if field == 'correctAnswer':
+            return self.answers[position]
+        return self.extras.get(position, {}).get(field)
+
+    def column(self, field):
+        """Codes array for a categorical field, or values for year/marks"""
+        if field in CATEGORICAL_FIELDS:
+            return self.codes[field].view()
+        return self.integers[field].view()
+
+    def code_of(self, field, value):
+        """Categorical code for `value`, or None if no question has it"""
+        return self.categories[field].codes.get(value)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        question = {}
+        flags = self.flags.data[position]
+        for field in FIELD_ORDER:
+            if field in CATEGORICAL_FIELDS:
+                value = self.categories[field].values[self.codes[field].data[position]]
+                if value is not _MISSING:
+                    question[field] = value
+            elif field in INTEGER_FIELDS:
+                value = int(self.integers[field].data[position])
+                if value != MISSING_INT:
+                    question[field] = value
+            elif field == 'options':
+                if flags & HAS_OPTIONS:
+                    question['options'] = self.value('options', position)
+            elif field == 'correctAnswer':
+                if flags & HAS_ANSWER:
+                    question['correctAnswer'] = self.answers[position]
+            elif self.texts[field][position] is not None:
+                question[field] = self.texts[field][position]
+        question.update(self.extras.get(position, {}))
+        return question
+
+    def get(self, question_id):
+        position = self.positions.get(question_id)
+        return None if position is None else self[position]
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
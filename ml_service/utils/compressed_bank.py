@@ -0,0 +1,251 @@
+"""
+Compressed question bank with block-level random access.
+
+Questions are written as blocks of `block_size` compact JSON lines, each
+block compressed on its own with zstd (if the `zstandard` package is
+installed) or zlib/deflate, the codec gzip uses. A block index of file offsets
+follows the blocks, so question i is found by decompressing block
+i // block_size only and parsing just its line; a whole-bank load streams the
+blocks in order.
+
+Layout (little-endian):
+
+    header      magic, version, codec, block size, count, section offsets
+    blocks      compressed, newline-separated JSON of up to `block_size` questions
+    index       uint64 file offset of every block, plus the end of the last one
+    ids         compressed JSON list of question ids, for lookups by id
+    metadata    compressed JSON bank metadata (the `metadata` of a
+                `{metadata, questions}` bank), or null
+
+    python -m utils.compressed_bank     # data/*.json banks -> data/*.gqz
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.bank_stream import batched, iter_bank
+from utils.near_duplicates import DEFAULT_BANKS
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b'GQZBANK\x01'
+VERSION = 1
+HEADER = struct.Struct('<8sIIIQQQQQQ')
+BLOCK_SIZE = 128
+CACHE_BLOCKS = 8
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {'zlib': CODEC_ZLIB, 'zstd': CODEC_ZSTD}
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 19
+
+
+class CompressedBankError(ValueError):
+    pass
+
+
+def default_codec():
+    return 'zstd' if zstandard is not None else 'zlib'
+
+
+def _compressor(codec):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise CompressedBankError("zstd compression needs the zstandard package")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+    return lambda data: zlib.compress(data, ZLIB_LEVEL)
+
+
+def _decompressor(codec):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise CompressedBankError("Reading a zstd bank needs the zstandard package")
+        return zstandard.ZstdDecompressor().decompress
+    return zlib.decompress
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def write_compressed_bank(questions, path, metadata=None, block_size=BLOCK_SIZE, codec=None):
+    """
+    Stream questions into a compressed bank at `path`; returns the count.
+    `codec` is 'zstd' or 'zlib' (default: zstd when available). `metadata`
+    is encoded after the last question, so it may be a dict that fills in
+    while the questions stream (as `iter_bank` does).
+    """
+    codec_id = CODECS[codec or default_codec()]
+    compress = _compressor(codec_id)
+    ids, offsets = [], []
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        for block in batched(questions, block_size):
+            offsets.append(f.tell())
+            ids.extend(q.get('id') for q in block)
+            f.write(compress(b'\n'.join(map(_encode, block))))
+        offsets.append(f.tell())
+
+        index_at = f.tell()
+        f.write(np.array(offsets, dtype='<u8').tobytes())
+        ids_at = f.tell()
+        f.write(compress(_encode(ids)))
+        metadata_at = f.tell()
+        f.write(compress(_encode(metadata or None)))
+        end = f.tell()
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, codec_id, block_size, len(ids),
+                            index_at, ids_at, metadata_at - ids_at, metadata_at, end - metadata_at))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(ids)
+
+
+def compress_bank_file(source, path=None, block_size=BLOCK_SIZE, codec=None):
+    """Compress a JSON bank file (either layout) to `path` (default: same name, .gqz)"""
+    path = path or f"{os.path.splitext(source)[0]}.gqz"
+    metadata = {}
+    count = write_compressed_bank(iter_bank(source, metadata), path, metadata,
+                                  block_size=block_size, codec=codec)
+    return path, count
+
+
+class CompressedQuestionBank:
+    """Read-only compressed bank; decompresses one block per cache miss"""
+
+    def __init__(self, path, cache_blocks=CACHE_BLOCKS):
+        self.path = path
+        self.cache_blocks = cache_blocks
+        # A read-only mapping: slices are positional reads, safe across threads and on every platform
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, codec, self.block_size, self.count, index_at,
+         self._ids_at, self._ids_len, self._metadata_at, self._metadata_len) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise CompressedBankError(f"{path} is not a version {VERSION} compressed question bank")
+        self.codec = codec
+        self._decompress = _decompressor(codec)
+        blocks = -(-self.count // self.block_size)
+        self.offsets = np.frombuffer(self._mmap[index_at:index_at + (blocks + 1) * 8], dtype='<u8')
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+        self._positions = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def block_count(self):
+        return len(self.offsets) - 1
+
+    def _read(self, offset, length):
+        return json.loads(self._decompress(self._mmap[offset:offset + length]))
+
+    def _block_bytes(self, number):
+        start, end = int(self.offsets[number]), int(self.offsets[number + 1])
+        return self._decompress(self._mmap[start:end])
+
+    def block(self, number):
+        """Encoded question lines of block `number`, LRU-cached"""
+        with self._lock:
+            lines = self._blocks.get(number)
+            if lines is not None:
+                self._blocks.move_to_end(number)
+                return lines
+        # Decompress outside the lock; two threads missing on one block both decode it
+        lines = self._block_bytes(number).split(b'\n')
+        with self._lock:
+            self._blocks[number] = lines
+            if len(self._blocks) > self.cache_blocks:
+                self._blocks.popitem(last=False)
+        return lines
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += self.count
+        if not 0 <= position < self.count:
+            raise IndexError(position)
+        block, offset = divmod(position, self.block_size)
+        return json.loads(self.block(block)[offset])
+
+    def position_of(self, question_id):
+        """Position of `question_id` (the id list is decompressed on first use), or None"""
+        if self._positions is None:
+            ids = self._read(self._ids_at, self._ids_len)
+            self._positions = {qid: position for position, qid in enumerate(ids)}
+        return self._positions.get(question_id)
+
+    def get(self, question_id):
+        position = self.position_of(question_id)
+        return None if position is None else self[position]
+
+    @property
+    def metadata(self):
+        return self._read(self._metadata_at, self._metadata_len)
+
+    def __iter__(self):
+        """Stream every question, one block in memory at a time (bypasses the cache)"""
+        for number in range(self.block_count):
+            # JSON escapes newlines inside strings, so the lines join into one array
+            yield from json.loads(b'[' + self._block_bytes(number).replace(b'\n', b',') + b']')
+
+    def lines(self):
+        """Encoded (compact JSON) form of every question in order, without decoding any"""
+        for number in range(self.block_count):
+            yield from self._block_bytes(number).split(b'\n')
+
+    def questions(self):
+        return list(self)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compress JSON question banks into block-indexed .gqz files')
+    parser.add_argument('banks', nargs='*', default=DEFAULT_BANKS)
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='questions per block')
+    parser.add_argument('--codec', choices=sorted(CODECS), default=None,
+                        help='default: zstd if installed, else zlib')
+    args = parser.parse_args(argv)
+
+    codec = args.codec or default_codec()
+    written = []
+    for source in args.banks:
+        started = time.perf_counter()
+        path, count = compress_bank_file(source, block_size=args.block_size, codec=codec)
+        elapsed = time.perf_counter() - started
+        before, after = os.path.getsize(source), os.path.getsize(path)
+        print(f"🗜️  {os.path.basename(source)}: {count} questions, {before / 1024:.1f} KiB -> "
+              f"{after / 1024:.1f} KiB ({before / after:.1f}x, {codec}) in {elapsed:.2f}s")
+        written.append(path)
+    return written
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
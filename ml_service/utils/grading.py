@@ -0,0 +1,259 @@
+"""
+Bulk grading under GATE marking rules.
+
+An AnswerKey turns a test's questions into arrays: question type, marks, and
+the correct answer as an option bitmask (MCQ and MSQ) or an accepted range
+(NAT, parsed by `parse_nat_answer`). A batch of submissions is encoded the
+same way into an option-bitmask matrix and a numeric matrix, one row per
+submission. Grading is then a few elementwise operations over the whole
+batch:
+
+    MCQ  full marks if right, -1/3 (1-mark) or -2/3 (2-mark) if wrong
+    MSQ  full marks only if exactly the correct options are chosen, else 0
+    NAT  full marks if the value is inside the accepted range, else 0
+    unanswered questions score 0
+
+Scores are kept in integer thirds of a mark, so totals are exact.
+
+    key = AnswerKey(questions)
+    results = key.grade_answers([{'GATE2024_Q01': 'FYBN', ...}, ...])
+"""
+
+import numpy as np
+
+from utils.question_validator import DEFAULT_QUESTION_TYPE, parse_nat_answer
+
+MCQ, MSQ, NAT = 0, 1, 2
+TYPE_CODES = {'MCQ': MCQ, 'MSQ': MSQ, 'NAT': NAT}
+MAX_OPTIONS = 63
+# Bit for a choice that is not one of the question's options: answered, never right
+UNKNOWN_CHOICE = 1 << MAX_OPTIONS
+
+
+class GradingError(ValueError):
+    pass
+
+
+def question_id(question):
+    return question.get('id') or question.get('_id')
+
+
+def _repeated(ids):
+    """Ids that occur more than once, in first-seen order"""
+    seen, repeated = set(), {}
+    for qid in ids:
+        if qid in seen:
+            repeated[qid] = None
+        seen.add(qid)
+    return list(repeated)
+
+
+def _as_number(answer):
+    """A submitted NAT value: None if blank, NaN if it is not a single number"""
+    if answer is None or answer == '':
+        return None
+    if isinstance(answer, bool):
+        return np.nan
+    try:
+        return float(answer)
+    except (TypeError, ValueError):
+        pass
+    parsed = parse_nat_answer(answer)
+    if parsed is None or parsed[0] != parsed[1]:
+        return np.nan
+    return parsed[0]
+
+
+def answer_correct(question, answer):
+    """Whether a single response is right: MCQ exact, MSQ same option set, NAT inside the accepted range"""
+    question_type = question.get('questionType') or DEFAULT_QUESTION_TYPE
+    key = question.get('correctAnswer')
+    if question_type == 'NAT':
+        accepted, given = parse_nat_answer(key), _as_number(answer)
+        return accepted is not None and given is not None and accepted[0] <= given <= accepted[1]
+    if question_type == 'MSQ':
+        as_set = lambda value: {value} if isinstance(value, str) else set(value or ())
+        return as_set(answer) == as_set(key)
+    return answer == key or answer == [key]
+
+
+class AnswerKey:
+    """Answer key arrays for an ordered list of questions"""
+
+    def __init__(self, questions, strict=True):
+        self.questions = list(questions)
+        if not all(isinstance(q, dict) for q in self.questions):
+            raise GradingError("Questions must be objects")
+        n = len(self.questions)
+        self.ids = [question_id(q) for q in self.questions]
+        self.position = {qid: i for i, qid in enumerate(self.ids)}
+        if len(self.position) < n:
+            raise GradingError(f"Duplicate question id(s): {_repeated(self.ids)[:5]}")
+        self.kind = np.zeros(n, dtype=np.int8)
+        self.marks = np.zeros(n, dtype=np.int64)
+        self.key_mask = np.zeros(n, dtype=np.uint64)
+        self.low = np.full(n, np.nan)
+        self.high = np.full(n, np.nan)
+        self.invalid = np.zeros(n, dtype=bool)
+        self.option_bits = [None] * n
+        self.sections = [q.get('section') or 'Unknown' for q in self.questions]
+
+        for i, question in enumerate(self.questions):
+            kind = TYPE_CODES.get(question.get('questionType') or DEFAULT_QUESTION_TYPE)
+            self.kind[i] = MCQ if kind is None else kind
+            self.marks[i] = question.get('marks') or 1
+            answer = question.get('correctAnswer')
+            if kind == NAT:
+                accepted = parse_nat_answer(answer)
+                if accepted is None:
+                    self.invalid[i] = True
+                else:
+                    self.low[i], self.high[i] = accepted
+                continue
+            options = question.get('options') or []
+            bits = {option: 1 << b for b, option in enumerate(options[:MAX_OPTIONS])}
+            self.option_bits[i] = bits
+            answers = [answer] if isinstance(answer, str) else list(answer or ())
+            if kind is None or not answers or any(a not in bits for a in answers) \
+                    or (kind == MCQ and len(answers) != 1):
+                self.invalid[i] = True
+                continue
+            self.key_mask[i] = sum(bits[a] for a in set(answers))
+
+        if strict and self.invalid.any():
+            bad = [self.ids[i] for i in np.flatnonzero(self.invalid)[:5]]
+            raise GradingError(f"{int(self.invalid.sum())} question(s) have no gradable answer key, e.g. {bad}")
+
+        # Scores in thirds of a mark: a wrong MCQ costs marks/3, i.e. `marks` thirds
+        self.full = 3 * self.marks
+        self.penalty = np.where(self.kind == MCQ, self.marks, 0)
+        self.section_names = sorted(set(self.sections))
+        section_of = {name: s for s, name in enumerate(self.section_names)}
+        self.section_index = np.array([section_of[s] for s in self.sections], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.questions)
+
+    @property
+    def max_score(self):
+        return int(self.marks.sum())
+
+    def take(self, ids):
+        """Answer key for a subset of questions, in the order of `ids`"""
+        if not isinstance(ids, (list, tuple)) or not all(isinstance(qid, str) for qid in ids):
+            raise GradingError("Question ids must be a list of strings")
+        missing = [qid for qid in ids if qid not in self.position]
+        if missing:
+            raise GradingError(f"Unknown question id(s): {missing[:5]}")
+        if len(set(ids)) < len(ids):
+            raise GradingError(f"Duplicate question id(s): {_repeated(ids)[:5]}")
+        return AnswerKey([self.questions[self.position[qid]] for qid in ids])
+
+    def encode(self, submissions):
+        """
+        (choices, values) matrices for a list of `{questionId: answer}`
+        dicts: option bitmasks for MCQ/MSQ (0 = unanswered) and numbers for
+        NAT (NaN = unanswered). Answers to questions outside the key are ignored.
+        A submission that is not a dict, or an MCQ/MSQ answer that is not an
+        option or a list of options, raises GradingError.
+        """
+        choice_cells, choice_masks, value_cells, value_numbers = [], [], [], []
+        position, kind, option_bits = self.position, self.kind.tolist(), self.option_bits
+        width = len(self)
+        for row, answers in enumerate(submissions):
+            if not isinstance(answers, dict):
+                raise GradingError(f"Submission {row}: answers must map question ids to answers")
+            base = row * width
+            for qid, answer in answers.items():
+                i = position.get(qid)
+                if i is None or answer is None or answer == '' or answer == []:
+                    continue
+                if kind[i] == NAT:
+                    number = _as_number(answer)
+                    # A non-numeric entry is answered and wrong; NAT carries no penalty either way
+                    value_cells.append(base + i)
+                    value_numbers.append(np.inf if number is None or number != number else number)
+                else:
+                    bits = option_bits[i]
+                    if isinstance(answer, str):
+                        mask = bits.get(answer, UNKNOWN_CHOICE)
+                    elif not isinstance(answer, list) or not all(isinstance(a, str) for a in answer):
+                        raise GradingError(f"Submission {row}: answer to {qid} must be an option "
+                                           f"or a list of options, got {answer!r}")
+                    else:
+                        mask = 0
+                        for a in answer:
+                            mask |= bits.get(a, UNKNOWN_CHOICE)
+                    choice_cells.append(base + i)
+                    choice_masks.append(mask)
+        # Scatter once into the flat matrices instead of one NumPy store per answer
+        choices = np.zeros(len(submissions) * width, dtype=np.uint64)
+        values = np.full(len(submissions) * width, np.nan)
+        choices[choice_cells] = np.array(choice_masks, dtype=np.uint64)
+        values[value_cells] = value_numbers
+        choices, values = choices.reshape(-1, width), values.reshape(-1, width)
+        return choices, values
+
+    def grade(self, choices, values):
+        """GradeResult for encoded submissions"""
+        nat = self.kind == NAT
+        answered = np.where(nat, ~np.isnan(values), choices != 0)
+        with np.errstate(invalid='ignore'):
+            correct = np.where(nat, (values >= self.low) & (values <= self.high), choices == self.key_mask)
+        correct &= answered & ~self.invalid
+        # A question without a gradable key (strict=False) scores 0 either way
+        wrong = answered & ~correct & ~self.invalid
+        thirds = np.where(correct, self.full, 0) - np.where(wrong, self.penalty, 0)
+        return GradeResult(self, thirds, correct, wrong, answered)
+
+    def grade_answers(self, submissions):
+        return self.grade(*self.encode(submissions))
+
+
+class GradeResult:
+    """Per-submission, per-question scores (in thirds of a mark) with summaries"""
+
+    def __init__(self, key, thirds, correct, wrong, answered):
+        self.key = key
+        self.thirds = thirds
+        self.correct = correct
+        self.wrong = wrong
+        self.answered = answered
+
+    def __len__(self):
+        return len(self.thirds)
+
+    @property
+    def scores(self):
+        return self.thirds.sum(axis=1) / 3
+
+    @property
+    def negative(self):
+        return np.where(self.thirds < 0, -self.thirds, 0).sum(axis=1) / 3
+
+    def section_scores(self):
+        """(submissions, sections) marks; columns follow `key.section_names`"""
+        onehot = np.zeros((len(self.key), len(self.key.section_names)), dtype=np.int64)
+        onehot[np.arange(len(self.key)), self.key.section_index] = 1
+        return (self.thirds @ onehot) / 3
+
+    def to_dicts(self, details=False):
+        sections = self.section_scores().round(2).tolist()
+        columns = zip(self.scores.round(2).tolist(), self.negative.round(2).tolist(),
+                      self.correct.sum(axis=1).tolist(), self.wrong.sum(axis=1).tolist(),
+                      (~self.answered).sum(axis=1).tolist(), sections)
+        results = []
+        for row, (score, negative, correct, wrong, unanswered, by_section) in enumerate(columns):
+            result = {
+                'score': score,
+                'maxScore': self.key.max_score,
+                'negativeMarks': negative,
+                'correct': correct,
+                'wrong': wrong,
+                'unanswered': unanswered,
+                'sections': dict(zip(self.key.section_names, by_section)),
+            }
+            if details:
+                result['marks'] = dict(zip(self.key.ids, (self.thirds[row] / 3).round(2).tolist()))
+            results.append(result)
+        return results
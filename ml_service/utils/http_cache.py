@@ -0,0 +1,118 @@
+"""
+Local cache for remote payloads with conditional revalidation.
+
+`fetch` keeps the raw response body on disk next to its ETag/Last-Modified
+validators. Later fetches send `If-None-Match`/`If-Modified-Since`; on a 304
+the cached copy is reused without downloading anything. Without network (or
+with `offline=True`) the cached copy is served as-is. Bodies are streamed to
+disk, so the payload is never held in memory.
+
+    entry, status = fetch(url)          # 'downloaded' | 'not_modified' | 'offline'
+    for topic, record in iter_topic_bank(entry.payload_path): ...
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import requests
+
+from utils.question_journal import write_json_atomic
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, '.cache')
+CHUNK_SIZE = 64 * 1024
+TIMEOUT = 30
+
+
+class CacheMiss(LookupError):
+    """Offline, and nothing cached for the URL"""
+
+
+class CacheEntry:
+    """Cached payload and metadata for one URL"""
+
+    def __init__(self, url, cache_dir=DEFAULT_CACHE_DIR):
+        self.url = url
+        self.directory = os.path.join(cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest()[:16])
+        self.payload_path = os.path.join(self.directory, 'payload')
+        self.meta_path = os.path.join(self.directory, 'meta.json')
+        self.meta = {}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+
+    def exists(self):
+        return bool(self.meta) and os.path.exists(self.payload_path)
+
+    @property
+    def digest(self):
+        """sha256 of the cached payload"""
+        return self.meta.get('sha256')
+
+    def validators(self):
+        """Conditional request headers for the cached copy"""
+        if not self.exists():
+            return {}
+        headers = {}
+        if self.meta.get('etag'):
+            headers['If-None-Match'] = self.meta['etag']
+        if self.meta.get('lastModified'):
+            headers['If-Modified-Since'] = self.meta['lastModified']
+        return headers
+
+    def update(self, **fields):
+        self.meta.update(fields)
+        write_json_atomic(self.meta_path, self.meta)
+
+    def store(self, response):
+        """Stream a 200 response body into the cache, replacing the old copy atomically"""
+        os.makedirs(self.directory, exist_ok=True)
+        digest, size = hashlib.sha256(), 0
+        tmp_path = f"{self.payload_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+        os.replace(tmp_path, self.payload_path)
+        now = datetime.now().isoformat()
+        self.update(
+            url=self.url,
+            etag=response.headers.get('ETag'),
+            lastModified=response.headers.get('Last-Modified'),
+            sha256=digest.hexdigest(),
+            size=size,
+            fetchedAt=now,
+            checkedAt=now,
+        )
+
+
+def fetch(url, cache_dir=DEFAULT_CACHE_DIR, offline=False, timeout=TIMEOUT):
+    """
+    Bring the cache for `url` up to date. Returns (CacheEntry, status) where
+    status is 'downloaded', 'not_modified' (304, cached copy still current)
+    or 'offline' (network skipped or unreachable, cached copy used). Raises
+    CacheMiss if the network is unavailable and nothing is cached.
+    """
+    entry = CacheEntry(url, cache_dir)
+    if offline:
+        if not entry.exists():
+            raise CacheMiss(f"No cached copy of {url}")
+        return entry, 'offline'
+
+    try:
+        response = requests.get(url, headers=entry.validators(), stream=True, timeout=timeout)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        if not entry.exists():
+            raise CacheMiss(f"{url} is unreachable and not cached: {e}") from e
+        return entry, 'offline'
+
+    with response:
+        if response.status_code == 304 and entry.exists():
+            entry.update(checkedAt=datetime.now().isoformat())
+            return entry, 'not_modified'
+        response.raise_for_status()
+        entry.store(response)
+    return entry, 'downloaded'
@@ -0,0 +1,184 @@
+"""
+Bulk loader from the canonical question bank into MongoDB.
+
+Streams the bank (snapshot plus journal, or any bank file) into the
+`questions` collection the Node `Question` model reads, as unordered
+`bulk_write` batches of upserts keyed by `stableId`. Re-running the loader
+updates questions in place instead of duplicating them, and keeps each
+document's ObjectId so `Test.questions` references stay valid. Batches are
+written by a small thread pool; pymongo releases the GIL while waiting on the
+server, so writers overlap network round trips.
+
+Also creates the indexes the Node routes rely on: `difficulty` for the
+`$match` in `routes/tests.js` and `topic` for the `$group` in
+`routes/trends.js`.
+
+    MONGODB_URI=mongodb://localhost:27017/gate-prep python -m utils.mongo_loader
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from pymongo import ASCENDING, MongoClient, UpdateOne
+
+from utils.bank_stream import batched, dedup, iter_bank
+from utils.question_ids import with_stable_id
+from utils.question_journal import QuestionJournal
+from utils.question_validator import DEFAULT_QUESTION_TYPE, require_valid
+
+DEFAULT_URI = 'mongodb://localhost:27017/gate-prep'
+DEFAULT_DATABASE = 'gate-prep'
+COLLECTION = 'questions'
+BATCH_SIZE = 1000
+WORKERS = 4
+
+# MSQ answer lists are stored as one string, the type of Question.correctAnswer
+MSQ_SEPARATOR = ';'
+
+# Partial, so questions created through the Node model without a stableId don't collide on null;
+# Question.js declares the same index so Mongoose's autoIndex agrees with it
+INDEXES = (
+    ([('stableId', ASCENDING)], {'name': 'stableId_1', 'unique': True,
+                                 'partialFilterExpression': {'stableId': {'$exists': True}}}),
+    ([('difficulty', ASCENDING)], {'name': 'difficulty_1'}),
+    ([('topic', ASCENDING)], {'name': 'topic_1'}),
+)
+
+
+def to_document(question):
+    """Map a bank question onto the Mongoose Question schema"""
+    answer = question.get('correctAnswer')
+    if isinstance(answer, list):
+        answer = MSQ_SEPARATOR.join(map(str, answer))
+    document = {
+        'stableId': question['stableId'],
+        'legacyId': question.get('id'),
+        'text': question['text'],
+        'options': question.get('options', []),
+        'correctAnswer': str(answer),
+        'topic': question['topic'],
+        # The GATE-format bank has no subject on some questions; inMemoryDb.js uses the section
+        'subject': question.get('subject') or question.get('section'),
+        'section': question.get('section'),
+        'difficulty': question['difficulty'],
+        'questionType': question.get('questionType') or DEFAULT_QUESTION_TYPE,
+        'year': question.get('year'),
+        'marks': question.get('marks', 1),
+        'explanation': question.get('explanation'),
+    }
+    return {key: value for key, value in document.items() if value is not None}
+
+
+def upserts(questions, now=None):
+    now = now or datetime.now(timezone.utc)
+    return [
+        UpdateOne(
+            {'stableId': document['stableId']},
+            {'$set': document, '$setOnInsert': {'createdAt': now}},
+            upsert=True,
+        )
+        for document in map(to_document, questions)
+    ]
+
+
+def connect(uri=None):
+    """(client, questions collection) for MONGODB_URI, as the Node server connects"""
+    uri = uri or os.environ.get('MONGODB_URI', DEFAULT_URI)
+    client = MongoClient(uri)
+    return client, client.get_default_database(DEFAULT_DATABASE)[COLLECTION]
+
+
+def ensure_indexes(collection):
+    for keys, options in INDEXES:
+        collection.create_index(keys, **options)
+
+
+class LoadStats:
+    def __init__(self):
+        self.documents = 0
+        self.inserted = 0
+        self.modified = 0
+        self.batches = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add(self, count, result):
+        self.documents += count
+        self.inserted += result.upserted_count
+        self.modified += result.modified_count
+        self.batches += 1
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            'documents': self.documents, 'inserted': self.inserted, 'modified': self.modified,
+            'batches': self.batches, 'seconds': round(self.elapsed, 3), 'docsPerSecond': round(self.rate),
+        }
+
+
+def load_questions(questions, collection, batch_size=BATCH_SIZE, workers=WORKERS, on_batch=None):
+    """
+    Upsert a stream of questions in batches of `batch_size` using `workers`
+    concurrent writers. At most two batches per writer are in flight, so
+    memory stays bounded for any bank size. Each batch is validated before
+    it is sent. Questions with the same content (stableId) are written once,
+    so concurrent batches never race to upsert the same document. Returns
+    LoadStats.
+    """
+    stats = LoadStats()
+    now = datetime.now(timezone.utc)
+    pending = {}
+
+    def settle(done):
+        for future in done:
+            count = pending.pop(future)
+            stats.add(count, future.result())
+            if on_batch:
+                on_batch(stats)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in batched(dedup(map(with_stable_id, questions), key='stableId'), batch_size):
+            operations = upserts(require_valid(batch), now)
+            pending[pool.submit(collection.bulk_write, operations, ordered=False)] = len(operations)
+            if len(pending) >= 2 * workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                settle(done)
+        settle(list(pending))
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load the question bank into MongoDB')
+    parser.add_argument('source', nargs='?', help='bank file (default: canonical snapshot + journal)')
+    parser.add_argument('--uri', help='MongoDB URI (default: MONGODB_URI or local gate-prep)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=WORKERS)
+    args = parser.parse_args(argv)
+
+    questions = iter_bank(args.source) if args.source else QuestionJournal().iter_questions()
+    client, collection = connect(args.uri)
+    try:
+        ensure_indexes(collection)
+        print(f"🗂️  Indexes ready on {collection.database.name}.{collection.name}")
+        stats = load_questions(
+            questions, collection, batch_size=args.batch_size, workers=args.workers,
+            on_batch=lambda s: print(f"   {s.documents:>9,} docs  {s.rate:>9,.0f} docs/s", end='\r'),
+        )
+    finally:
+        client.close()
+
+    print(f"\n✅ Loaded {stats.documents:,} questions in {stats.elapsed:.2f}s ({stats.rate:,.0f} docs/s)")
+    print(f"➕ {stats.inserted:,} inserted, ✏️  {stats.modified:,} modified")
+    return stats.to_dict()
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,619 @@
+"""
+Near-duplicate question detection with MinHash signatures and LSH banding.
+
+Each question is reduced to a feature set of word shingles (runs of two
+consecutive normalized tokens, so "stacks to implement a queue" and "queues
+to implement a stack" differ) plus its normalized options. MinHash
+signatures are computed for whole banks at once with NumPy, LSH band buckets
+propose candidate pairs, and candidates are confirmed with an exact
+text/option similarity, scored for all candidates of a scan at once. Terse
+stems ("Belady anomaly in?") have too few shingles for LSH to pair them
+reliably, so questions containing all of a short stem's words are proposed
+too, and only match when the answer and most options agree. A cluster only
+groups questions that are confirmed duplicates of every other member;
+similarity is not followed transitively.
+
+The resulting merge report is advisory: it is for review, and
+`QuestionStore.add_questions` only consults it when asked to
+(`skip_near_duplicates=True`).
+
+    python -m utils.near_duplicates                 # scan the default banks
+    python -m utils.near_duplicates a.json b.json --threshold 0.8
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import time
+import zlib
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from utils.bank_stream import iter_bank
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_REPORT_PATH = os.path.join(DATA_DIR, 'near_duplicates_report.json')
+DEFAULT_BANKS = [
+    os.path.join(DATA_DIR, 'gate_format_complete.json'),
+    os.path.join(DATA_DIR, 'comprehensive_300_questions.json'),
+]
+
+STOPWORDS = frozenset("""
+a an the of in on at to for from by with is are was were be been being which what who
+whom whose when where why how that this these those it its and or not does do did can
+could will would should shall may might must has have had than then there their into as
+if following given
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+SHINGLE_SIZE = 2
+# A stem needs this many shingles before shingle containment (a terse
+# rewording of a longer question) counts. A shorter stem matches a question
+# containing all of its words instead, if it has at least MIN_SHORT_TOKENS
+# words and both share the answer and an option Jaccard of MIN_OPTION_OVERLAP
+MIN_CONTAINMENT_SHINGLES = 4
+MIN_SHORT_TOKENS = 2
+MIN_OPTION_OVERLAP = 0.5
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_tokens(text):
+    """Lowercased word tokens without stopwords, possessives or plural 's'"""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower().replace("'s", "")):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def shingles(tokens, size=SHINGLE_SIZE):
+    """Order-aware word shingles: every run of `size` consecutive tokens (the whole text if shorter)"""
+    if len(tokens) <= size:
+        return frozenset([' '.join(tokens)]) if tokens else frozenset()
+    return frozenset(' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+
+@lru_cache(maxsize=1 << 16)
+def _normalize_text(text):
+    return ' '.join(normalize_tokens(text)) or text.strip().lower()
+
+
+def _normalize_value(value):
+    # Options repeat across a bank ("O(n)", "None of these"), so their normal forms are cached
+    return _normalize_text(str(value))
+
+
+def question_features(question):
+    """
+    (text shingle set, option set, stem word set, normalized answer) used for
+    both MinHash and verification
+    """
+    tokens = normalize_tokens(question.get('text', ''))
+    options = frozenset(_normalize_value(option) for option in question.get('options', []))
+    answer = question.get('correctAnswer')
+    if isinstance(answer, list):
+        answer = frozenset(_normalize_value(item) for item in answer) or None
+    elif answer is not None and str(answer).strip():
+        answer = _normalize_value(answer)
+    else:
+        answer = None
+    return shingles(tokens), options, frozenset(tokens), answer
+
+
+def _is_short(features):
+    """True for a stem matched on word containment (see MIN_CONTAINMENT_SHINGLES)"""
+    text, _, tokens, answer = features
+    return len(text) < MIN_CONTAINMENT_SHINGLES and len(tokens) >= MIN_SHORT_TOKENS and answer is not None
+
+
+def similarity(a, b, weight=None):
+    """
+    Similarity of two question feature tuples in [0, 1]. Text shingles are
+    weighted by `weight` (IDF, so "time complexity" counts for less than
+    "belady anomaly") and scored with weighted Jaccard. When both stems have
+    at least MIN_CONTAINMENT_SHINGLES shingles, containment counts too, so a
+    shorter rewording of a longer question still matches. A shorter stem
+    ("Belady anomaly in?") matches a question that has all of its words,
+    but only if both have the same answer and mostly the same options,
+    so "Binary search complexity?" does not match every longer question about
+    binary search. Shared options add weight but cannot make unrelated stems
+    match on their own.
+    """
+    if not a[0] or not b[0]:
+        return 0.0
+    if weight is None:
+        weight = lambda token: 1.0
+
+    return _weighted_similarity(
+        a, b, sum(weight(t) for t in a[0]), sum(weight(t) for t in b[0]), weight
+    )
+
+
+def _weighted_similarity(a, b, total_a, total_b, weight):
+    text_a, options_a, tokens_a, answer_a = a
+    text_b, options_b, tokens_b, answer_b = b
+    if not text_a or not text_b:
+        return 0.0
+    common = sum(weight(token) for token in text_a & text_b)
+    text_score = common / (total_a + total_b - common)
+    option_score = len(options_a & options_b) / len(options_a | options_b) if options_a and options_b else None
+    if min(len(text_a), len(text_b)) >= MIN_CONTAINMENT_SHINGLES:
+        text_score = max(text_score, common / min(total_a, total_b))
+    elif (answer_a is not None and answer_a == answer_b and min(len(tokens_a), len(tokens_b)) >= MIN_SHORT_TOKENS
+          and option_score is not None and option_score >= MIN_OPTION_OVERLAP
+          and len(tokens_a & tokens_b) == min(len(tokens_a), len(tokens_b))):
+        text_score = 1.0
+    if option_score is None:
+        return text_score
+    return 0.8 * text_score + 0.2 * option_score
+
+
+def minhash_signatures(feature_sets, num_perm=128, seed=1, chunk_size=2048):
+    """uint32 MinHash signatures, one row per feature set"""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+    b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    n = len(feature_sets)
+    signatures = np.full((n, num_perm), MAX_HASH, dtype=np.uint32)
+    for start in range(0, n, chunk_size):
+        chunk = feature_sets[start:start + chunk_size]
+        lengths = np.fromiter((len(f) for f in chunk), dtype=np.int64, count=len(chunk))
+        if not lengths.any():
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode('utf-8')) for f in chunk for feature in f),
+            dtype=np.uint64, count=int(lengths.sum())
+        )
+        permuted = ((hashes[:, None] * a + b) % MERSENNE_PRIME) & MAX_HASH
+        nonempty = np.flatnonzero(lengths)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+        signatures[start + nonempty] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return signatures
+
+
+def _feature_set(features):
+    text, options = features[:2]
+    return [*text, *('opt:' + option for option in options)]
+
+
+class NearDuplicateIndex:
+    """LSH index over question MinHash signatures, supporting incremental adds"""
+
+    # Candidates whose MinHash-estimated Jaccard is below this are not rescored
+    min_estimate = 0.25
+
+    def __init__(self, threshold=0.8, bands=32, rows=4, seed=1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.seed = seed
+        self.keys = []
+        self.features = []
+        self.signatures = np.empty((0, bands * rows), dtype=np.uint32)
+        self.buckets = [{} for _ in range(bands)]
+        self.document_frequency = {}
+        # Stem word -> positions of every question, and of short stems only
+        self.token_postings = {}
+        self.short_postings = {}
+        # IDF weights and per-question weight totals, valid until the next add
+        self._weights = {}
+        self._totals = {}
+
+    def idf(self, token):
+        weight = self._weights.get(token)
+        if weight is None:
+            weight = math.log(1 + len(self.features) / self.document_frequency.get(token, 1))
+            self._weights[token] = weight
+        return weight
+
+    def _total(self, position, features=None):
+        total = self._totals.get(position)
+        if total is None:
+            text = (features or self.features[position])[0]
+            total = self._totals[position] = sum(self.idf(token) for token in text)
+        return total
+
+    def score(self, features, position, total=None):
+        """Similarity of `features` to the indexed question at `position`"""
+        if total is None:
+            total = sum(self.idf(token) for token in features[0])
+        return _weighted_similarity(
+            features, self.features[position], total, self._total(position), self.idf
+        )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _signatures(self, features):
+        return minhash_signatures(
+            [_feature_set(f) for f in features], self.bands * self.rows, self.seed
+        )
+
+    def _band_keys(self, signatures):
+        """One integer bucket key per (question, band), hashed in bulk"""
+        rows = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        multipliers = np.random.RandomState(self.seed + 1).randint(
+            1, 1 << 62, size=self.rows, dtype=np.uint64
+        ) | np.uint64(1)
+        # uint64 arithmetic wraps, which is what a multiplicative hash wants
+        return (rows * multipliers).sum(axis=2, dtype=np.uint64)
+
+    def short_stem_candidates(self, features):
+        """
+        Positions that may pair with `features` through word containment:
+        questions containing all of its words if it is a short stem, and
+        short stems whose words it contains. Only same-answer ones are kept.
+        """
+        tokens, answer = features[2], features[3]
+        if answer is None:
+            return set()
+        found = set()
+        if _is_short(features):
+            postings = sorted((self.token_postings.get(token, ()) for token in tokens), key=len)
+            found.update(postings[0])
+            for positions in postings[1:]:
+                found.intersection_update(positions)
+        for token in tokens:
+            for position in self.short_postings.get(token, ()):
+                if self.features[position][2] <= tokens:
+                    found.add(position)
+        return {position for position in found if self.features[position][3] == answer}
+
+    def candidates(self, band_keys, signature=None):
+        """
+        Indexed positions sharing at least one LSH band with `band_keys`, as a
+        sorted array. With `signature`, candidates whose signatures agree on
+        too few hashes to possibly match are dropped in one vectorized pass.
+        """
+        found = set()
+        for band, key in enumerate(band_keys):
+            found.update(self.buckets[band].get(key, ()))
+        found = np.fromiter(sorted(found), dtype=np.int64, count=len(found))
+        if signature is not None and len(found):
+            estimate = (self.signatures[found] == signature).mean(axis=1)
+            found = found[estimate >= self.min_estimate]
+        return found
+
+    def _matches(self, features, band_keys, signature, limit):
+        """Confirmed matches among indexed items below position `limit`"""
+        total = sum(self.idf(token) for token in features[0])
+        matches = []
+        found = set(self.candidates(band_keys, signature).tolist()) | self.short_stem_candidates(features)
+        for candidate in sorted(found):
+            if candidate >= limit:
+                continue
+            score = self.score(features, candidate, total)
+            if score >= self.threshold:
+                matches.append((candidate, score))
+        return matches
+
+    def _extend(self, questions, keys):
+        """
+        Append questions and their token frequencies without bucketing them yet.
+        Token weights cover the whole batch before any pair is scored.
+        Returns (first new position, band key array of shape (batch, bands)).
+        """
+        features = [question_features(q) for q in questions]
+        signatures = self._signatures(features)
+        self.signatures = np.concatenate([self.signatures, signatures])
+        base = len(self.features)
+        self.keys.extend(keys if keys is not None else [q.get('id') for q in questions])
+        self.features.extend(features)
+        for position, feature in enumerate(features, base):
+            for token in feature[0]:
+                self.document_frequency[token] = self.document_frequency.get(token, 0) + 1
+            for token in feature[2]:
+                self.token_postings.setdefault(token, []).append(position)
+                if _is_short(feature):
+                    self.short_postings.setdefault(token, []).append(position)
+        self._weights.clear()
+        self._totals.clear()
+        return base, self._band_keys(signatures)
+
+    def _bucket(self, position, band_keys):
+        for band, band_key in enumerate(band_keys):
+            self.buckets[band].setdefault(band_key, []).append(position)
+
+    def add_many(self, questions, keys=None):
+        """
+        Index questions, returning confirmed (new position, earlier position, score)
+        pairs, including pairs within the batch.
+        """
+        base, band_keys = self._extend(questions, keys)
+        pairs = []
+        for offset, keys_for_question in enumerate(band_keys.tolist()):
+            position = base + offset
+            for candidate, score in self._matches(
+                self.features[position], keys_for_question, self.signatures[position], position
+            ):
+                pairs.append((position, candidate, score))
+            self._bucket(position, keys_for_question)
+        return pairs
+
+    def query(self, question):
+        """Indexed keys that `question` nearly duplicates, best first"""
+        features = question_features(question)
+        signature = self._signatures([features])[0]
+        matches = self._matches(
+            features, self._band_keys(signature[None, :])[0].tolist(), signature, len(self.keys)
+        )
+        matches.sort(key=lambda match: -match[1])
+        return [(self.keys[position], score) for position, score in matches]
+
+
+def _completeness(question):
+    """Preference order for the canonical member of a cluster"""
+    return (
+        bool(question.get('explanation')),
+        bool(question.get('subject')),
+        bool(question.get('questionType')),
+        len(question.get('text', '')),
+    )
+
+
+def _candidate_pairs(band_keys, window=32):
+    """
+    (later, earlier) position pairs sharing an LSH bucket in any band, found
+    by sorting each band's keys instead of probing buckets one question at a
+    time. Within an oversized bucket each question is paired with at most
+    `window` predecessors.
+    """
+    n = len(band_keys)
+    pairs = []
+    for band in range(band_keys.shape[1]):
+        order = np.argsort(band_keys[:, band], kind='stable')
+        keys = band_keys[order, band]
+        for distance in range(1, window + 1):
+            same = keys[distance:] == keys[:-distance]
+            if not same.any():
+                break
+            later, earlier = order[distance:][same], order[:-distance][same]
+            pairs.append(np.maximum(later, earlier) * n + np.minimum(later, earlier))
+    if not pairs:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    encoded = np.unique(np.concatenate(pairs))
+    return encoded // n, encoded % n
+
+
+def _flatten(sets, vocabulary):
+    """Item ids of every set, concatenated, with per-set lengths and offsets"""
+    ids = np.fromiter((vocabulary.setdefault(item, len(vocabulary)) for items in sets for item in items),
+                      dtype=np.int64)
+    lengths = np.fromiter((len(items) for items in sets), dtype=np.int64, count=len(sets))
+    return ids, lengths, np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+
+
+def _shared(later, earlier, flat, size, weights=None, chunk_size=1 << 17):
+    """
+    Per pair, the (weighted) size of the intersection of two questions' item
+    sets. Both sides' items are keyed by pair, sorted, and equal neighbours
+    are the shared items; sets hold each item once, so a key repeats only
+    across the two sides.
+    """
+    ids, lengths, offsets = flat
+    shared = np.zeros(len(later))
+    for start in range(0, len(later), chunk_size):
+        keys = []
+        for side in (later[start:start + chunk_size], earlier[start:start + chunk_size]):
+            counts = lengths[side]
+            ends = np.cumsum(counts)
+            within = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts, counts)
+            items = ids[np.repeat(offsets[side], counts) + within]
+            keys.append(np.repeat(np.arange(len(side)), counts) * size + items)
+        keys = np.sort(np.concatenate(keys))
+        repeated = keys[1:][keys[1:] == keys[:-1]]
+        pair, item = repeated // size, repeated % size
+        shared[start:start + chunk_size] = np.bincount(
+            pair, weights=None if weights is None else weights[item], minlength=min(chunk_size, len(later) - start)
+        )
+    return shared
+
+
+def _score_pairs(index, later, earlier):
+    """`NearDuplicateIndex.score` for many (later, earlier) position pairs at once"""
+    features = index.features
+    columns = []
+    for field in range(3):
+        vocabulary = {}
+        flat = _flatten([f[field] for f in features], vocabulary)
+        columns.append((flat, vocabulary))
+    (text, text_vocabulary), (options, _), (tokens, _) = columns
+    idf = np.array([index.idf(token) for token in text_vocabulary], dtype=np.float64)
+    owners = np.repeat(np.arange(len(features)), text[1])
+    totals = np.bincount(owners, weights=idf[text[0]], minlength=len(features))
+    answer_ids = {}
+    answers = np.array([-1 if f[3] is None else answer_ids.setdefault(f[3], len(answer_ids)) for f in features])
+
+    common = _shared(later, earlier, text, len(text_vocabulary), idf)
+    total_a, total_b = totals[later], totals[earlier]
+    shingle_a, shingle_b = text[1][later], text[1][earlier]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        text_score = np.where((shingle_a > 0) & (shingle_b > 0), common / (total_a + total_b - common), 0.0)
+        contained = np.minimum(shingle_a, shingle_b) >= MIN_CONTAINMENT_SHINGLES
+        text_score = np.where(contained, np.maximum(text_score, common / np.minimum(total_a, total_b)), text_score)
+
+        option_a, option_b = options[1][later], options[1][earlier]
+        has_options = (option_a > 0) & (option_b > 0)
+        shared_options = _shared(later, earlier, options, max(len(columns[1][1]), 1))
+        option_score = np.where(has_options, shared_options / (option_a + option_b - shared_options), 0.0)
+
+        token_a, token_b = tokens[1][later], tokens[1][earlier]
+        short = (~contained & (answers[later] >= 0) & (answers[later] == answers[earlier])
+                 & (np.minimum(token_a, token_b) >= MIN_SHORT_TOKENS)
+                 & has_options & (option_score >= MIN_OPTION_OVERLAP))
+        if short.any():
+            shared_tokens = _shared(later[short], earlier[short], tokens, max(len(columns[2][1]), 1))
+            text_score[np.flatnonzero(short)[shared_tokens == np.minimum(token_a[short], token_b[short])]] = 1.0
+    text_score = np.where((shingle_a > 0) & (shingle_b > 0), text_score, 0.0)
+    return np.where(has_options, 0.8 * text_score + 0.2 * option_score, text_score)
+
+
+def find_clusters(questions, threshold=0.8, bands=32, rows=4, seed=1):
+    """Group near-duplicates; returns lists of (position, best score) per cluster"""
+    index = NearDuplicateIndex(threshold, bands, rows, seed)
+    _, band_keys = index._extend(questions, list(range(len(questions))))
+
+    later, earlier = _candidate_pairs(band_keys)
+    if len(later):
+        estimate = (index.signatures[later] == index.signatures[earlier]).mean(axis=1)
+        keep = estimate >= index.min_estimate
+        later, earlier = later[keep], earlier[keep]
+
+    # Short stems pair with every same-answer question containing their words
+    short = {}
+    for position, features in enumerate(index.features):
+        if _is_short(features):
+            for other in index.short_stem_candidates(features):
+                if other != position:
+                    short[max(position, other), min(position, other)] = True
+    if short:
+        n = len(questions)
+        encoded = np.unique(np.concatenate([later * n + earlier, [x * n + y for x, y in short]]))
+        later, earlier = encoded // n, encoded % n
+
+    # Scored in bulk; pairs below the threshold are rescored one at a time if linkage asks
+    pair_scores = _score_pairs(index, later, earlier) if len(later) else np.empty(0)
+    above = pair_scores >= threshold
+    scores = {
+        (candidate, position): score
+        for position, candidate, score in zip(later[above].tolist(), earlier[above].tolist(),
+                                              pair_scores[above].tolist())
+    }
+
+    def pair_score(x, y):
+        key = (min(x, y), max(x, y))
+        score = scores.get(key)
+        if score is None:
+            score = scores[key] = index.score(index.features[key[1]], key[0], index._total(key[1]))
+        return score
+
+    # Complete linkage: strongest pairs first, and two clusters merge only if
+    # every pair across them is confirmed, so A~B and B~C never pull in C
+    confirmed = sorted(((score, pair) for pair, score in scores.items() if score >= threshold),
+                       key=lambda item: (-item[0], item[1]))
+    cluster_of, members = {}, {}
+    for _, (x, y) in confirmed:
+        cx, cy = cluster_of.get(x, x), cluster_of.get(y, y)
+        if cx == cy:
+            continue
+        a, b = members.get(cx, [x]), members.get(cy, [y])
+        if all(pair_score(i, j) >= threshold for i in a for j in b):
+            members[cx] = a + b
+            members.pop(cy, None)
+            for member in b:
+                cluster_of[member] = cx
+            cluster_of[x] = cx
+
+    return [
+        [(position, round(max(pair_score(position, other) for other in group if other != position), 3))
+         for position in sorted(group)]
+        for group in members.values()
+    ]
+
+
+def load_questions(path):
+    return list(iter_bank(path))
+
+
+def build_merge_report(banks, threshold=0.8, bands=32, rows=4, seed=1):
+    """Merge report over {bank name: questions}"""
+    questions, sources = [], []
+    for name, bank in banks.items():
+        questions.extend(bank)
+        sources.extend([name] * len(bank))
+
+    clusters = []
+    for members in find_clusters(questions, threshold, bands, rows, seed):
+        canonical = max(members, key=lambda member: _completeness(questions[member[0]]))[0]
+        clusters.append({
+            "canonical": questions[canonical].get('id'),
+            "canonicalBank": sources[canonical],
+            "members": [
+                {
+                    "id": questions[position].get('id'),
+                    "bank": sources[position],
+                    "text": questions[position].get('text', ''),
+                    "similarity": score,
+                }
+                for position, score in members
+            ],
+        })
+    clusters.sort(key=lambda cluster: -len(cluster['members']))
+
+    return {
+        "generatedAt": datetime.now().isoformat(),
+        "threshold": threshold,
+        "lsh": {"bands": bands, "rows": rows, "seed": seed},
+        "banks": {name: len(bank) for name, bank in banks.items()},
+        "totalClusters": len(clusters),
+        "duplicateQuestions": sum(len(c['members']) - 1 for c in clusters),
+        "clusters": clusters,
+    }
+
+
+class MergeReport:
+    """Lookup view over a saved merge report for writer scripts"""
+
+    def __init__(self, report=None):
+        self.report = report or {"clusters": []}
+        self._members = {}
+        for cluster in self.report.get('clusters', []):
+            ids = [member['id'] for member in cluster['members']]
+            for qid in ids:
+                self._members.setdefault(qid, set()).update(i for i in ids if i != qid)
+
+    @classmethod
+    def load(cls, path=DEFAULT_REPORT_PATH):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.report.get('clusters', []))
+
+    def duplicates_of(self, question_id):
+        """Ids of known near-duplicates of `question_id`"""
+        return self._members.get(question_id, ())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find near-duplicate questions across banks')
+    parser.add_argument('banks', nargs='*', default=DEFAULT_BANKS)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--bands', type=int, default=32)
+    parser.add_argument('--rows', type=int, default=4)
+    parser.add_argument('--output', default=DEFAULT_REPORT_PATH)
+    args = parser.parse_args(argv)
+
+    banks = {os.path.basename(path): load_questions(path) for path in args.banks}
+    total = sum(len(bank) for bank in banks.values())
+    print(f"🔍 Scanning {total} questions from {len(banks)} banks...")
+
+    started = time.perf_counter()
+    report = build_merge_report(banks, args.threshold, args.bands, args.rows)
+    elapsed = time.perf_counter() - started
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"✅ Found {report['totalClusters']} clusters "
+          f"({report['duplicateQuestions']} duplicates) in {elapsed:.2f}s")
+    print(f"💾 Merge report saved to: {args.output}")
+    return report
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,287 @@
+"""
+Blueprint-driven GATE mock paper assembly.
+
+A blueprint fixes each section's question count and marks total and sets
+target mixes for subjects (SYLLABUS_WEIGHTAGE), difficulty and question type.
+The bank is bucketed once per section by (marks, subject, difficulty, type).
+Planning then solves the blueprint against the bucket sizes, which gives how
+many questions each bucket contributes. Section counts and marks totals are
+met exactly or planning fails. The mixes are met as closely as the bank
+allows, with each slot filled from the bucket furthest behind its targets.
+
+Every paper drawn from a plan satisfies the blueprint by construction, so
+drawing is just sampling without replacement inside each bucket. That is
+done for a whole batch of papers at once with NumPy:
+
+    assembler = PaperAssembler(questions)
+    papers = assembler.assemble_many(1000)         # 65 questions, 100 marks each
+
+    python -m utils.paper_assembler --count 3 --seed 7
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from utils.question_journal import load_bank
+from utils.syllabus import DIFFICULTY_MIX, GATE_SECTIONS, QUESTION_TYPE_MIX, SYLLABUS_WEIGHTAGE, question_subject
+
+DEFAULT_QUESTION_TYPE = 'MCQ'
+# Below this many candidates per pick, sampling ranks random keys over the whole bucket
+DENSE_SAMPLING_RATIO = 8
+
+
+class BlueprintError(ValueError):
+    pass
+
+
+class Blueprint:
+    """Section sizes plus subject, difficulty and question type targets"""
+
+    def __init__(self, sections=GATE_SECTIONS, weightage=None, difficulty=None, question_types=None):
+        if not isinstance(sections, (list, tuple)) or not all(isinstance(s, dict) for s in sections):
+            raise BlueprintError("Blueprint sections must be a list of objects")
+        for name, value in (('weightage', weightage), ('difficulty', difficulty), ('questionTypes', question_types)):
+            if value is not None and (not isinstance(value, dict) or not all(
+                    isinstance(w, (int, float)) and not isinstance(w, bool) for w in value.values())):
+                raise BlueprintError(f"Blueprint {name} must map names to numeric weights")
+        self.sections = [dict(section) for section in sections]
+        self.weightage = dict(SYLLABUS_WEIGHTAGE if weightage is None else weightage)
+        self.difficulty = dict(DIFFICULTY_MIX if difficulty is None else difficulty)
+        self.question_types = dict(QUESTION_TYPE_MIX if question_types is None else question_types)
+        for section in self.sections:
+            if not isinstance(section.get('name'), str) or not section['name']:
+                raise BlueprintError(f"Every section needs a name, got {section!r}")
+            count, marks = section.get('questions'), section.get('marks')
+            if not isinstance(count, int) or not isinstance(marks, int) or count <= 0:
+                raise BlueprintError(f"Section {section['name']!r} needs integer questions and marks")
+            if not count <= marks <= 2 * count:
+                raise BlueprintError(f"{section['name']}: {marks} marks cannot come from "
+                                     f"{count} one- and two-mark questions")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Blueprint from request JSON; missing keys keep the GATE defaults"""
+        data = data or {}
+        if not isinstance(data, dict):
+            raise BlueprintError("Blueprint must be an object")
+        return cls(
+            sections=data.get('sections') or GATE_SECTIONS,
+            weightage=data.get('weightage'),
+            difficulty=data.get('difficulty'),
+            question_types=data.get('questionTypes'),
+        )
+
+    def to_dict(self):
+        return {
+            'sections': self.sections,
+            'weightage': self.weightage,
+            'difficulty': self.difficulty,
+            'questionTypes': self.question_types,
+        }
+
+    @property
+    def total_questions(self):
+        return sum(section['questions'] for section in self.sections)
+
+    @property
+    def total_marks(self):
+        return sum(section['marks'] for section in self.sections)
+
+
+def _targets(weights, values, count):
+    """Target count per value: `weights` restricted to `values`, even split if none are weighted"""
+    raw = np.array([max(weights.get(value, 0), 0) for value in values], dtype=np.float64)
+    if raw.sum() == 0:
+        raw[:] = 1
+    return raw / raw.sum() * count
+
+
+class PaperAssembler:
+    """Bucketed bank plus a solved plan for one blueprint"""
+
+    def __init__(self, questions, blueprint=None):
+        self.questions = list(questions)
+        self.blueprint = blueprint or Blueprint()
+        self.marks = np.array([q.get('marks') or 0 for q in self.questions], dtype=np.int64)
+        self.cells = []             # (section, marks, subject, difficulty, type, positions, count)
+        self._plan()
+        self._build_layout()
+
+    def _buckets(self, section_name):
+        buckets = {}
+        for position, question in enumerate(self.questions):
+            if question.get('section') != section_name:
+                continue
+            key = (question.get('marks'), question_subject(question), question.get('difficulty'),
+                   question.get('questionType') or DEFAULT_QUESTION_TYPE)
+            buckets.setdefault(key, []).append(position)
+        return buckets
+
+    def _plan(self):
+        blueprint = self.blueprint
+        for section in blueprint.sections:
+            name, count = section['name'], section['questions']
+            two_mark = section['marks'] - count
+            needed = {1: count - two_mark, 2: two_mark}
+            buckets = self._buckets(name)
+            for marks, n in needed.items():
+                have = sum(len(p) for key, p in buckets.items() if key[0] == marks)
+                if have < n:
+                    raise BlueprintError(f"{name} needs {n} {marks}-mark questions, the bank has {have}")
+
+            keys = sorted(buckets, key=lambda key: tuple(str(part) for part in key))
+            # Each bucket's subject, difficulty and type as an index into that dimension's targets
+            dimensions = []
+            for axis, weights in ((1, blueprint.weightage), (2, blueprint.difficulty), (3, blueprint.question_types)):
+                values = sorted({key[axis] for key in keys}, key=str)
+                target = _targets(weights, values, count)
+                index = np.array([values.index(key[axis]) for key in keys], dtype=np.int64)
+                dimensions.append((target, index))
+
+            capacity = np.array([len(buckets[key]) for key in keys], dtype=np.int64)
+            marks_of = np.array([key[0] for key in keys])
+            taken = np.zeros(len(keys), dtype=np.int64)
+            filled = [np.zeros(len(target)) for target, _ in dimensions]
+            remaining = dict(needed)
+            for _ in range(count):
+                open_marks = np.array([remaining.get(m, 0) > 0 for m in marks_of])
+                # Deficit of the bucket's subject + difficulty + type; spare capacity breaks ties
+                score = sum((target - done)[index] for (target, index), done in zip(dimensions, filled))
+                score = score + 1e-3 * (capacity - taken) / capacity
+                score[(taken >= capacity) | ~open_marks] = -np.inf
+                best = int(np.argmax(score))
+                taken[best] += 1
+                remaining[int(marks_of[best])] -= 1
+                for (target, index), done in zip(dimensions, filled):
+                    done[index[best]] += 1
+
+            for key, n in zip(keys, taken.tolist()):
+                if n:
+                    self.cells.append((name, *key, np.array(buckets[key], dtype=np.int64), n))
+
+    def _build_layout(self):
+        """Column ranges of each cell and each (section, marks) block in a paper row"""
+        self.width = sum(cell[-1] for cell in self.cells)
+        order = sorted(range(len(self.cells)), key=lambda i: (
+            [s['name'] for s in self.blueprint.sections].index(self.cells[i][0]), self.cells[i][1]))
+        self.cells = [self.cells[i] for i in order]
+        blocks, start = [], 0
+        self.block_of_column = np.empty(self.width, dtype=np.int64)
+        for cell in self.cells:
+            block = (cell[0], cell[1])
+            if not blocks or blocks[-1] != block:
+                blocks.append(block)
+            self.block_of_column[start:start + cell[-1]] = len(blocks) - 1
+            start += cell[-1]
+        self.blocks = blocks
+
+    def composition(self):
+        """Planned questions per section by subject, difficulty, type and marks"""
+        result = {}
+        for section, marks, subject, difficulty, question_type, _, n in self.cells:
+            entry = result.setdefault(section, {'subjects': {}, 'difficulty': {}, 'questionTypes': {},
+                                                'questions': 0, 'marks': 0})
+            for field, value in (('subjects', subject), ('difficulty', difficulty),
+                                 ('questionTypes', question_type)):
+                entry[field][value] = entry[field].get(value, 0) + n
+            entry['questions'] += n
+            entry['marks'] += n * marks
+        return result
+
+    def sample_positions(self, count, rng=None):
+        """
+        (count, paper width) matrix of bank positions, one paper per row,
+        sections in blueprint order with one-mark questions first; questions
+        are shuffled within each (section, marks) block.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        columns = []
+        for *_, positions, k in self.cells:
+            size = len(positions)
+            if k == size:
+                picks = np.broadcast_to(np.arange(size), (count, size))
+            elif size <= DENSE_SAMPLING_RATIO * k:
+                picks = np.argpartition(rng.random((count, size)), k - 1, axis=1)[:, :k]
+            else:
+                picks = rng.integers(0, size, (count, k))
+                if k > 1:
+                    ordered = np.sort(picks, axis=1)
+                    for row in np.flatnonzero((np.diff(ordered, axis=1) == 0).any(axis=1)):
+                        picks[row] = rng.choice(size, k, replace=False)
+            columns.append(positions[picks])
+        papers = np.concatenate(columns, axis=1)
+        shuffle = np.argsort(self.block_of_column + rng.random((count, self.width)), axis=1)
+        return np.take_along_axis(papers, shuffle, axis=1)
+
+    def check(self, papers):
+        """Rows of a position matrix that meet every section count and marks total with no repeats"""
+        papers = np.atleast_2d(papers)
+        ok = (np.diff(np.sort(papers, axis=1), axis=1) != 0).all(axis=1)
+        marks = self.marks[papers]
+        sections = [cell[0] for cell in self.cells for _ in range(cell[-1])]
+        for section in self.blueprint.sections:
+            columns = [i for i, name in enumerate(sections) if name == section['name']]
+            ok &= len(columns) == section['questions']
+            ok &= marks[:, columns].sum(axis=1) == section['marks']
+        return ok
+
+    def paper(self, positions):
+        """Paper document for one row of positions"""
+        questions = [self.questions[p] for p in positions]
+        sections = []
+        for section in self.blueprint.sections:
+            members = [q for q in questions if q.get('section') == section['name']]
+            sections.append({'name': section['name'], 'questions': len(members),
+                             'marks': sum(q.get('marks') or 0 for q in members)})
+        return {
+            'questions': questions,
+            'sections': sections,
+            'totalQuestions': len(questions),
+            'totalMarks': sum(s['marks'] for s in sections),
+        }
+
+    def assemble_many(self, count, rng=None):
+        return [self.paper(row) for row in self.sample_positions(count, rng).tolist()]
+
+    def assemble(self, rng=None):
+        return self.assemble_many(1, rng)[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Assemble GATE mock papers from the question bank')
+    parser.add_argument('--blueprint', help='blueprint JSON file (default: the GATE CSE format)')
+    parser.add_argument('--count', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', help='write the papers here as JSON')
+    args = parser.parse_args(argv)
+
+    blueprint = None
+    if args.blueprint:
+        with open(args.blueprint, 'r', encoding='utf-8') as f:
+            blueprint = Blueprint.from_dict(json.load(f))
+    try:
+        assembler = PaperAssembler(load_bank(), blueprint)
+    except BlueprintError as e:
+        print(f"❌ {e}")
+        return None
+
+    print(f"📋 Plan: {assembler.width} questions, {assembler.blueprint.total_marks} marks")
+    for section, entry in assembler.composition().items():
+        print(f"   {section}: {entry['questions']} questions, {entry['marks']} marks")
+        for field in ('subjects', 'difficulty', 'questionTypes'):
+            print(f"      {field}: {entry[field]}")
+
+    papers = assembler.assemble_many(args.count, np.random.default_rng(args.seed))
+    print(f"✅ Assembled {len(papers)} paper(s)")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(papers, f, indent=2, ensure_ascii=False)
+        print(f"💾 Papers saved to: {args.output}")
+    return papers
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,253 @@
+"""
+Pools of pre-assembled mock papers, refilled in the background.
+
+Each profile (a blueprint, usually the GATE one with a named difficulty mix)
+has its own PaperAssembler and a deque of finished paper documents. Handing
+out a paper is a `popleft`, so a burst of users starting a mock test at the
+same minute costs no assembly on the request path. A daemon thread tops a
+pool back up to `target` in batches once it drops below `low_watermark`. A
+pop from an empty pool falls back to assembling one paper on the spot and is
+counted as a miss.
+
+Custom blueprints posted by clients get smaller pools (`custom_target`), at
+most `max_custom` of them. One unused for `custom_idle` seconds is evicted, so
+it stops being refilled. When every slot is busy, a new blueprint is
+assembled per request until one frees up.
+
+    pool = PaperPool(questions)
+    pool.start()
+    paper = pool.get('balanced')
+    pool.metrics()          # depth, served, misses, refill rate per profile
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from utils.paper_assembler import Blueprint, PaperAssembler
+from utils.syllabus import DIFFICULTY_PROFILES
+
+DEFAULT_TARGET = 200
+DEFAULT_LOW_WATERMARK = 50
+REFILL_BATCH = 50
+CUSTOM_TARGET = 20
+CUSTOM_LOW_WATERMARK = 5
+# Custom blueprints get pools of their own up to this many profiles; beyond it they are assembled per request
+MAX_CUSTOM_PROFILES = 16
+CUSTOM_IDLE_SECONDS = 600.0
+IDLE_WAIT = 5.0
+
+
+def blueprint_key(blueprint):
+    """Profile name for a custom blueprint: a short hash of its canonical JSON"""
+    encoded = json.dumps(blueprint.to_dict(), sort_keys=True, separators=(',', ':'))
+    return 'custom-' + hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:12]
+
+
+class PoolStats:
+    """Counters for one profile"""
+
+    def __init__(self):
+        self.served = 0
+        self.misses = 0
+        self.refilled = 0
+        self.refill_seconds = 0.0
+        self.last_refill = None
+
+    def to_dict(self, depth):
+        return {
+            'depth': depth,
+            'served': self.served,
+            'misses': self.misses,
+            'missRate': round(self.misses / self.served, 4) if self.served else 0.0,
+            'refilled': self.refilled,
+            'refillRate': round(self.refilled / self.refill_seconds, 1) if self.refill_seconds else None,
+            'lastRefill': self.last_refill,
+        }
+
+
+class PaperPool:
+    """Per-profile deques of ready papers with a background refill worker"""
+
+    def __init__(self, questions, profiles=None, target=DEFAULT_TARGET,
+                 low_watermark=DEFAULT_LOW_WATERMARK, batch=REFILL_BATCH, custom_target=CUSTOM_TARGET,
+                 custom_low_watermark=CUSTOM_LOW_WATERMARK, max_custom=MAX_CUSTOM_PROFILES,
+                 custom_idle=CUSTOM_IDLE_SECONDS):
+        if not (0 <= low_watermark < target and 0 <= custom_low_watermark < custom_target):
+            raise ValueError("Pool low watermark must be below its target")
+        self.questions = list(questions)
+        self.target = target
+        self.low_watermark = low_watermark
+        self.batch = batch
+        self.custom_target = custom_target
+        self.custom_low_watermark = custom_low_watermark
+        self.max_custom = max_custom
+        self.custom_idle = custom_idle
+        self.assemblers = {}
+        self.papers = {}
+        self.stats = {}
+        # (target, low watermark) per profile
+        self.limits = {}
+        # Custom profile -> last use (time.monotonic()), least recently used first
+        self.custom = OrderedDict()
+        self.evicted = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker = None
+        if profiles is None:
+            profiles = {name: Blueprint(difficulty=mix) for name, mix in DIFFICULTY_PROFILES.items()}
+        for name, blueprint in profiles.items():
+            self.add_profile(name, blueprint)
+
+    def add_profile(self, name, blueprint, target=None, low_watermark=None):
+        """Plan a blueprint (raises BlueprintError if the bank cannot meet it) and give it a pool"""
+        assembler = PaperAssembler(self.questions, blueprint)
+        with self._lock:
+            self.assemblers[name] = assembler
+            self.papers.setdefault(name, deque())
+            self.stats.setdefault(name, PoolStats())
+            self.limits[name] = (self.target if target is None else target,
+                                 self.low_watermark if low_watermark is None else low_watermark)
+        self._wake.set()
+        return name
+
+    def profile_for(self, blueprint):
+        """Profile name for a custom blueprint, adding a pool for it while there is room; None when full"""
+        name = blueprint_key(blueprint)
+        with self._lock:
+            if name in self.custom:
+                self._touch(name)
+                return name
+        if name in self.assemblers:
+            return name
+        self.evict_idle()
+        with self._lock:
+            if len(self.custom) >= self.max_custom:
+                return None
+            self._touch(name)
+        try:
+            return self.add_profile(name, blueprint, self.custom_target, self.custom_low_watermark)
+        except Exception:
+            with self._lock:
+                self.custom.pop(name, None)
+            raise
+
+    def _touch(self, name):
+        """Mark a custom profile as just used (callers hold the lock)"""
+        self.custom[name] = time.monotonic()
+        self.custom.move_to_end(name)
+
+    def evict_idle(self, idle=None):
+        """Drop custom profiles unused for `idle` seconds (default `custom_idle`); returns their names"""
+        cutoff = time.monotonic() - (self.custom_idle if idle is None else idle)
+        evicted = []
+        with self._lock:
+            # Least recently used first, so stop at the first profile still in use
+            while self.custom:
+                name, last_used = next(iter(self.custom.items()))
+                if last_used > cutoff:
+                    break
+                del self.custom[name]
+                for table in (self.assemblers, self.papers, self.stats, self.limits):
+                    table.pop(name, None)
+                evicted.append(name)
+            self.evicted += len(evicted)
+        return evicted
+
+    def get(self, name, rng=None):
+        """A ready paper for profile `name`, or one assembled now if the pool is empty"""
+        if name not in self.assemblers:
+            raise KeyError(f"Unknown paper profile: {name}")
+        with self._lock:
+            papers, assembler, stats = self.papers[name], self.assemblers[name], self.stats[name]
+            _, low_watermark = self.limits[name]
+            if name in self.custom:
+                self._touch(name)
+        try:
+            paper = papers.popleft()
+            miss = False
+        except IndexError:
+            paper = assembler.assemble(rng)
+            miss = True
+        with self._lock:
+            stats.served += 1
+            stats.misses += miss
+        if len(papers) < low_watermark:
+            self._wake.set()
+        return paper
+
+    def assemble(self, blueprint, rng=None):
+        """One paper for a blueprint with no pool (the fallback while every custom slot is in use)"""
+        return PaperAssembler(self.questions, blueprint).assemble(rng)
+
+    def refill(self, name, rng=None):
+        """Top one profile's pool up to its target; returns how many papers were added"""
+        with self._lock:
+            if name not in self.assemblers:
+                return 0
+            papers, assembler, stats = self.papers[name], self.assemblers[name], self.stats[name]
+            target, _ = self.limits[name]
+        added = 0
+        # Stops early if the profile is evicted meanwhile
+        while len(papers) < target and not self._stop.is_set() and self.papers.get(name) is papers:
+            started = time.perf_counter()
+            batch = assembler.assemble_many(min(self.batch, target - len(papers)), rng)
+            papers.extend(batch)
+            with self._lock:
+                stats.refilled += len(batch)
+                stats.refill_seconds += time.perf_counter() - started
+                stats.last_refill = time.strftime('%Y-%m-%dT%H:%M:%S')
+            added += len(batch)
+        return added
+
+    def fill(self, rng=None):
+        """Fill every pool to `target` on the calling thread (warm-up)"""
+        return sum(self.refill(name, rng) for name in list(self.assemblers))
+
+    def _run(self):
+        rng = np.random.default_rng()
+        while not self._stop.is_set():
+            self._wake.wait(IDLE_WAIT)
+            self._wake.clear()
+            self.evict_idle()
+            with self._lock:
+                due = [name for name, (_, low_watermark) in self.limits.items()
+                       if len(self.papers[name]) < low_watermark]
+            for name in due:
+                self.refill(name, rng)
+
+    def start(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name='paper-pool-refill', daemon=True)
+            self._worker.start()
+            self._wake.set()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def metrics(self):
+        with self._lock:
+            profiles = {name: self.stats[name].to_dict(len(self.papers[name])) for name in self.assemblers}
+        served = sum(entry['served'] for entry in profiles.values())
+        misses = sum(entry['misses'] for entry in profiles.values())
+        return {
+            'target': self.target,
+            'lowWatermark': self.low_watermark,
+            'workerAlive': self._worker is not None and self._worker.is_alive(),
+            'served': served,
+            'misses': misses,
+            'missRate': round(misses / served, 4) if served else 0.0,
+            'customProfiles': len(self.custom),
+            'customEvicted': self.evicted,
+            'profiles': profiles,
+        }
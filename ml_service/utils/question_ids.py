@@ -0,0 +1,161 @@
+"""
+Content-addressed question IDs.
+
+Generator scripts mint IDs independently (`Q001`, `Q0001`, `GATE2024_Q01`,
+`algo_201`, `gist_N`, ...), so the same question gets different IDs across
+banks and the same ID can mean different questions. `stable_id` derives an ID
+from a hash of the normalized text and option set instead, so it survives
+rebuilds, renumbering and re-imports. `AliasTable` maps every legacy ID (and
+`source:legacy` qualified forms) to the stable ID with O(1) lookups.
+
+    python -m utils.question_ids        # writes data/question_aliases.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import unicodedata
+
+from utils.near_duplicates import load_questions
+from utils.question_journal import write_json_atomic
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_ALIAS_PATH = os.path.join(DATA_DIR, 'question_aliases.json')
+LEGACY_BANKS = [
+    os.path.join(DATA_DIR, name)
+    for name in (
+        'gate_format_complete.json',
+        'comprehensive_300_questions.json',
+        'comprehensive_questions.json',
+        'gate_questions.json',
+        'gate_questions_complete.json',
+        'sample_questions.json',
+    )
+]
+
+ID_PREFIX = 'q'
+ID_HEX_DIGITS = 16
+
+
+def normalize_text(value):
+    """Unicode-normalized, case-folded, whitespace-collapsed text"""
+    text = str(value)
+    # NFKC leaves ASCII unchanged, and str.split() splits on exactly what \s matches
+    if not text.isascii():
+        text = unicodedata.normalize('NFKC', text)
+    return ' '.join(text.casefold().split())
+
+
+def content_key(question):
+    """Identity of a question: its text plus the set of options (order-insensitive)"""
+    options = sorted(normalize_text(option) for option in question.get('options', []))
+    return '\x1f'.join([normalize_text(question.get('text', '')), *options])
+
+
+def stable_id(question):
+    digest = hashlib.sha256(content_key(question).encode('utf-8')).hexdigest()
+    return f"{ID_PREFIX}{digest[:ID_HEX_DIGITS]}"
+
+
+def with_stable_id(question):
+    """The question with its `stableId` set (a copy if it had to be added)"""
+    if question.get('stableId'):
+        return question
+    return {**question, 'stableId': stable_id(question)}
+
+
+class AliasTable:
+    """Legacy ID -> stable ID, with O(1) resolution of any known alias"""
+
+    def __init__(self, aliases=None, ambiguous=()):
+        self.aliases = dict(aliases or {})
+        self.ambiguous = set(ambiguous)
+
+    def __len__(self):
+        return len(self.aliases)
+
+    def __contains__(self, alias):
+        return alias in self.aliases
+
+    def add(self, alias, target):
+        """
+        Point `alias` at `target`. A bare legacy ID already claimed by a
+        different question becomes ambiguous and stops resolving; its
+        source-qualified forms keep working.
+        """
+        if alias is None or alias in self.ambiguous:
+            return
+        current = self.aliases.get(alias)
+        if current is not None and current != target:
+            del self.aliases[alias]
+            self.ambiguous.add(alias)
+            return
+        self.aliases[alias] = target
+
+    def register(self, question, source=None):
+        """Record a question's stable ID and its legacy aliases; returns the stable ID"""
+        target = question.get('stableId') or stable_id(question)
+        self.aliases[target] = target
+        legacy = question.get('id')
+        if legacy is not None and legacy != target:
+            self.add(legacy, target)
+            if source:
+                self.add(f"{source}:{legacy}", target)
+        return target
+
+    def resolve(self, alias):
+        """Stable ID for a stable ID, legacy ID or `source:legacy` alias; None if unknown"""
+        return self.aliases.get(alias)
+
+    @classmethod
+    def from_banks(cls, banks):
+        """Alias table over {source name: questions}"""
+        table = cls()
+        for source, questions in banks.items():
+            for question in questions:
+                table.register(question, source)
+        return table
+
+    def to_dict(self):
+        return {"aliases": self.aliases, "ambiguous": sorted(self.ambiguous)}
+
+    def save(self, path=DEFAULT_ALIAS_PATH):
+        write_json_atomic(path, self.to_dict())
+
+    @classmethod
+    def load(cls, path=DEFAULT_ALIAS_PATH):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('aliases'), data.get('ambiguous', ()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the legacy -> stable question ID alias table')
+    parser.add_argument('banks', nargs='*', default=LEGACY_BANKS)
+    parser.add_argument('--output', default=DEFAULT_ALIAS_PATH)
+    args = parser.parse_args(argv)
+
+    banks = {}
+    for path in args.banks:
+        if not os.path.exists(path):
+            continue
+        try:
+            banks[os.path.splitext(os.path.basename(path))[0]] = load_questions(path)
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Skipping {os.path.basename(path)}: {e}")
+    table = AliasTable.from_banks(banks)
+    stable = sum(1 for alias, target in table.aliases.items() if alias == target)
+    print(f"🔑 {stable} distinct questions across {len(banks)} banks")
+    print(f"🔗 {len(table) - stable} aliases, {len(table.ambiguous)} ambiguous legacy IDs")
+
+    table.save(args.output)
+    print(f"💾 Alias table saved to: {args.output}")
+    return table
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
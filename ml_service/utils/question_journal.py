@@ -0,0 +1,291 @@
+"""
+Append-only journal for question bank changes.
+
+Inserts, updates and deletes are appended as JSON Lines records to numbered
+segment files, so saving a batch costs O(batch) instead of rewriting the whole
+bank. Compaction folds the journal into a snapshot (the `{questions, metadata}`
+document the Node loader reads) and drops the replayed segments. Readers get
+the current bank by replaying snapshot plus journal.
+"""
+
+import glob
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from utils.bank_metadata import MetadataAggregator
+from utils.bank_stream import iter_bank
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_JOURNAL_DIR = os.path.join(DATA_DIR, 'bank_journal')
+DEFAULT_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'gate_format_complete.json')
+
+OPS = ('insert', 'update', 'delete')
+
+
+def write_json_atomic(path, data, indent=2):
+    """Replace `path` with `data` without readers ever seeing a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class QuestionJournal:
+    """JSON Lines change journal over a JSON snapshot"""
+
+    def __init__(self, directory=DEFAULT_JOURNAL_DIR, snapshot_path=DEFAULT_SNAPSHOT_PATH,
+                 segment_size=1000):
+        self.directory = directory
+        self.snapshot_path = snapshot_path
+        self.segment_size = segment_size
+
+    def segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'segment-*.jsonl')))
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f'segment-{number:06d}.jsonl')
+
+    @staticmethod
+    def _segment_number(path):
+        return int(os.path.basename(path)[len('segment-'):-len('.jsonl')])
+
+    def _current_segment(self):
+        """
+        Last segment if it still has room, otherwise a fresh one. A torn
+        final line left by a crashed writer is truncated away first, so the
+        next op starts on a line of its own instead of being glued to it.
+        """
+        segments = self.segments()
+        if not segments:
+            return self._segment_path(1), 0
+        last = segments[-1]
+        with open(last, 'r+b') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+        lines = data.count(b'\n')
+        if lines < self.segment_size:
+            return last, lines
+        return self._segment_path(self._segment_number(last) + 1), 0
+
+    def append(self, ops):
+        """Durably append op records: {"op": ..., "id": ..., "question": {...}}"""
+        ops = list(ops)
+        if not ops:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        path, lines = self._current_segment()
+        f = open(path, 'a', encoding='utf-8')
+        try:
+            for op in ops:
+                if op['op'] not in OPS:
+                    raise ValueError(f"Unknown journal op: {op['op']}")
+                if lines >= self.segment_size:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    f.close()
+                    path = self._segment_path(self._segment_number(path) + 1)
+                    f = open(path, 'a', encoding='utf-8')
+                    lines = 0
+                f.write(json.dumps(op, ensure_ascii=False))
+                f.write('\n')
+                lines += 1
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        return len(ops)
+
+    def insert(self, questions):
+        return self.append({"op": "insert", "id": q['id'], "question": q} for q in questions)
+
+    def update(self, questions):
+        return self.append({"op": "update", "id": q['id'], "question": q} for q in questions)
+
+    def delete(self, question_ids):
+        return self.append({"op": "delete", "id": qid} for qid in question_ids)
+
+    def iter_ops(self):
+        for path in self.segments():
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    # A torn final line from a crashed writer is ignored
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+    def pending_ops(self):
+        total = 0
+        for path in self.segments():
+            with open(path, 'rb') as f:
+                total += sum(1 for _ in f)
+        return total
+
+    def load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return {"questions": [], "metadata": {}}
+        with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return {"questions": data, "metadata": {}}
+        return data
+
+    def replay(self, aggregator=None, snapshot=None):
+        """
+        Current bank as an id -> question dict in insertion order. A
+        `MetadataAggregator` describing the snapshot is kept in step with the ops.
+        """
+        if snapshot is None:
+            snapshot = self.load_snapshot()
+        bank = {q['id']: q for q in snapshot.get('questions', [])}
+        for op in self.iter_ops():
+            old = bank.get(op['id'])
+            if op['op'] == 'delete':
+                if old is not None:
+                    del bank[op['id']]
+                    if aggregator is not None:
+                        aggregator.remove(old)
+            else:
+                # Updates carry the full record; an update of an unknown id inserts it
+                bank[op['id']] = op['question']
+                if aggregator is not None:
+                    aggregator.replace(old, op['question'])
+        return bank
+
+    def iter_questions(self):
+        """
+        Stream the current bank in `replay` order without loading the snapshot
+        whole: pending ops are folded first (bounded by compaction), then the
+        snapshot is read one question at a time with those changes applied.
+        """
+        changed, deleted, appended, seq = {}, set(), {}, 0
+        for op in self.iter_ops():
+            qid = op['id']
+            if op['op'] == 'delete':
+                changed.pop(qid, None)
+                appended.pop(qid, None)
+                deleted.add(qid)
+            elif qid in deleted or qid in appended:
+                # Re-inserted after a delete: it moves to the end of the bank
+                appended[qid] = (appended.get(qid, (seq,))[0], op['question'])
+            else:
+                changed[qid] = (changed.get(qid, (seq,))[0], op['question'])
+            seq += 1
+
+        if os.path.exists(self.snapshot_path):
+            for q in iter_bank(self.snapshot_path):
+                if q['id'] in deleted:
+                    continue
+                latest = changed.pop(q['id'], None)
+                yield latest[1] if latest else q
+
+        # Whatever is left was never in the snapshot, so it follows in op order
+        for _, question in sorted([*changed.values(), *appended.values()], key=lambda entry: entry[0]):
+            yield question
+
+    def questions(self):
+        return list(self.iter_questions())
+
+    def reset(self):
+        """Drop all segments (after their contents are in the snapshot)"""
+        for path in self.segments():
+            os.remove(path)
+
+    def compact(self, metadata=None):
+        """Fold the journal into a new snapshot and remove the segments"""
+        snapshot = self.load_snapshot()
+        aggregator = MetadataAggregator.from_metadata(snapshot.get('metadata'))
+        if aggregator is None:
+            aggregator = MetadataAggregator.from_questions(snapshot.get('questions', []))
+        questions = list(self.replay(aggregator, snapshot).values())
+        snapshot = {
+            "questions": questions,
+            "metadata": {
+                **aggregator.to_dict(),
+                "lastUpdated": datetime.now().isoformat(),
+                **(metadata or {}),
+            },
+        }
+        write_json_atomic(self.snapshot_path, snapshot)
+        self.reset()
+        return snapshot
+
+
+class JournalTail:
+    """
+    Follows a journal, returning the ops appended since the last poll. Ops
+    folded away by a compaction cannot be read back, so when the snapshot is
+    replaced or the segments are reset `poll` returns None and the reader
+    reloads the bank instead.
+    """
+
+    def __init__(self, journal):
+        self.journal = journal
+        self._snapshot = self._snapshot_stamp()
+        self.segment, self.offset = self._end()
+
+    def _snapshot_stamp(self):
+        try:
+            stat = os.stat(self.journal.snapshot_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _end(self):
+        """(segment number, offset) just past the last complete op"""
+        segments = self.journal.segments()
+        if not segments:
+            return 0, 0
+        with open(segments[-1], 'rb') as f:
+            data = f.read()
+        return QuestionJournal._segment_number(segments[-1]), data.rfind(b'\n') + 1
+
+    def poll(self):
+        """Ops appended since the last poll, or None if the journal was compacted"""
+        stamp = self._snapshot_stamp()
+        segments = self.journal.segments()
+        current = self.journal._segment_path(self.segment)
+        if stamp != self._snapshot or (self.segment and (
+                current not in segments or os.path.getsize(current) < self.offset)):
+            self._snapshot = stamp
+            self.segment, self.offset = self._end()
+            return None
+
+        ops = []
+        for path in segments:
+            number = QuestionJournal._segment_number(path)
+            if number < self.segment:
+                continue
+            offset = self.offset if number == self.segment else 0
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            # A line still being written in the last segment is read on a later poll
+            end = data.rfind(b'\n') + 1 if path == segments[-1] else len(data)
+            for line in data[:end].splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    ops.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+            self.segment, self.offset = number, offset + end
+        return ops
+
+
+def load_bank(journal_dir=DEFAULT_JOURNAL_DIR, snapshot_path=DEFAULT_SNAPSHOT_PATH):
+    """Current question list, replaying any journal written since the last snapshot"""
+    return QuestionJournal(journal_dir, snapshot_path).questions()
@@ -0,0 +1,407 @@
+"""
+Canonical GATE question store.
+
+Questions live in an embedded SQLite database with indexed columns for the
+fields the generators and the test builder filter on. Writers insert in
+transactional batches instead of rewriting the whole JSON bank. Every write is
+also appended to the question journal, and `compact` folds the journal into
+the `{questions, metadata}` snapshot the Node `inMemoryDb.js` loader reads.
+A bank build replaces the contents with `rebase`, which keeps the changes
+written since the previous build.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from utils.bank_metadata import MetadataAggregator
+from utils.bank_stream import batched, iter_bank
+from utils.near_duplicates import MergeReport
+from utils.question_ids import with_stable_id
+from utils.question_journal import QuestionJournal, write_json_atomic
+from utils.question_validator import require_valid
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'question_bank.db')
+
+# Journal ops allowed to accumulate before `compact_if_needed` rewrites the snapshot
+COMPACT_THRESHOLD = 5000
+SEED_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL,
+    section TEXT,
+    subject TEXT,
+    topic TEXT,
+    difficulty TEXT,
+    year INTEGER,
+    marks INTEGER,
+    question_type TEXT,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_questions_text ON questions(text);
+CREATE INDEX IF NOT EXISTS idx_questions_section ON questions(section);
+CREATE INDEX IF NOT EXISTS idx_questions_subject ON questions(subject);
+CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty);
+CREATE INDEX IF NOT EXISTS idx_questions_year ON questions(year);
+CREATE TABLE IF NOT EXISTS bank_metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_aliases (
+    alias TEXT PRIMARY KEY,
+    question_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS build_base (
+    id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+"""
+
+ALIAS_SQL = "INSERT OR IGNORE INTO question_aliases (alias, question_id) VALUES (?, ?)"
+BASE_SQL = "INSERT OR REPLACE INTO build_base (id, digest) VALUES (?, ?)"
+
+UPSERT_SQL = """
+INSERT INTO questions (id, text, section, subject, topic, difficulty, year, marks, question_type, body)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    text = excluded.text,
+    section = excluded.section,
+    subject = excluded.subject,
+    topic = excluded.topic,
+    difficulty = excluded.difficulty,
+    year = excluded.year,
+    marks = excluded.marks,
+    question_type = excluded.question_type,
+    body = excluded.body
+"""
+
+INSERT_SQL = """
+INSERT OR IGNORE INTO questions (id, text, section, subject, topic, difficulty, year, marks, question_type, body)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _alias_rows(questions):
+    """Alias rows pointing a question's own id and its stable id at its row"""
+    rows = []
+    for q in questions:
+        rows.append((q['id'], q['id']))
+        rows.append((q['stableId'], q['id']))
+    return rows
+
+
+def question_digest(question):
+    """Hash of a question record, independent of key order"""
+    encoded = json.dumps(question, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _row(question):
+    return (
+        question['id'],
+        question.get('text', ''),
+        question.get('section', 'Core Computer Science'),
+        question.get('subject'),
+        question.get('topic'),
+        question.get('difficulty'),
+        question.get('year'),
+        question.get('marks', 1),
+        question.get('questionType', 'MCQ'),
+        json.dumps(question, ensure_ascii=False),
+    )
+
+
+class QuestionStore:
+    """Indexed, transactional question bank backed by SQLite"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, journal=None, merge_report=None):
+        self.db_path = db_path
+        self.journal = journal or QuestionJournal()
+        # The near-duplicate report is advisory; it is only read if an insert asks to skip its pairs
+        self.merge_report = merge_report
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+        # First open migrates the existing snapshot (plus any journal) into the
+        # store, streamed in batches so the bank is never held in memory whole
+        if self.count() == 0:
+            with self.transaction() as conn:
+                aggregator = MetadataAggregator()
+                for batch in batched(self.journal.iter_questions(), SEED_BATCH_SIZE):
+                    batch = [with_stable_id(q) for q in batch]
+                    conn.executemany(INSERT_SQL, [_row(q) for q in batch])
+                    conn.executemany(ALIAS_SQL, _alias_rows(batch))
+                    aggregator.add_many(batch)
+                if aggregator.total_questions:
+                    self._write_aggregate(aggregator)
+                self._seed_base()
+        else:
+            if self.conn.execute('SELECT 1 FROM question_aliases LIMIT 1').fetchone() is None:
+                self._backfill_aliases()
+            # Stores created before builds were tracked
+            if self.conn.execute('SELECT 1 FROM build_base LIMIT 1').fetchone() is None:
+                with self.transaction():
+                    self._seed_base()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Run a block under a write lock, committing or rolling back as a unit"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+
+    def _seed_base(self):
+        """
+        Take the snapshot as the last build's output, so journal ops and store
+        writes made since count as local changes (see `local_changes`)
+        """
+        if not os.path.exists(self.journal.snapshot_path):
+            return
+        for batch in batched(iter_bank(self.journal.snapshot_path), SEED_BATCH_SIZE):
+            self.conn.executemany(BASE_SQL, [(q['id'], question_digest(with_stable_id(q))) for q in batch])
+
+    def _backfill_aliases(self):
+        """Give stores created before stable IDs their stableId fields and aliases"""
+        with self.transaction() as conn:
+            for batch in batched(self.iter_questions(), SEED_BATCH_SIZE):
+                batch = [with_stable_id(q) for q in batch]
+                conn.executemany(
+                    'UPDATE questions SET body = ? WHERE id = ?',
+                    [(json.dumps(q, ensure_ascii=False), q['id']) for q in batch]
+                )
+                conn.executemany(ALIAS_SQL, _alias_rows(batch))
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM questions').fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def has_id(self, question_id):
+        return self.conn.execute(
+            'SELECT 1 FROM questions WHERE id = ?', (question_id,)
+        ).fetchone() is not None
+
+    def has_text(self, text):
+        return self.conn.execute(
+            'SELECT 1 FROM questions WHERE text = ?', (text,)
+        ).fetchone() is not None
+
+    def resolve(self, alias):
+        """Store id of the question known by `alias` (its id, stable id or a recorded legacy id)"""
+        row = self.conn.execute(
+            'SELECT question_id FROM question_aliases WHERE alias = ?', (alias,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def has_stable_id(self, stable_id):
+        return self.resolve(stable_id) is not None
+
+    def add_alias(self, alias, question_id):
+        """Record another name (e.g. a legacy id from an older bank) for a stored question"""
+        self.conn.execute(ALIAS_SQL, (alias, question_id))
+
+    def get(self, question_id):
+        """Question by id, stable id or any recorded alias"""
+        row = self.conn.execute(
+            'SELECT body FROM questions WHERE id = ?', (self.resolve(question_id) or question_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def iter_questions(self):
+        """Yield questions in insertion order"""
+        for (body,) in self.conn.execute('SELECT body FROM questions ORDER BY seq'):
+            yield json.loads(body)
+
+    def all_questions(self):
+        return list(self.iter_questions())
+
+    def _bodies(self, question_ids):
+        """Current records for `question_ids`, as an id -> question dict"""
+        found = {}
+        question_ids = list(question_ids)
+        for start in range(0, len(question_ids), 500):
+            chunk = question_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            for qid, body in self.conn.execute(
+                f'SELECT id, body FROM questions WHERE id IN ({placeholders})', chunk
+            ):
+                found[qid] = json.loads(body)
+        return found
+
+    def _read_aggregate(self):
+        row = self.conn.execute(
+            "SELECT value FROM bank_metadata WHERE key = 'aggregate'"
+        ).fetchone()
+        aggregator = MetadataAggregator.from_metadata(json.loads(row[0])) if row else None
+        # Stores created before metadata was tracked get one backfill pass
+        return aggregator or MetadataAggregator.from_questions(self.iter_questions())
+
+    def _write_aggregate(self, aggregator):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO bank_metadata (key, value) VALUES ('aggregate', ?)",
+            (json.dumps(aggregator.to_dict(), ensure_ascii=False),)
+        )
+
+    def _has_near_duplicate(self, question_id):
+        """True if the merge report lists a near-duplicate already in the store"""
+        if self.merge_report is None:
+            self.merge_report = MergeReport.load()
+        return any(self.has_id(other) for other in self.merge_report.duplicates_of(question_id))
+
+    def add_questions(self, questions, dedup_on='id', skip_near_duplicates=False):
+        """
+        Insert questions not already present, in one transaction.
+        `dedup_on` is 'id' or 'text'; questions whose content (stable id) is
+        already stored are skipped too. With `skip_near_duplicates`, so are
+        questions the near-duplicate merge report pairs with one already
+        stored (the report is advisory, so this is opt-in). Returns the
+        questions actually inserted, with their `stableId` set. Raises
+        QuestionValidationError, writing nothing, if any question is invalid.
+        """
+        questions = require_valid(questions)
+        inserted = []
+        seen = set()
+        with self.transaction() as conn:
+            # Read before inserting: a store without a saved aggregate backfills it from its rows
+            aggregator = self._read_aggregate()
+            for q in questions:
+                q = with_stable_id(q)
+                key = q.get(dedup_on)
+                if key in seen or q['stableId'] in seen:
+                    continue
+                seen.update((key, q['stableId']))
+                if dedup_on == 'text' and self.has_text(key):
+                    continue
+                if self.has_stable_id(q['stableId']):
+                    continue
+                if skip_near_duplicates and self._has_near_duplicate(q['id']):
+                    continue
+                cursor = conn.execute(INSERT_SQL, _row(q))
+                if cursor.rowcount:
+                    inserted.append(q)
+            conn.executemany(ALIAS_SQL, _alias_rows(inserted))
+            self._write_aggregate(aggregator.add_many(inserted))
+            self.journal.insert(inserted)
+        return inserted
+
+    def upsert_questions(self, questions):
+        """Insert or replace questions by id, in one transaction (validated first)"""
+        questions = [with_stable_id(q) for q in require_valid(questions)]
+        with self.transaction() as conn:
+            aggregator = self._read_aggregate()
+            current = self._bodies(q['id'] for q in questions)
+            for q in questions:
+                aggregator.replace(current.get(q['id']), q)
+                current[q['id']] = q
+            conn.executemany(UPSERT_SQL, [_row(q) for q in questions])
+            conn.executemany(ALIAS_SQL, _alias_rows(questions))
+            self._write_aggregate(aggregator)
+            self.journal.update(questions)
+        return len(questions)
+
+    def delete_questions(self, question_ids):
+        question_ids = list(question_ids)
+        with self.transaction() as conn:
+            aggregator = self._read_aggregate()
+            for q in self._bodies(question_ids).values():
+                aggregator.remove(q)
+            cursor = conn.executemany(
+                'DELETE FROM questions WHERE id = ?', [(qid,) for qid in question_ids]
+            )
+            conn.executemany(
+                'DELETE FROM question_aliases WHERE question_id = ?', [(qid,) for qid in question_ids]
+            )
+            self._write_aggregate(aggregator)
+            self.journal.delete(question_ids)
+        return cursor.rowcount
+
+    def compute_metadata(self):
+        """Bank totals, maintained incrementally by every write"""
+        return self._read_aggregate().to_dict()
+
+    def export_json(self, path, metadata=None):
+        """
+        Write the bank as a `{questions, metadata}` document. Extra `metadata`
+        keys (sources, format, ...) are merged in.
+        """
+        data = {
+            "questions": self.all_questions(),
+            "metadata": {
+                **self.compute_metadata(),
+                "lastUpdated": datetime.now().isoformat(),
+                **(metadata or {}),
+            },
+        }
+        write_json_atomic(path, data)
+        return data
+
+    def local_changes(self):
+        """
+        What was written since the last build: questions whose id is new or
+        whose record differs from the one the build produced, and the ids of
+        build questions deleted since, as {"questions": [...], "deleted": [...]}
+        """
+        base = dict(self.conn.execute('SELECT id, digest FROM build_base'))
+        questions = [q for q in self.iter_questions() if base.pop(q['id'], None) != question_digest(q)]
+        return {"questions": questions, "deleted": sorted(base)}
+
+    def rebase(self, questions, changes=None, metadata=None):
+        """
+        Replace the store's contents with a fresh build, `questions`, and
+        publish it as the snapshot, resetting the journal. Local changes
+        (`changes` as exported by `local_changes`, then any still pending
+        here) are applied on top, so imports and hand edits outlive the build.
+        """
+        questions = [with_stable_id(q) for q in require_valid(questions)]
+        with self.transaction() as conn:
+            pending = [changes or {"questions": [], "deleted": []}, self.local_changes()]
+            conn.execute('DELETE FROM questions')
+            conn.execute('DELETE FROM build_base')
+            conn.executemany(INSERT_SQL, [_row(q) for q in questions])
+            conn.executemany(BASE_SQL, [(q['id'], question_digest(q)) for q in questions])
+            for local in pending:
+                conn.executemany(UPSERT_SQL, [_row(with_stable_id(q)) for q in local['questions']])
+                conn.executemany('DELETE FROM questions WHERE id = ?', [(qid,) for qid in local['deleted']])
+            # Recorded legacy aliases survive as long as their question does
+            conn.execute('DELETE FROM question_aliases WHERE question_id NOT IN (SELECT id FROM questions)')
+            for batch in batched(self.iter_questions(), SEED_BATCH_SIZE):
+                conn.executemany(ALIAS_SQL, _alias_rows(batch))
+            self._write_aggregate(MetadataAggregator.from_questions(self.iter_questions()))
+            data = self.export_json(self.journal.snapshot_path, metadata)
+            self.journal.reset()
+        return data
+
+    def compact(self, metadata=None):
+        """Rewrite the journal snapshot for the Node loader and drop the journal"""
+        with self.transaction():
+            data = self.export_json(self.journal.snapshot_path, metadata)
+            self.journal.reset()
+        return data
+
+    def compact_if_needed(self, metadata=None, threshold=COMPACT_THRESHOLD):
+        if self.journal.pending_ops() >= threshold:
+            return self.compact(metadata)
+        return None
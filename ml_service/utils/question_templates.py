@@ -0,0 +1,373 @@
+"""
+Parametric question templates.
+
+A template draws whole columns of parameters at once (one NumPy array per
+parameter), solves every instance with array arithmetic, builds MCQ options
+from vectorized distractor formulas, checks the instances, and only then
+renders text. Instances are deduplicated on their parameters, and question
+ids are derived from the parameters too, so the same question gets the same
+id under any seed. Output is deterministic for a given NumPy Generator.
+
+    rng = build_numpy_rng('question_templates')
+    questions = TEMPLATES['page_faults'].generate(1000, rng)
+"""
+
+from itertools import permutations
+
+import numpy as np
+
+MAX_ROUNDS = 8
+OVERSAMPLE = 1.25
+OPTION_COUNT = 4
+_SHUFFLES = np.array(list(permutations(range(OPTION_COUNT))))
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def ceil_log2(values):
+    """Exact ceil(log2(n)) for positive integer arrays"""
+    values = np.asarray(values, dtype=np.int64)
+    return np.where(values > 1, np.frexp((values - 1).astype(np.float64))[1], 0).astype(np.int64)
+
+
+def choose_options(answer, candidates, rng):
+    """
+    Options matrix for integer answers: the answer plus the first three
+    candidate distractors per row that are positive and differ from the
+    answer and from each other (answer+1, +2, +3 are appended as a
+    fallback), in a random order per row.
+    """
+    answer = np.asarray(answer, dtype=np.int64)
+    fallback = [answer + 1, answer + 2, answer + 3]
+    pool = np.column_stack([*candidates, *fallback]).astype(np.int64)
+    valid = (pool > 0) & (pool != answer[:, None])
+    for j in range(1, pool.shape[1]):
+        for i in range(j):
+            valid[:, j] &= pool[:, j] != pool[:, i]
+    rank = np.cumsum(valid, axis=1)
+    picked = [np.argmax(valid & (rank == k), axis=1) for k in range(1, OPTION_COUNT)]
+    options = np.column_stack([answer, np.take_along_axis(pool, np.column_stack(picked), axis=1)])
+    shuffle = _SHUFFLES[rng.integers(0, len(_SHUFFLES), len(answer))]
+    return np.take_along_axis(options, shuffle, axis=1)
+
+
+def check_options(answer, options):
+    """Rows whose options contain the answer exactly once and are all distinct"""
+    once = (options == answer[:, None]).sum(axis=1) == 1
+    ordered = np.sort(options, axis=1)
+    return once & (np.diff(ordered, axis=1) != 0).all(axis=1)
+
+
+class QuestionTemplate:
+    """Base class: subclasses define sample/key/solve/render (and distractors for MCQ)"""
+
+    name = None
+    subject = None
+    topic = None
+    section = 'Core Computer Science'
+    question_type = 'MCQ'
+
+    def sample(self, rng, n):
+        """Dict of parameter arrays for n random instances"""
+        raise NotImplementedError
+
+    def key(self, params):
+        """int64 per instance, equal only for identical questions (parameters packed into bits)"""
+        raise NotImplementedError
+
+    def solve(self, params):
+        raise NotImplementedError
+
+    def distractors(self, params, answer):
+        """List of candidate distractor arrays, most plausible first"""
+        raise NotImplementedError
+
+    def difficulty(self, params):
+        raise NotImplementedError
+
+    def render(self, params, answer):
+        """(texts, explanations, ids) lists"""
+        raise NotImplementedError
+
+    def marks(self, difficulty):
+        return np.where(difficulty == 'hard', 2, 1)
+
+    def unique_params(self, count, rng):
+        """Up to `count` instances with distinct keys, in draw order"""
+        batches, keys, total = [], [], 0
+        for _ in range(MAX_ROUNDS):
+            params = self.sample(rng, int((count - total) * OVERSAMPLE) + 16)
+            batches.append(params)
+            keys.append(self.key(params))
+            _, first = np.unique(np.concatenate(keys), return_index=True)
+            total = len(first)
+            if total >= count:
+                break
+        first = np.sort(first)[:count]
+        return {name: np.concatenate([b[name] for b in batches])[first] for name in batches[0]}
+
+    def generate(self, count, rng):
+        """`count` unique, checked question dicts (fewer if the space is smaller)"""
+        params = self.unique_params(count, rng)
+        answer = self.solve(params)
+        if self.question_type == 'NAT':
+            keep = answer >= 0
+            options = None
+        else:
+            options = choose_options(answer, self.distractors(params, answer), rng)
+            keep = check_options(answer, options)
+        if not keep.all():
+            raise TemplateError(f"{self.name}: {int((~keep).sum())} instances failed the answer checks")
+
+        difficulty = self.difficulty(params)
+        marks = self.marks(difficulty)
+        texts, explanations, ids = self.render(params, answer)
+        answers = answer.astype(str).tolist()
+        option_lists = options.astype(str).tolist() if options is not None else [[] for _ in answers]
+        return [
+            {
+                "id": qid,
+                "text": text,
+                "options": opts,
+                "correctAnswer": ans,
+                "explanation": explanation,
+                "topic": self.topic,
+                "subject": self.subject,
+                "section": self.section,
+                "difficulty": level,
+                "marks": mark,
+                "questionType": self.question_type,
+                "source": "Parametric Template",
+            }
+            for qid, text, opts, ans, explanation, level, mark in zip(
+                ids, texts, option_lists, answers, explanations, difficulty.tolist(), marks.tolist())
+        ]
+
+
+class MergeSortComparisons(QuestionTemplate):
+    """Worst-case comparisons of top-down merge sort, and of merging two sorted lists"""
+
+    name = 'merge_sort_comparisons'
+    subject = 'Algorithms'
+    topic = 'Sorting'
+
+    SORT, MERGE_WORST, MERGE_BEST = 0, 1, 2
+
+    def sample(self, rng, n):
+        return {
+            'kind': rng.integers(0, 3, n),
+            'n': rng.integers(5, 5000, n),
+            'm': rng.integers(2, 500, n),
+        }
+
+    def key(self, params):
+        sort = params['kind'] == self.SORT
+        # `m` is unused by the sort variant, so it must not split identical questions
+        return (params['kind'] << 32) | (params['n'] << 16) | np.where(sort, 0, params['m'])
+
+    def solve(self, params):
+        n, m, kind = params['n'], params['m'], params['kind']
+        lg = ceil_log2(n)
+        worst_sort = n * lg - (1 << lg) + 1
+        return np.select([kind == self.SORT, kind == self.MERGE_WORST],
+                         [worst_sort, m + n - 1], np.minimum(m, n))
+
+    def distractors(self, params, answer):
+        n, m, kind = params['n'], params['m'], params['kind']
+        lg = ceil_log2(n)
+        sort = kind == self.SORT
+        worst = kind == self.MERGE_WORST
+        return [
+            np.select([sort, worst], [n * lg, m + n], m + n - 1),
+            np.select([sort, worst], [n * lg - n + 1, np.maximum(m, n)], np.maximum(m, n)),
+            np.select([sort, worst], [(n - 1) * lg, np.minimum(m, n)], m + n),
+        ]
+
+    def difficulty(self, params):
+        return np.where(params['kind'] == self.SORT, 'hard',
+                        np.where(params['kind'] == self.MERGE_WORST, 'medium', 'easy'))
+
+    def render(self, params, answer):
+        texts, explanations, ids = [], [], []
+        for kind, n, m, ans in zip(params['kind'].tolist(), params['n'].tolist(),
+                                   params['m'].tolist(), answer.tolist()):
+            if kind == self.SORT:
+                texts.append(f"What is the maximum number of comparisons top-down merge sort "
+                             f"performs on an array of {n} elements?")
+                lg = max(n - 1, 0).bit_length()
+                explanations.append(f"W(n) = n*ceil(log2 n) - 2^ceil(log2 n) + 1 = "
+                                    f"{n}*{lg} - {1 << lg} + 1 = {ans}")
+                ids.append(f"TPL_MSORT_{n}")
+            elif kind == self.MERGE_WORST:
+                texts.append(f"Two sorted lists of {m} and {n} elements are merged into one sorted list. "
+                             f"What is the maximum number of comparisons needed?")
+                explanations.append(f"Each comparison outputs one element and the last element needs "
+                                    f"none, so at most m + n - 1 = {ans}")
+                ids.append(f"TPL_MERGEMAX_{m}_{n}")
+            else:
+                texts.append(f"Two sorted lists of {m} and {n} elements are merged into one sorted list. "
+                             f"What is the minimum number of comparisons needed?")
+                explanations.append(f"If the shorter list is exhausted first, min(m, n) = {ans} "
+                                    f"comparisons suffice")
+                ids.append(f"TPL_MERGEMIN_{m}_{n}")
+        return texts, explanations, ids
+
+
+class PageFaults(QuestionTemplate):
+    """Page faults for a reference string under FIFO, LRU or optimal replacement"""
+
+    name = 'page_faults'
+    subject = 'Operating Systems'
+    topic = 'Memory Management'
+    question_type = 'NAT'
+
+    POLICIES = ('FIFO', 'LRU', 'Optimal')
+    LENGTH = 12
+    PAGES = 7
+
+    def sample(self, rng, n):
+        return {
+            'policy': rng.integers(0, len(self.POLICIES), n),
+            'frames': rng.integers(3, 5, n),
+            'refs': rng.integers(0, self.PAGES, (n, self.LENGTH)),
+        }
+
+    def key(self, params):
+        key = (params['policy'] << 4) | params['frames']
+        for t in range(self.LENGTH):
+            key = (key << 3) | params['refs'][:, t]
+        return key
+
+    @staticmethod
+    def next_use(refs):
+        """Index of the next reference to the same page after each position (length if none)"""
+        n, length = refs.shape
+        rows = np.arange(n)
+        upcoming = np.full((n, refs.max() + 1), length)
+        result = np.empty_like(refs)
+        for t in range(length - 1, -1, -1):
+            result[:, t] = upcoming[rows, refs[:, t]]
+            upcoming[rows, refs[:, t]] = t
+        return result
+
+    def solve(self, params):
+        refs, frames, policy = params['refs'], params['frames'], params['policy']
+        n, length = refs.shape
+        slots = frames.max()
+        rows = np.arange(n)
+        pages = np.full((n, slots), -1)
+        # Per-slot priority: the slot with the lowest value is evicted.
+        # FIFO: load time, LRU: last use, Optimal: -(next use)
+        priority = np.full((n, slots), -np.inf)
+        # Slots beyond an instance's frame count are never used
+        priority[np.arange(slots)[None, :] >= frames[:, None]] = np.inf
+        nxt = self.next_use(refs)
+        faults = np.zeros(n, dtype=np.int64)
+        fifo, lru = policy == 0, policy == 1
+
+        for t in range(length):
+            page = refs[:, t]
+            present = pages == page[:, None]
+            hit = present.any(axis=1)
+            slot = np.where(hit, present.argmax(axis=1), priority.argmin(axis=1))
+            faults += ~hit
+            pages[rows, slot] = page
+            refreshed = ~hit | ~fifo
+            value = np.where(lru, t, np.where(fifo, t, -nxt[:, t]))
+            priority[rows[refreshed], slot[refreshed]] = value[refreshed]
+        return faults
+
+    def difficulty(self, params):
+        return np.where(params['policy'] == 0, 'medium', 'hard')
+
+    def marks(self, difficulty):
+        return np.full(len(difficulty), 2)
+
+    def digits(self, refs, separator):
+        """Each row of single-digit pages as one string, built as a byte matrix"""
+        n, length = refs.shape
+        step = len(separator) + 1
+        chars = np.empty((n, length * step - len(separator)), dtype=np.uint8)
+        for i, byte in enumerate(separator.encode('ascii')):
+            chars[:, 1 + i::step] = byte
+        chars[:, ::step] = refs + ord('0')
+        return np.ascontiguousarray(chars).view(f'S{chars.shape[1]}').ravel().astype(str).tolist()
+
+    def render(self, params, answer):
+        texts, explanations, ids = [], [], []
+        for policy, frames, sequence, pages, ans in zip(
+                params['policy'].tolist(), params['frames'].tolist(), self.digits(params['refs'], ', '),
+                self.digits(params['refs'], ''), answer.tolist()):
+            name = self.POLICIES[policy]
+            texts.append(f"A process has {frames} page frames, initially empty. How many page faults "
+                         f"occur with {name} page replacement for the reference string {sequence}?")
+            explanations.append(f"Simulating {name} replacement with {frames} frames over the "
+                                f"{self.LENGTH} references gives {ans} page faults")
+            ids.append(f"TPL_PF_{name}_{frames}_{pages}")
+        return texts, explanations, ids
+
+
+class SubnetHosts(QuestionTemplate):
+    """Usable hosts per subnet after dividing an address block into equal subnets"""
+
+    name = 'subnet_hosts'
+    subject = 'Computer Networks'
+    topic = 'IP Addressing'
+
+    def sample(self, rng, n):
+        return {
+            'address': rng.integers(1 << 24, 224 << 24, n, dtype=np.int64),
+            'prefix': rng.integers(16, 27, n),
+            'bits': rng.integers(1, 5, n),
+        }
+
+    def network(self, params):
+        mask = ((1 << 32) - 1) ^ ((1 << (32 - params['prefix'])) - 1)
+        return params['address'] & mask
+
+    def key(self, params):
+        return (self.network(params) << 8) | (params['prefix'] << 3) | params['bits']
+
+    def host_bits(self, params):
+        return 32 - params['prefix'] - params['bits']
+
+    def solve(self, params):
+        return (1 << self.host_bits(params)) - 2
+
+    def distractors(self, params, answer):
+        hosts = 1 << self.host_bits(params)
+        return [hosts, hosts - 1, 2 * hosts - 2, hosts // 2 - 2]
+
+    def difficulty(self, params):
+        return np.where(params['bits'] <= 2, 'easy', 'medium')
+
+    def render(self, params, answer):
+        texts, explanations, ids = [], [], []
+        network = self.network(params)
+        octets = [((network >> shift) & 255).tolist() for shift in (24, 16, 8, 0)]
+        for a, b, c, d, prefix, bits, ans in zip(*octets, params['prefix'].tolist(),
+                                                 params['bits'].tolist(), answer.tolist()):
+            block = f"{a}.{b}.{c}.{d}"
+            host_bits = 32 - prefix - bits
+            texts.append(f"The block {block}/{prefix} is divided into {1 << bits} equal-sized subnets. "
+                         f"How many usable host addresses does each subnet have?")
+            explanations.append(f"Borrowing {bits} bits leaves {host_bits} host bits: "
+                                f"2^{host_bits} - 2 = {ans} (network and broadcast excluded)")
+            ids.append(f"TPL_SUBNET_{block}_{prefix}_{bits}")
+        return texts, explanations, ids
+
+
+TEMPLATES = {
+    template.name: template
+    for template in (MergeSortComparisons(), PageFaults(), SubnetHosts())
+}
+
+
+def generate(count_per_template, rng, templates=None):
+    """Questions from every template (or the named ones), template by template"""
+    questions = []
+    for name in templates or TEMPLATES:
+        questions.extend(TEMPLATES[name].generate(count_per_template, rng))
+    return questions
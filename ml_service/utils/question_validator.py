@@ -0,0 +1,323 @@
+"""
+Bulk question validation over columns.
+
+Every rule runs once over whole columns instead of once per question.
+`validate_bank` reads the columns of a `CompactQuestionBank`: categorical
+rules (difficulty, questionType, topic) are evaluated on each field's small
+value table and broadcast through the code column, marks are checked on the
+int16 column, and `correctAnswer in options` is a single elementwise
+comparison between the flat options array and each question's answer
+repeated once per option. `validate_questions` (and `require_valid`, which
+every writer calls) pulls the same columns straight out of question dicts:
+the categorical rules run on the distinct combinations of those fields, so a
+valid batch costs a handful of list comprehensions. Only MSQ answer lists and
+NAT answers are checked per question.
+
+The allowed values mirror the Mongoose schema in `server/models/Question.js`.
+A missing `questionType` counts as MCQ, as `server/utils/inMemoryDb.js`
+assumes for the GATE-format bank.
+
+    report = validate_questions(questions)
+    if not report.ok:
+        print(report.summary())
+"""
+
+import re
+from operator import contains
+
+import numpy as np
+
+from utils.compact_bank import MISSING_CODE
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+QUESTION_TYPES = ('MCQ', 'MSQ', 'NAT')
+DEFAULT_QUESTION_TYPE = 'MCQ'
+VALID_MARKS = (1, 2)
+MIN_OPTIONS = 4
+CHOICE_TYPES = ('MCQ', 'MSQ')
+
+RULES = (
+    'missing_id',
+    'duplicate_id',
+    'missing_text',
+    'missing_topic',
+    'missing_answer',
+    'invalid_difficulty',
+    'invalid_question_type',
+    'invalid_marks',
+    'too_few_options',
+    'answer_not_in_options',
+    'invalid_nat_answer',
+)
+
+# A NAT answer is a number or a range, e.g. 42, "2.5", "2.5 to 2.6", "2.5:2.6"
+_NAT_RANGE = re.compile(r'^\s*(\S+)\s*(?:to|:)\s*(\S+)\s*$')
+
+
+def parse_nat_answer(value):
+    """(low, high) accepted range for a NAT answer, or None if it is not numeric"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value), float(value)
+    if not isinstance(value, str):
+        return None
+    match = _NAT_RANGE.match(value)
+    try:
+        if match:
+            low, high = float(match.group(1)), float(match.group(2))
+            return (low, high) if low <= high else None
+        return float(value), float(value)
+    except ValueError:
+        return None
+
+
+class QuestionValidationError(ValueError):
+    """Raised by `require_valid` when questions break a rule"""
+
+    def __init__(self, report):
+        super().__init__(report.summary())
+        self.report = report
+
+
+class ValidationReport:
+    """Violating positions per rule, with the question ids behind them"""
+
+    def __init__(self, ids, violations):
+        self._ids = ids
+        self.violations = violations
+        self.valid_mask = np.ones(len(ids), dtype=bool)
+        for positions in violations.values():
+            self.valid_mask[positions] = False
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def ok(self):
+        return not self.violations
+
+    @property
+    def invalid_count(self):
+        return len(self) - int(self.valid_mask.sum())
+
+    def ids(self, rule):
+        return [self._ids[p] for p in self.violations.get(rule, ())]
+
+    def invalid_ids(self):
+        return [self._ids[p] for p in np.flatnonzero(~self.valid_mask)]
+
+    def to_dict(self, limit=None):
+        """{rule: violating ids} for the rules that fired"""
+        return {rule: self.ids(rule)[:limit] for rule in RULES if rule in self.violations}
+
+    def summary(self, limit=5):
+        if self.ok:
+            return f"{len(self)} questions valid"
+        lines = [f"{self.invalid_count} of {len(self)} questions invalid"]
+        for rule, ids in self.to_dict(limit).items():
+            more = len(self.violations[rule]) - len(ids)
+            lines.append(f"  {rule}: {len(self.violations[rule])} ({', '.join(map(str, ids))}"
+                         f"{f', +{more} more' if more else ''})")
+        return '\n'.join(lines)
+
+
+def _objects(values, count):
+    return np.fromiter(values, dtype=object, count=count)
+
+
+def _category_mask(bank, field, accept):
+    """Per-question bool from a predicate over the field's value table"""
+    categories = bank.categories[field]
+    table = np.fromiter(
+        (accept(None if code == MISSING_CODE else value) for code, value in enumerate(categories.values)),
+        dtype=bool, count=len(categories.values),
+    )
+    return table[bank.column(field)]
+
+
+def _value_column(values, accept, dtype=bool):
+    """Per-question array from a function run once per distinct value"""
+    try:
+        table = {value: accept(value) for value in set(values)}
+    except TypeError:
+        # An unhashable value (say, a list where a string belongs)
+        return np.fromiter(map(accept, values), dtype=dtype, count=len(values))
+    results = set(table.values())
+    if len(results) == 1:
+        # Every question maps to the same thing (usually: all valid)
+        return np.full(len(values), results.pop(), dtype=dtype)
+    return np.fromiter(map(table.__getitem__, values), dtype=dtype, count=len(values))
+
+
+def _type_index(value):
+    return QUESTION_TYPES.index(value) if value in QUESTION_TYPES else -1
+
+
+def _type_column(bank):
+    """Index into QUESTION_TYPES per question; -1 for values outside the enum"""
+    values = bank.categories['questionType'].values
+    table = np.full(len(values), -1, dtype=np.int8)
+    table[MISSING_CODE] = QUESTION_TYPES.index(DEFAULT_QUESTION_TYPE)
+    for code, value in enumerate(values[1:], start=1):
+        table[code] = _type_index(value)
+    return table[bank.column('questionType')]
+
+
+def _blank(values):
+    """Per-question bool: value is None or ''; skips the scan when neither occurs"""
+    n = len(values)
+    if None not in values and '' not in values:
+        return np.zeros(n, dtype=bool)
+    column = _objects(values, n)
+    return (column == None) | (column == '')  # noqa: E711 (elementwise)
+
+
+def _report(ids, valid_text, valid_topic, valid_difficulty, valid_marks, types, counts, answers, found, options_of,
+            positions=None):
+    """Run every rule over the extracted columns; returns a ValidationReport
+
+    `found` marks questions whose answer equals one of their options and
+    `options_of(p)` returns one question's options (for MSQ list answers).
+    `positions` maps each id to its last position; without one it is only
+    built from `ids` when they repeat.
+    """
+    n = len(ids)
+    checks = {}
+
+    checks['missing_id'] = _blank(ids)
+    duplicate = np.zeros(n, dtype=bool)
+    if positions is None and len(set(ids)) < n:
+        positions = dict(zip(ids, range(n)))
+    # `positions` keeps the last position per id, so it is short only if ids repeat
+    if positions is not None and len(positions) < n:
+        last = np.fromiter(map(positions.__getitem__, ids), dtype=np.int64, count=n)
+        shadowed = last != np.arange(n)
+        duplicate[shadowed] = True
+        duplicate[last[shadowed]] = True
+    checks['duplicate_id'] = duplicate & ~checks['missing_id']
+
+    checks['missing_text'] = ~valid_text
+    checks['missing_topic'] = ~valid_topic
+    checks['invalid_difficulty'] = ~valid_difficulty
+    checks['invalid_marks'] = ~valid_marks
+
+    checks['invalid_question_type'] = types < 0
+    choice = np.isin(types, [QUESTION_TYPES.index(t) for t in CHOICE_TYPES])
+    checks['too_few_options'] = choice & (counts < MIN_OPTIONS)
+    checks['missing_answer'] = _blank(answers)
+
+    # MSQ answers may be lists: every selected option must exist
+    msq = np.flatnonzero(types == QUESTION_TYPES.index('MSQ'))
+    for p in msq:
+        answer = answers[p]
+        if isinstance(answer, list):
+            found[p] = bool(answer) and set(answer) <= set(options_of(p))
+    checks['answer_not_in_options'] = choice & ~found & ~checks['missing_answer']
+
+    nat = np.flatnonzero(types == QUESTION_TYPES.index('NAT'))
+    bad_nat = np.zeros(n, dtype=bool)
+    bad_nat[nat] = [parse_nat_answer(answers[p]) is None for p in nat]
+    checks['invalid_nat_answer'] = bad_nat & ~checks['missing_answer']
+
+    violations = {}
+    for rule in RULES:
+        positions = np.flatnonzero(checks[rule])
+        if len(positions):
+            violations[rule] = positions
+    return ValidationReport(ids, violations)
+
+
+def validate_bank(bank):
+    """Run every rule over a CompactQuestionBank; returns a ValidationReport"""
+    n = len(bank)
+    offsets = bank.option_offsets.view()
+    counts = np.diff(offsets)
+
+    # correctAnswer in options: compare every option with its question's
+    # answer, then mark questions with at least one match
+    answers = _objects(bank.answers, n)
+    options = _objects(bank.options, len(bank.options))
+    owners = np.repeat(np.arange(n), counts)
+    found = np.zeros(n, dtype=bool)
+    found[owners[options == np.repeat(answers, counts)]] = True
+
+    return _report(
+        bank.texts['id'], np.fromiter(map(bool, bank.texts['text']), dtype=bool, count=n),
+        _category_mask(bank, 'topic', bool),
+        _category_mask(bank, 'difficulty', DIFFICULTIES.__contains__),
+        np.isin(bank.column('marks'), VALID_MARKS),
+        _type_column(bank), counts, bank.answers, found,
+        lambda p: options[offsets[p]:offsets[p + 1]],
+        positions=bank.positions,
+    )
+
+
+# Categorical fields checked from dicts, in `_dict_columns` order:
+# (field, default, per-value check, dtype)
+_DICT_FIELDS = (
+    ('text', None, bool, bool),
+    ('topic', None, bool, bool),
+    ('difficulty', None, DIFFICULTIES.__contains__, bool),
+    ('marks', None, VALID_MARKS.__contains__, bool),
+    ('questionType', DEFAULT_QUESTION_TYPE, _type_index, np.int8),
+)
+
+
+def _dict_columns(questions):
+    """Per-question arrays for `_DICT_FIELDS`
+
+    One pass collects the distinct combinations of these fields (texts only
+    as present or not); a field whose values all check the same way (all
+    valid, all MCQ) becomes a constant array, and only the others are pulled
+    out question by question.
+    """
+    n = len(questions)
+    try:
+        combos = {(bool(q.get('text')), q.get('topic'), q.get('difficulty'), q.get('marks'),
+                   q.get('questionType', DEFAULT_QUESTION_TYPE)) for q in questions}
+    except TypeError:
+        combos = None
+    columns = []
+    for index, (field, default, check, dtype) in enumerate(_DICT_FIELDS):
+        results = None if combos is None else {check(combo[index]) for combo in combos}
+        if results is not None and len(results) == 1:
+            columns.append(np.full(n, results.pop(), dtype=dtype))
+        else:
+            columns.append(_value_column([q.get(field, default) for q in questions], check, dtype))
+    return columns
+
+
+def validate_questions(questions):
+    """Validate question dicts; report positions follow the input order
+
+    The columns the rules need are pulled straight from the dicts, so a
+    writer's batch is not first copied into a CompactQuestionBank.
+    """
+    if not isinstance(questions, list):
+        questions = list(questions)
+    n = len(questions)
+    option_lists = [q.get('options', ()) for q in questions]
+    answers = [q.get('correctAnswer') for q in questions]
+    return _report(
+        [q.get('id') for q in questions], *_dict_columns(questions),
+        np.fromiter(map(len, option_lists), dtype=np.int64, count=n), answers,
+        np.fromiter(map(contains, option_lists, answers), dtype=bool, count=n),
+        option_lists.__getitem__,
+    )
+
+
+def split_valid(questions):
+    """(questions that pass every rule, report)"""
+    questions = list(questions)
+    report = validate_questions(questions)
+    return [q for q, ok in zip(questions, report.valid_mask) if ok], report
+
+
+def require_valid(questions):
+    """Gate for writers: return the questions as a list, or raise QuestionValidationError"""
+    questions = list(questions)
+    report = validate_questions(questions)
+    if not report.ok:
+        raise QuestionValidationError(report)
+    return questions
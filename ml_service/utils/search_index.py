@@ -0,0 +1,195 @@
+"""
+Inverted full-text index over the question bank with BM25 ranking.
+
+Question text, options and explanation are tokenized with the same
+normalization as near-duplicate detection. Posting lists are append-only so
+inserts are incremental; removals tombstone the question and decrement the
+live document frequency each term's idf is computed from. Each term's
+postings are materialized as NumPy arrays on first use after a change, and
+scoring, filtering and top-k selection run vectorized over those arrays.
+"""
+
+import math
+
+import numpy as np
+
+from utils.near_duplicates import normalize_tokens
+
+FILTER_FIELDS = ('subject', 'topic', 'difficulty', 'year')
+
+
+class SearchError(ValueError):
+    pass
+
+
+class _Column:
+    """Growable NumPy column"""
+
+    def __init__(self, dtype, capacity=1024):
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.concatenate([self.data, np.zeros_like(self.data)])
+        self.data[self.size] = value
+        self.size += 1
+
+    def view(self):
+        return self.data[:self.size]
+
+
+class QuestionSearchIndex:
+    """BM25 search with subject/topic/difficulty/year filters"""
+
+    def __init__(self, questions=(), k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.questions = []
+        self.positions = {}
+        self.postings = {}
+        self.df = {}
+        self._arrays = {}
+        self.doc_lengths = _Column(np.float32)
+        self.live = _Column(np.bool_)
+        self.total_length = 0
+        self.live_count = 0
+        self.codes = {field: {} for field in FILTER_FIELDS}
+        self.columns = {field: _Column(np.int32) for field in FILTER_FIELDS}
+        self.add_many(questions)
+
+    def __len__(self):
+        return self.live_count
+
+    @staticmethod
+    def _tokens(question):
+        parts = [question.get('text', ''), question.get('explanation', '')]
+        parts.extend(str(option) for option in question.get('options', []))
+        return normalize_tokens(' '.join(parts))
+
+    def _code(self, field, value):
+        if field == 'year' and value is not None:
+            value = int(value)
+        codes = self.codes[field]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def add(self, question):
+        """Index one question; re-adding an id replaces the old entry"""
+        if question.get('id') in self.positions:
+            self.remove(question['id'])
+
+        position = len(self.questions)
+        self.questions.append(question)
+        self.positions[question.get('id')] = position
+
+        counts = {}
+        tokens = self._tokens(question)
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            ids, tfs = self.postings.setdefault(token, ([], []))
+            ids.append(position)
+            tfs.append(tf)
+            self.df[token] = self.df.get(token, 0) + 1
+            self._arrays.pop(token, None)
+
+        self.doc_lengths.append(len(tokens))
+        self.live.append(True)
+        self.total_length += len(tokens)
+        self.live_count += 1
+        for field in FILTER_FIELDS:
+            self.columns[field].append(self._code(field, question.get(field)))
+
+    def add_many(self, questions):
+        for question in questions:
+            self.add(question)
+
+    def remove(self, question_id):
+        """Tombstone a question; its postings are skipped at query time"""
+        position = self.positions.pop(question_id, None)
+        if position is None:
+            return False
+        self.live.data[position] = False
+        for token in set(self._tokens(self.questions[position])):
+            self.df[token] -= 1
+        self.total_length -= int(self.doc_lengths.data[position])
+        self.live_count -= 1
+        return True
+
+    def apply_ops(self, ops):
+        """Apply journal/changelog records ({"op": insert|update|delete, ...})"""
+        for op in ops:
+            if op['op'] == 'delete':
+                self.remove(op['id'])
+            else:
+                self.add(op['question'])
+
+    def _posting_arrays(self, token):
+        arrays = self._arrays.get(token)
+        if arrays is None:
+            ids, tfs = self.postings[token]
+            arrays = (np.asarray(ids, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            self._arrays[token] = arrays
+        return arrays
+
+    @staticmethod
+    def _parse_filters(filters):
+        """field -> list of accepted values, for the FILTER_FIELDS that are set"""
+        parsed = {}
+        for field, wanted in (filters or {}).items():
+            if field not in FILTER_FIELDS or wanted in (None, '', []):
+                continue
+            if not isinstance(wanted, (list, tuple, set)):
+                wanted = [wanted]
+            if field == 'year':
+                try:
+                    wanted = [int(value) for value in wanted]
+                except (TypeError, ValueError):
+                    raise SearchError(f"year must be an integer, got {wanted!r}") from None
+            parsed[field] = wanted
+        return parsed
+
+    def _filter_mask(self, ids, filters):
+        mask = self.live.data[ids]
+        for field, wanted in filters.items():
+            codes = [self.codes[field][value] for value in wanted if value in self.codes[field]]
+            mask &= np.isin(self.columns[field].data[ids], codes)
+        return mask
+
+    def search(self, query, filters=None, limit=10):
+        """
+        Ranked (question, score) pairs for `query`. `filters` maps a field in
+        FILTER_FIELDS to a value or list of accepted values; a year that is not
+        an integer raises SearchError.
+        """
+        filters = self._parse_filters(filters)
+        terms = [term for term in dict.fromkeys(normalize_tokens(query)) if self.df.get(term)]
+        if not terms or not self.live_count:
+            return []
+
+        doc_lengths = self.doc_lengths.data
+        average_length = self.total_length / self.live_count
+        all_ids, all_scores = [], []
+        for term in terms:
+            ids, tfs = self._posting_arrays(term)
+            df = self.df[term]
+            idf = math.log(1 + (self.live_count - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * doc_lengths[ids] / average_length)
+            all_ids.append(ids)
+            all_scores.append(idf * tfs * (self.k1 + 1) / (tfs + norm))
+
+        if len(terms) == 1:
+            ids, scores = all_ids[0], all_scores[0]
+        else:
+            ids, inverse = np.unique(np.concatenate(all_ids), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(all_scores))
+
+        mask = self._filter_mask(ids, filters)
+        ids, scores = ids[mask], scores[mask]
+        if len(ids) > limit:
+            top = np.argpartition(-scores, limit)[:limit]
+            ids, scores = ids[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        return [(self.questions[i], round(float(s), 4)) for i, s in zip(ids[order], scores[order])]
@@ -0,0 +1,464 @@
+"""
+Per-user seen-question sets for no-repeat selection.
+
+Questions get stable integer ordinals (assigned once per `stableId` and
+never reused), and each user's seen questions are a set of ordinals in one
+of two compact forms:
+
+    RoaringSeenSet  exact. Ordinals are split into 65536-wide chunks. A chunk
+                    holds a sorted uint16 array while it has at most 4096
+                    members, and an 8 KiB bitmap after that, as roaring
+                    bitmaps do. That is about 2 bytes per seen question, and
+                    never more than 16 KiB for a 100k-question bank.
+    BloomSeenSet    fixed size for a chosen capacity and false-positive
+                    rate (about 1.2 bytes per question at 1%). A false
+                    positive only hides an unseen question from one draw.
+
+Both serialize to a few KiB of bytes and merge by union (OR of bitmaps), so
+combining two replicas' histories is cheap. `SeenStore` keeps the blobs in
+SQLite with a bounded LRU of loaded sets, so memory follows active users,
+not all users. `NoRepeatSelector` draws questions a user has not seen yet:
+
+    selector = NoRepeatSelector(questions, SeenStore(), bitmap_index)
+    picked, repeated = selector.select('user-42', 10, {'subject': 'Algorithms'})
+"""
+
+import math
+import os
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from utils.bitmap_index import popcount
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_SEEN_PATH = os.path.join(DATA_DIR, 'seen_sets.db')
+
+CHUNK_BITS = 16
+CHUNK_WORDS = (1 << CHUNK_BITS) // 64
+ARRAY_LIMIT = 4096
+ARRAY, BITMAP = 0, 1
+
+DEFAULT_CAPACITY = 2000
+DEFAULT_ERROR_RATE = 0.01
+CACHE_SIZE = 10000
+
+ROARING_MAGIC = b'GSR1'
+BLOOM_MAGIC = b'GSB1'
+CONTAINER = struct.Struct('<HBI')
+BLOOM_HEADER = struct.Struct('<4sII')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_sets (
+    user_id TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS question_ordinals (
+    key TEXT PRIMARY KEY,
+    ordinal INTEGER NOT NULL UNIQUE
+);
+"""
+
+UPSERT_SQL = """
+INSERT INTO seen_sets (user_id, data, updated_at) VALUES (?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+"""
+
+
+def _as_ordinals(ordinals):
+    return np.asarray(ordinals, dtype=np.int64).ravel()
+
+
+class RoaringSeenSet:
+    """Exact ordinal set in array/bitmap chunks"""
+
+    def __init__(self):
+        self.containers = {}        # chunk -> (ARRAY, sorted uint16) or (BITMAP, uint64 words)
+
+    @staticmethod
+    def _to_bitmap(lows):
+        words = np.zeros(CHUNK_WORDS, dtype=np.uint64)
+        lows = lows.astype(np.int64)
+        np.bitwise_or.at(words, lows >> 6, np.left_shift(np.uint64(1), (lows & 63).astype(np.uint64)))
+        return words
+
+    def _chunks(self, ordinals):
+        """(chunk, positions in `ordinals`, low 16 bits) per distinct chunk"""
+        highs = ordinals >> CHUNK_BITS
+        for high in np.unique(highs).tolist():
+            where = np.flatnonzero(highs == high)
+            yield high, where, (ordinals[where] & 0xFFFF).astype(np.uint16)
+
+    def add_many(self, ordinals):
+        ordinals = _as_ordinals(ordinals)
+        for high, _, lows in self._chunks(ordinals):
+            kind, data = self.containers.get(high, (ARRAY, np.empty(0, dtype=np.uint16)))
+            if kind == ARRAY:
+                merged = np.union1d(data, lows)
+                self.containers[high] = ((ARRAY, merged) if len(merged) <= ARRAY_LIMIT
+                                         else (BITMAP, self._to_bitmap(merged)))
+            else:
+                data |= self._to_bitmap(lows)
+
+    def contains_many(self, ordinals):
+        ordinals = _as_ordinals(ordinals)
+        found = np.zeros(len(ordinals), dtype=bool)
+        for high, where, lows in self._chunks(ordinals):
+            container = self.containers.get(high)
+            if container is None:
+                continue
+            kind, data = container
+            if kind == ARRAY:
+                if len(data):
+                    index = np.minimum(np.searchsorted(data, lows), len(data) - 1)
+                    found[where] = data[index] == lows
+            else:
+                lows = lows.astype(np.int64)
+                found[where] = (data[lows >> 6] >> (lows & 63).astype(np.uint64)) & np.uint64(1) == 1
+        return found
+
+    def __contains__(self, ordinal):
+        return bool(self.contains_many([ordinal])[0])
+
+    def ordinals(self):
+        """Members as a sorted int64 array"""
+        parts = []
+        for high in sorted(self.containers):
+            kind, data = self.containers[high]
+            if kind == BITMAP:
+                bits = np.unpackbits(data.astype('<u8').view(np.uint8), bitorder='little')
+                data = np.flatnonzero(bits)
+            parts.append((high << CHUNK_BITS) + data.astype(np.int64))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return sum(len(data) if kind == ARRAY else int(popcount(data).sum())
+                   for kind, data in self.containers.values())
+
+    def update(self, other):
+        """Union `other` into this set"""
+        for high, (kind, data) in other.containers.items():
+            mine = self.containers.get(high)
+            if mine is None:
+                self.containers[high] = (kind, data.copy())
+            elif kind == ARRAY:
+                self.add_many((high << CHUNK_BITS) + data.astype(np.int64))
+            elif mine[0] == ARRAY:
+                self.containers[high] = (BITMAP, data | self._to_bitmap(mine[1]))
+            else:
+                mine[1][:] |= data
+        return self
+
+    @property
+    def nbytes(self):
+        return sum(data.nbytes for _, data in self.containers.values())
+
+    def to_bytes(self):
+        parts = [ROARING_MAGIC, struct.pack('<I', len(self.containers))]
+        for high in sorted(self.containers):
+            kind, data = self.containers[high]
+            parts.append(CONTAINER.pack(high, kind, len(data)))
+            parts.append(data.astype('<u2' if kind == ARRAY else '<u8').tobytes())
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, blob):
+        seen = cls()
+        (count,) = struct.unpack_from('<I', blob, 4)
+        offset = 8
+        for _ in range(count):
+            high, kind, length = CONTAINER.unpack_from(blob, offset)
+            offset += CONTAINER.size
+            dtype = '<u2' if kind == ARRAY else '<u8'
+            data = np.frombuffer(blob, dtype=dtype, count=length, offset=offset).copy()
+            offset += data.nbytes
+            seen.containers[high] = (kind, data.astype(np.uint16 if kind == ARRAY else np.uint64))
+        return seen
+
+
+def _mix64(values):
+    """splitmix64 finalizer over a uint64 array (wrapping arithmetic)"""
+    z = values.copy()
+    z ^= z >> np.uint64(30)
+    z *= np.uint64(0xBF58476D1CE4E5B9)
+    z ^= z >> np.uint64(27)
+    z *= np.uint64(0x94D049BB133111EB)
+    z ^= z >> np.uint64(31)
+    return z
+
+
+class BloomSeenSet:
+    """Fixed-size Bloom filter over ordinals; `error_rate` holds up to `capacity` members"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE, bits=None, hashes=None):
+        if bits is None:
+            bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+            bits = max(64, (bits + 63) // 64 * 64)
+            hashes = max(1, round(bits / capacity * math.log(2)))
+        self.bits, self.hashes = bits, hashes
+        self.words = np.zeros(bits // 64, dtype=np.uint64)
+
+    def _positions(self, ordinals):
+        """(ordinals, hashes) bit positions by double hashing"""
+        keys = _as_ordinals(ordinals).astype(np.uint64)
+        h1 = _mix64(keys)
+        h2 = _mix64(keys ^ np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        return ((h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.bits)).astype(np.int64)
+
+    def add_many(self, ordinals):
+        positions = self._positions(ordinals).ravel()
+        np.bitwise_or.at(self.words, positions >> 6,
+                         np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64)))
+
+    def contains_many(self, ordinals):
+        positions = self._positions(ordinals)
+        bits = (self.words[positions >> 6] >> (positions & 63).astype(np.uint64)) & np.uint64(1)
+        return (bits == 1).all(axis=1)
+
+    def __contains__(self, ordinal):
+        return bool(self.contains_many([ordinal])[0])
+
+    def __len__(self):
+        """Estimated member count from the fraction of bits set"""
+        filled = int(popcount(self.words).sum())
+        if filled >= self.bits:
+            return self.bits
+        return round(-self.bits / self.hashes * math.log(1 - filled / self.bits))
+
+    def error_rate(self):
+        """Current false-positive probability"""
+        return (int(popcount(self.words).sum()) / self.bits) ** self.hashes
+
+    def update(self, other):
+        if (other.bits, other.hashes) != (self.bits, self.hashes):
+            raise ValueError("Only Bloom filters with the same size and hash count can be merged")
+        self.words |= other.words
+        return self
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+    def to_bytes(self):
+        return BLOOM_HEADER.pack(BLOOM_MAGIC, self.bits, self.hashes) + self.words.astype('<u8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob):
+        _, bits, hashes = BLOOM_HEADER.unpack_from(blob)
+        seen = cls(bits=bits, hashes=hashes)
+        seen.words = np.frombuffer(blob, dtype='<u8', offset=BLOOM_HEADER.size).astype(np.uint64)
+        return seen
+
+
+def load_seen_set(blob):
+    magic = bytes(blob[:4])
+    if magic == ROARING_MAGIC:
+        return RoaringSeenSet.from_bytes(blob)
+    if magic == BLOOM_MAGIC:
+        return BloomSeenSet.from_bytes(blob)
+    raise ValueError(f"Unknown seen-set encoding: {magic!r}")
+
+
+def question_key(question):
+    return question.get('stableId') or question.get('id')
+
+
+class SeenStore:
+    """Seen-sets per user in SQLite, with an LRU of loaded sets and the question ordinal table"""
+
+    def __init__(self, db_path=DEFAULT_SEEN_PATH, kind='roaring', capacity=DEFAULT_CAPACITY,
+                 error_rate=DEFAULT_ERROR_RATE, cache_size=CACHE_SIZE):
+        if kind not in ('roaring', 'bloom'):
+            raise ValueError(f"Unknown seen-set kind: {kind}")
+        self.db_path = db_path
+        self.kind = kind
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        # Flask serves requests from several threads; one connection, one lock
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def new_set(self):
+        if self.kind == 'bloom':
+            return BloomSeenSet(self.capacity, self.error_rate)
+        return RoaringSeenSet()
+
+    def ordinals(self, keys):
+        """Ordinal per question key, assigning the next free ones to keys not seen before"""
+        keys = list(keys)
+        with self._lock:
+            known = {}
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                known.update(self.conn.execute(
+                    f"SELECT key, ordinal FROM question_ordinals WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchall())
+            missing = [key for key in dict.fromkeys(keys) if key not in known]
+            if missing:
+                self.conn.execute('BEGIN IMMEDIATE')
+                try:
+                    (last,) = self.conn.execute('SELECT COALESCE(MAX(ordinal), -1) FROM question_ordinals').fetchone()
+                    rows = [(key, last + 1 + i) for i, key in enumerate(missing)]
+                    self.conn.executemany('INSERT INTO question_ordinals (key, ordinal) VALUES (?, ?)', rows)
+                except BaseException:
+                    self.conn.execute('ROLLBACK')
+                    raise
+                self.conn.execute('COMMIT')
+                known.update(rows)
+        return np.array([known[key] for key in keys], dtype=np.int64)
+
+    @property
+    def lock(self):
+        """The store's re-entrant lock; hold it to make a read-then-mark sequence atomic"""
+        return self._lock
+
+    def get(self, user_id):
+        """The user's seen-set (empty if none), LRU-cached"""
+        with self._lock:
+            seen = self._cache.get(user_id)
+            if seen is not None:
+                self._cache.move_to_end(user_id)
+                return seen
+            row = self.conn.execute('SELECT data FROM seen_sets WHERE user_id = ?', (user_id,)).fetchone()
+            seen = load_seen_set(row[0]) if row else self.new_set()
+            self._cache[user_id] = seen
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return seen
+
+    def _save(self, user_id, seen):
+        self.conn.execute(UPSERT_SQL, (user_id, seen.to_bytes(), datetime.now().isoformat()))
+
+    def mark(self, user_id, ordinals):
+        """Record questions as seen by `user_id` and persist the set"""
+        with self._lock:
+            seen = self.get(user_id)
+            seen.add_many(ordinals)
+            self._save(user_id, seen)
+            return seen
+
+    def merge(self, user_id, other):
+        """Union another seen-set (or its serialized bytes) into the user's"""
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            other = load_seen_set(other)
+        with self._lock:
+            seen = self.get(user_id)
+            seen.update(other)
+            self._save(user_id, seen)
+            return seen
+
+    def _remap(self, other):
+        """Array mapping the other database's ordinals to ours, or None if they already agree"""
+        rows = other.execute('SELECT key, ordinal FROM question_ordinals ORDER BY ordinal').fetchall()
+        if not rows:
+            return None
+        ours = self.ordinals(key for key, _ in rows)
+        theirs = np.array([ordinal for _, ordinal in rows], dtype=np.int64)
+        if (ours == theirs).all():
+            return None
+        remap = np.full(int(theirs.max()) + 1, -1, dtype=np.int64)
+        remap[theirs] = ours
+        return remap
+
+    def merge_store(self, other_path):
+        """
+        Union every user's set from another seen-set database (e.g. another
+        replica). Ordinals are translated through the question keys when the
+        two databases assigned them differently, which needs exact sets.
+        """
+        other = sqlite3.connect(other_path)
+        try:
+            merged = 0
+            remap = self._remap(other)
+            with self._lock:
+                self.conn.execute('BEGIN IMMEDIATE')
+                try:
+                    for user_id, blob in other.execute('SELECT user_id, data FROM seen_sets'):
+                        incoming = load_seen_set(blob)
+                        if remap is not None:
+                            if not isinstance(incoming, RoaringSeenSet):
+                                raise ValueError("Bloom seen-sets can only be merged across matching ordinal tables")
+                            translated = RoaringSeenSet()
+                            translated.add_many(remap[incoming.ordinals()])
+                            incoming = translated
+                        seen = self.get(user_id)
+                        seen.update(incoming)
+                        self._save(user_id, seen)
+                        merged += 1
+                except BaseException:
+                    self.conn.execute('ROLLBACK')
+                    raise
+                self.conn.execute('COMMIT')
+            return merged
+        finally:
+            other.close()
+
+    def reset(self, user_id):
+        with self._lock:
+            self._cache.pop(user_id, None)
+            self.conn.execute('DELETE FROM seen_sets WHERE user_id = ?', (user_id,))
+
+    def stats(self):
+        with self._lock:
+            users, stored = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM seen_sets').fetchone()
+            return {
+                'kind': self.kind,
+                'users': users,
+                'storedBytes': stored,
+                'cachedUsers': len(self._cache),
+                'cachedBytes': sum(seen.nbytes for seen in self._cache.values()),
+            }
+
+
+class NoRepeatSelector:
+    """Draws questions a user has not seen, optionally through a BitmapIndex filter"""
+
+    def __init__(self, questions, store, index=None):
+        self.questions = list(questions)
+        self.store = store
+        self.index = index
+        self.ordinal_of = store.ordinals([question_key(q) for q in self.questions])
+
+    def select(self, user_id, count, expression=None, rng=None):
+        """
+        (questions, repeated): up to `count` questions matching `expression`
+        that `user_id` has not seen, recorded as seen. Once the unseen ones
+        run out the draw is topped up with seen questions, and `repeated`
+        says how many.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        if expression and self.index is not None:
+            candidates = self.index.positions(expression)
+        else:
+            candidates = np.arange(len(self.questions))
+        # One critical section, so concurrent selects for a user never both draw the same fresh question
+        with self.store.lock:
+            seen = self.store.get(user_id).contains_many(self.ordinal_of[candidates])
+            fresh, stale = candidates[~seen], candidates[seen]
+            picked = rng.choice(fresh, min(count, len(fresh)), replace=False)
+            repeated = min(count - len(picked), len(stale))
+            if repeated:
+                picked = np.concatenate([picked, rng.choice(stale, repeated, replace=False)])
+            self.store.mark(user_id, self.ordinal_of[picked])
+        return [self.questions[p] for p in picked.tolist()], repeated
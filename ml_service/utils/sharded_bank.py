@@ -0,0 +1,188 @@
+"""
+Subject-sharded question bank with lazy shard loading.
+
+`write_shards` splits a bank into one JSON array per subject (or per subject
+and year) plus a small `manifest.json` with each shard's file, key and
+counts. `ShardedBank` reads only the manifest up front; a query opens just
+the shards it touches and keeps the most recently used ones in a bounded LRU,
+so memory and startup follow the working set instead of the bank size.
+
+    python -m utils.sharded_bank              # data/shards/, one shard per subject
+    python -m utils.sharded_bank --by-year    # one shard per (subject, year)
+
+    bank = ShardedBank()
+    algorithms = list(bank.questions(subject='Algorithms'))
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+from collections import OrderedDict
+
+from utils.bank_stream import iter_bank
+from utils.question_journal import QuestionJournal, write_json_atomic
+from utils.syllabus import question_subject
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+DEFAULT_SHARD_DIR = os.path.join(DATA_DIR, 'shards')
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+CACHE_SIZE = 8
+
+_SLUG = re.compile(r'[^a-z0-9]+')
+
+
+def shard_subject(question):
+    # The syllabus subject, so shards line up with the practice sampler's subjects
+    return question_subject(question)
+
+
+def shard_file(subject, year=None):
+    slug = _SLUG.sub('-', subject.lower()).strip('-') or 'unknown'
+    return f"{slug}.json" if year is None else f"{slug}-{year}.json"
+
+
+def write_shards(questions, directory=DEFAULT_SHARD_DIR, by_year=False):
+    """
+    Stream questions into per-subject (or per subject and year) shard files
+    and write the manifest. Shards are built in a staging directory and
+    swapped in at the end, so readers never see a half-written set.
+    Returns the manifest.
+    """
+    staging = f"{directory}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    files, entries, names = {}, {}, set()
+    try:
+        for question in questions:
+            subject = shard_subject(question)
+            year = question.get('year') if by_year else None
+            key = (subject, year)
+            entry = entries.get(key)
+            if entry is None:
+                name = shard_file(subject, year)
+                # Distinct subjects can share a slug ("C" and "C++")
+                while name in names:
+                    name = f"{name[:-len('.json')]}_.json"
+                names.add(name)
+                entry = entries[key] = {'file': name, 'subject': subject, 'year': year,
+                                        'questions': 0, 'marks': 0}
+                files[key] = open(os.path.join(staging, name), 'w', encoding='utf-8')
+                files[key].write('[\n')
+            elif entry['questions']:
+                files[key].write(',\n')
+            files[key].write(json.dumps(question, ensure_ascii=False))
+            entry['questions'] += 1
+            entry['marks'] += question.get('marks') or 0
+    finally:
+        for f in files.values():
+            f.write('\n]\n')
+            f.close()
+
+    shards = sorted(entries.values(), key=lambda e: (e['subject'], e['year'] or 0))
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'byYear': by_year,
+        'totalQuestions': sum(e['questions'] for e in shards),
+        'shards': shards,
+    }
+    write_json_atomic(os.path.join(staging, MANIFEST_NAME), manifest)
+
+    previous = f"{directory}.old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+def _as_set(value):
+    if value is None:
+        return None
+    return set(value) if isinstance(value, (list, tuple, set)) else {value}
+
+
+class ShardedBank:
+    """Manifest-driven bank that loads subject shards on demand"""
+
+    def __init__(self, directory=DEFAULT_SHARD_DIR, cache_size=CACHE_SIZE):
+        self.directory = directory
+        self.cache_size = cache_size
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.by_year = self.manifest['byYear']
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return self.manifest['totalQuestions']
+
+    def subjects(self):
+        return sorted({entry['subject'] for entry in self.manifest['shards']})
+
+    def shards(self, subject=None, year=None):
+        """Manifest entries a query on `subject`/`year` (a value or a list) must open"""
+        subjects, years = _as_set(subject), _as_set(year)
+        return [
+            entry for entry in self.manifest['shards']
+            if (subjects is None or entry['subject'] in subjects)
+            and (years is None or not self.by_year or entry['year'] in years)
+        ]
+
+    def count(self, subject=None, year=None):
+        """Question count from the manifest alone (exact unless filtering a per-subject layout by year)"""
+        if year is not None and not self.by_year:
+            return sum(1 for _ in self.questions(subject, year))
+        return sum(entry['questions'] for entry in self.shards(subject, year))
+
+    def load(self, entry):
+        """Questions of one shard, LRU-cached"""
+        name = entry['file']
+        questions = self._cache.get(name)
+        if questions is not None:
+            self._cache.move_to_end(name)
+            return questions
+        with open(os.path.join(self.directory, name), 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        self._cache[name] = questions
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return questions
+
+    def loaded(self):
+        """Shard files currently held in memory, least recently used first"""
+        return list(self._cache)
+
+    def questions(self, subject=None, year=None):
+        """Yield the questions matching `subject`/`year`, opening only their shards"""
+        years = _as_set(year)
+        for entry in self.shards(subject, year):
+            for question in self.load(entry):
+                if years is None or self.by_year or question.get('year') in years:
+                    yield question
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Split the question bank into subject shards')
+    parser.add_argument('source', nargs='?', help='bank file (default: canonical snapshot + journal)')
+    parser.add_argument('--output', default=DEFAULT_SHARD_DIR)
+    parser.add_argument('--by-year', action='store_true', help='one shard per (subject, year)')
+    args = parser.parse_args(argv)
+
+    questions = iter_bank(args.source) if args.source else QuestionJournal().iter_questions()
+    manifest = write_shards(questions, args.output, by_year=args.by_year)
+
+    print(f"🧩 {manifest['totalQuestions']} questions in {len(manifest['shards'])} shards")
+    for entry in manifest['shards']:
+        year = f" {entry['year']}" if entry['year'] is not None else ''
+        print(f"   {entry['subject']}{year}: {entry['questions']} questions -> {entry['file']}")
+    print(f"💾 Shards saved to: {args.output}")
+    return manifest
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,53 @@
+"""
+GATE CSE paper format and syllabus weights shared by the generators and the
+paper assembler.
+"""
+
+# GATE CSE Syllabus Distribution (Based on official weightage)
+SYLLABUS_WEIGHTAGE = {
+    "Algorithms": 13,  # 13%
+    "Data Structures": 10,  # 10%
+    "Operating Systems": 10,  # 10%
+    "Theory of Computation": 7,  # 7%
+    "DBMS": 9,  # 9%
+    "Computer Networks": 9,  # 9%
+    "Programming": 8,  # 8%
+    "Compiler Design": 6,  # 6%
+    "Digital Logic": 7,  # 7%
+    "Computer Organization": 7,  # 7%
+    "Discrete Mathematics": 9,  # 9%
+    "General Aptitude": 15,  # 15%
+}
+
+# GATE CSE Format: 65 Questions Total, 100 marks
+GATE_SECTIONS = (
+    {"name": "General Aptitude", "questions": 10, "marks": 15},
+    {"name": "Engineering Mathematics", "questions": 13, "marks": 13},
+    {"name": "Core Computer Science", "questions": 42, "marks": 72},
+)
+
+# Based on 20 years of GATE papers (see data/QUESTION_GENERATION_GUIDE.md)
+DIFFICULTY_MIX = {"easy": 30, "medium": 50, "hard": 20}
+QUESTION_TYPE_MIX = {"MCQ": 70, "MSQ": 15, "NAT": 15}
+
+# Named difficulty mixes for practice papers; "balanced" is the exam mix
+DIFFICULTY_PROFILES = {
+    "easy": {"easy": 50, "medium": 40, "hard": 10},
+    "balanced": DIFFICULTY_MIX,
+    "hard": {"easy": 15, "medium": 45, "hard": 40},
+}
+
+
+def question_subject(question):
+    """
+    Syllabus subject of a question. The GATE paper's core questions only
+    name their subject in `topic`; otherwise fall back to the section, as
+    inMemoryDb.js does.
+    """
+    subject = question.get('subject')
+    if subject:
+        return subject
+    topic = question.get('topic')
+    if topic in SYLLABUS_WEIGHTAGE:
+        return topic
+    return question.get('section') or 'Unknown'
@@ -1,11 +1,15 @@
 import mongoose from 'mongoose';
 
 const questionSchema = new mongoose.Schema({
+  // Content hash set by ml_service/utils/mongo_loader.py; questions created here may not have one
+  stableId: { type: String },
+  legacyId: { type: String },
   text: { type: String, required: true },
   options: [{ type: String }],
   correctAnswer: { type: String, required: true },
   topic: { type: String, required: true },
   subject: { type: String, required: true },
+  section: { type: String },
   difficulty: { type: String, enum: ['easy', 'medium', 'hard'], required: true },
   questionType: { type: String, enum: ['MCQ', 'MSQ', 'NAT'], required: true },
   year: { type: Number },
@@ -14,4 +18,10 @@ const questionSchema = new mongoose.Schema({
   createdAt: { type: Date, default: Date.now }
 });
 
+// Same definition as INDEXES in mongo_loader.py, so autoIndex does not conflict with it
+questionSchema.index(
+  { stableId: 1 },
+  { unique: true, partialFilterExpression: { stableId: { $exists: true } } }
+);
+
 export default mongoose.model('Question', questionSchema);